@@ -7,7 +7,8 @@ from config import config
 from faiss_helper import FAISSHelper
 from logging_setup import setup_logging
 from models import *
-from qa import get_llm, query_folder
+from qa import STUFF_PROMPT_VERSION, get_llm, query_folder
+from services.answer_cache import AnswerCache
 from stream.api import *
 
 setup_logging()
@@ -21,6 +22,15 @@ from pytz import timezone
 from db import get_db
 from models import *
 
+
+@st.cache_resource
+def initialize_database():
+    # Once per Streamlit server process, not on every script rerun
+    init_db()
+
+
+initialize_database()
+
 # Initialize session state for query count if not present
 if "query_count" not in st.session_state:
     st.session_state["query_count"] = 0
@@ -115,6 +125,8 @@ def main():
 
     user_id = 1  # Example user_id, should be dynamic in real use case
     template_id = 1  # Example template_id, should be dynamic in real use case
+    # One round trip for the reads below; they are then answered from the memo
+    bootstrap(st.session_state.date, logs_limit=st.session_state.get("limit", 3))
     available_days = list_available_index_days()
     available_days_str = [day.split("T")[0] for day in available_days]
     selected_day = st.sidebar.selectbox(
@@ -191,57 +203,70 @@ def main():
             with st.chat_message(message["role"]):
                 st.markdown(message["content"])
 
-        if st.session_state["query_count"] < 3:
-            if check_global_limit():
-
-                # Input new message
-                if prompt := st.chat_input("What is up?"):
-                    st.session_state.messages.append(
-                        {"role": "user", "content": prompt}
-                    )
-                    with st.chat_message("user"):
-                        st.markdown(prompt)
-
-                    with st.chat_message("assistant"):
-                        response = chat_with_document(
-                            date=selected_day,
-                            query=prompt,
-                            temperature=st.session_state.get("temperature", 0.5),
-                            model=st.session_state.get("openai_model", "gpt-3.5-turbo"),
-                            history=[
-                                {"role": m["role"], "content": m["content"]}
-                                for m in st.session_state.messages
-                            ],
-                        )
-                        st.markdown(response["answer"])
-
-                    st.session_state.messages.append(
-                        {"role": "assistant", "content": response["answer"]}
-                    )
-
-                    # Save messages to the database
-                    user_message = ChatMessage(
-                        session_id=current_session.id, role="user", content=prompt
-                    )
-                    assistant_message = ChatMessage(
-                        session_id=current_session.id,
-                        role="assistant",
-                        content=response["answer"],
-                    )
-                    db.add(user_message)
-                    db.add(assistant_message)
-                    db.commit()
-
-                    st.session_state["query_count"] += 1
-                    increment_global_query_count()
-
-                    st.rerun()
+        # Cached answers cost no LLM call, so they stay available past the limits.
+        # The global check only skips the call early; the cap is enforced by the
+        # atomic increment in chat_with_document
+        within_limits = st.session_state["query_count"] < 3 and check_global_limit()
+
+        # Input new message
+        if prompt := st.chat_input("What is up?"):
+            st.session_state.messages.append({"role": "user", "content": prompt})
+            with st.chat_message("user"):
+                st.markdown(prompt)
+
+            with st.chat_message("assistant"):
+                response = chat_with_document(
+                    date=selected_day,
+                    query=prompt,
+                    temperature=st.session_state.get("temperature", 0.5),
+                    model=st.session_state.get("openai_model", "gpt-3.5-turbo"),
+                    history=[
+                        {"role": m["role"], "content": m["content"]}
+                        for m in st.session_state.messages
+                    ],
+                    cache_only=not within_limits,
+                    count_global_query=True,
+                )
+                if response is None:
+                    st.warning("Query limit reached. Please try again tomorrow.")
+                    st.session_state.messages.pop()
+                    st.stop()
+                st.markdown(response["answer"])
+
+            st.session_state.messages.append(
+                {"role": "assistant", "content": response["answer"]}
+            )
+
+            # Save messages to the database
+            user_message = ChatMessage(
+                session_id=current_session.id, role="user", content=prompt
+            )
+            assistant_message = ChatMessage(
+                session_id=current_session.id,
+                role="assistant",
+                content=response["answer"],
+            )
+            db.add(user_message)
+            db.add(assistant_message)
+            db.commit()
+
+            # The global count was taken before the LLM call
+            if not response.get("cached"):
+                st.session_state["query_count"] += 1
+
+            st.rerun()
 
     with tab4:
         st.sidebar.subheader("Admin: Prompt Execution Logs")
         limit = st.sidebar.number_input(
             "Limit", min_value=1, max_value=10, value=3, step=1, key="limit"
         )
+        cache_stats = get_answer_cache_stats()
+        st.sidebar.metric(
+            "Answer cache hit rate",
+            f"{cache_stats['hit_rate']:.0%}",
+            help=f"{cache_stats['hits']} hits / {cache_stats['misses']} misses",
+        )
         # if st.button("Load Recent Execution Logs"):
         display_recent_exec_logs(limit)
 
@@ -332,24 +357,66 @@ def run_prompt_by_date(
     return None
 
 
-def chat_with_document(date, query, temperature, model, history, stream=False):
+def chat_with_document(
+    date,
+    query,
+    temperature,
+    model,
+    history,
+    stream=False,
+    cache_only=False,
+    count_global_query=False,
+):
+    """Answer ``query`` against the gaceta of ``date``, reusing cached answers.
+
+    Cached answers carry ``"cached": True`` and cost no LLM call. With
+    ``cache_only`` a cache miss returns None instead of querying the model.
+    With ``count_global_query`` a miss first takes one of today's global
+    queries (atomically, so concurrent users cannot overrun the cap) and
+    returns None once they are gone; a failed call gives its query back.
+    """
     faiss_helper = FAISSHelper()
     latest_gaceta_dir = os.path.join(config.GACETA_PDFS_DIR, date)
 
     # Placeholder function for running the prompt. Replace with actual logic.
     if os.path.exists(os.path.join(latest_gaceta_dir, "index.faiss")):
-        db = faiss_helper.load_faiss_index(latest_gaceta_dir)
-
-        llm = get_llm(
-            model=model, openai_api_key=config.OPENAI_API_KEY, temperature=temperature
-        )
-        result = query_folder(
-            folder_index=db,
-            query=query,
-            llm=llm,
-        )
+        db_session = next(get_db())
+        try:
+            answer_cache = AnswerCache(
+                db_session,
+                faiss_helper.embeddings,
+                model=model,
+                temperature=temperature,
+                prompt_version=STUFF_PROMPT_VERSION,
+            )
+            cached = answer_cache.lookup(date, query)
+            if cached or cache_only:
+                return cached
+            if count_global_query and not increment_global_query_count():
+                return None
+
+            try:
+                db = faiss_helper.load_faiss_index(latest_gaceta_dir)
+
+                llm = get_llm(
+                    model=model,
+                    openai_api_key=config.OPENAI_API_KEY,
+                    temperature=temperature,
+                )
+                result = query_folder(
+                    folder_index=db,
+                    query=query,
+                    llm=llm,
+                )
+            except Exception:
+                if count_global_query:
+                    release_global_query_count()
+                raise
+            answer_cache.store(date, query, result)
 
-        return result
+            return result
+        finally:
+            db_session.close()
     return None
 
 
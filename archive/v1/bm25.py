@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+🌟 BM25 Keyword Index - Exact-Token Retrieval & Rank Fusion
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+📋 Description:
+    In-process inverted index built alongside each FAISS index. Catches the
+    queries that embeddings miss because they hinge on exact tokens: decree
+    numbers ("N° 12345-MINAE"), acronyms ("SINAC") and cédula jurídica numbers
+    ("3-101-123456"). Results are merged with the vector hits through
+    reciprocal rank fusion (RRF) and optionally re-ranked by query coverage.
+
+🏗️ Retrieval Flow:
+    ```
+    Query ──▶ FAISS (top fetch_k) ──┐
+          │                         ├──▶ RRF ──▶ Coverage rerank ──▶ top k
+          └─▶ BM25  (top fetch_k) ──┘
+    ```
+
+📥 Inputs:
+    • Chunk texts in FAISS row order (row i == BM25 document i)
+    • Natural language queries with embedded identifiers
+
+📤 Outputs:
+    • bm25.npz: CSR postings (sorted vocabulary, indptr, doc ids, tf, doc lengths)
+    • Ranked chunk ids with BM25 / fused scores
+
+⚡ Performance Characteristics:
+    • Storage: plain NumPy arrays, loaded without pickle
+    • Term lookup: O(log V) binary search over the sorted vocabulary
+    • Scoring: vectorized per query term over its postings list only
+
+📚 Usage Example:
+    ```python
+    bm25 = BM25Index.from_texts([doc.page_content for doc in chunks])
+    ids, scores = bm25.search("Decreto 12345-MINAE", k=20)
+    fused = reciprocal_rank_fusion([vector_ids, ids])
+    ```
+
+Author: GacetaChat Team | Version: 2.1.0 | Last Updated: 2024-12-19
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+"""
+
+# bm25.py
+import math
+import os
+import re
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from embeddings import fold_accents
+
+BM25_FILE = "bm25.npz"
+
+# Keeps "12345-minae", "3-101-123456" and "n.o" together as one token
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:[-./][a-z0-9]+)*")
+_SPLIT_RE = re.compile(r"[-./]")
+
+
+def tokenize(text: str) -> List[str]:
+    """Accent-folded tokens; compound identifiers also yield their parts."""
+    tokens = []
+    for token in _TOKEN_RE.findall(fold_accents(text)):
+        tokens.append(token)
+        parts = _SPLIT_RE.split(token)
+        if len(parts) > 1:
+            tokens.extend(parts)
+    return tokens
+
+
+class BM25Index:
+    def __init__(self, terms, indptr, doc_ids, tfs, doc_len, k1=1.5, b=0.75):
+        self.terms = terms
+        self.indptr = indptr
+        self.doc_ids = doc_ids
+        self.tfs = tfs
+        self.doc_len = doc_len
+        self.k1 = k1
+        self.b = b
+        self.avgdl = float(doc_len.mean()) if doc_len.size else 0.0
+
+    @classmethod
+    def from_texts(cls, texts: Iterable[str]):
+        postings = defaultdict(list)
+        lengths = []
+        for doc_id, text in enumerate(texts):
+            counts = Counter(tokenize(text))
+            lengths.append(sum(counts.values()))
+            for term, tf in counts.items():
+                postings[term].append((doc_id, tf))
+
+        terms = sorted(postings)
+        indptr = np.zeros(len(terms) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(postings[term]) for term in terms])
+        flat = [entry for term in terms for entry in postings[term]]
+        doc_ids = np.array([doc for doc, _ in flat], dtype=np.int32)
+        tfs = np.array([tf for _, tf in flat], dtype=np.float32)
+        return cls(
+            np.array(terms, dtype=str),
+            indptr,
+            doc_ids,
+            tfs,
+            np.array(lengths, dtype=np.float32),
+        )
+
+    @staticmethod
+    def exists(directory) -> bool:
+        return os.path.exists(os.path.join(directory, BM25_FILE))
+
+    @classmethod
+    def load(cls, directory):
+        with np.load(os.path.join(directory, BM25_FILE), allow_pickle=False) as data:
+            return cls(
+                data["terms"],
+                data["indptr"],
+                data["doc_ids"],
+                data["tfs"],
+                data["doc_len"],
+            )
+
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        np.savez(
+            os.path.join(directory, BM25_FILE),
+            terms=self.terms,
+            indptr=self.indptr,
+            doc_ids=self.doc_ids,
+            tfs=self.tfs,
+            doc_len=self.doc_len,
+        )
+
+    def __len__(self):
+        return self.doc_len.shape[0]
+
+    def _term_id(self, term: str):
+        pos = int(np.searchsorted(self.terms, term))
+        if pos < len(self.terms) and self.terms[pos] == term:
+            return pos
+        return None
+
+    def idf(self, term: str) -> float:
+        term_id = self._term_id(term)
+        df = (
+            0
+            if term_id is None
+            else int(self.indptr[term_id + 1] - self.indptr[term_id])
+        )
+        return math.log(1 + (len(self) - df + 0.5) / (df + 0.5))
+
+    def get_scores(self, query: str) -> np.ndarray:
+        scores = np.zeros(len(self), dtype=np.float32)
+        for term in set(tokenize(query)):
+            term_id = self._term_id(term)
+            if term_id is None:
+                continue
+            start, end = self.indptr[term_id], self.indptr[term_id + 1]
+            docs = self.doc_ids[start:end]
+            tf = self.tfs[start:end]
+            norm = tf + self.k1 * (
+                1 - self.b + self.b * self.doc_len[docs] / self.avgdl
+            )
+            # Each doc appears once per postings list, so fancy-index add is safe
+            scores[docs] += self.idf(term) * tf * (self.k1 + 1) / norm
+        return scores
+
+    def search(self, query: str, k: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+        scores = self.get_scores(query)
+        hits = np.flatnonzero(scores)
+        if hits.size > k:
+            hits = hits[np.argpartition(-scores[hits], k - 1)[:k]]
+        order = hits[np.argsort(-scores[hits], kind="stable")]
+        return order, scores[order]
+
+    def coverage(self, query: str, text: str) -> float:
+        """Share of the query's IDF mass whose tokens appear in ``text``."""
+        query_terms = set(tokenize(query))
+        if not query_terms:
+            return 0.0
+        text_terms = set(tokenize(text))
+        weights = {term: self.idf(term) for term in query_terms}
+        total = sum(weights.values())
+        matched = sum(w for term, w in weights.items() if term in text_terms)
+        return matched / total if total else 0.0
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[int]], k: int = 60
+) -> List[Tuple[int, float]]:
+    """Merge ranked id lists: score(d) = sum over lists of 1 / (k + rank)."""
+    fused: Dict[int, float] = defaultdict(float)
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            fused[int(doc_id)] += 1.0 / (k + rank)
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+🌟 Chunk Store - Memory-Mapped Document Text & Metadata Storage
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+📋 Description:
+    Offset-indexed, read-only storage for the text chunks that back a FAISS
+    index. Replaces the pickled LangChain docstore (index.pkl) so that loading
+    an index no longer deserializes every chunk into RAM: the chunk file is
+    memory-mapped and only the rows returned by a search are decoded.
+
+🏗️ File Layout:
+    ```
+    {gaceta_dir}/
+    ├── index.faiss     # raw FAISS vectors (row i  <->  chunk i)
+    ├── chunks.dat      # [text_0][meta_0][text_1][meta_1]...  (UTF-8 / JSON)
+    └── chunks.idx.npy  # int64[n, 3] = (text_start, meta_start, end) per chunk
+    ```
+
+⚡ Performance Characteristics:
+    • Load Time: O(1) - two mmaps, no parsing
+    • Lookup: O(k) for the top-k hits, independent of gazette size
+    • Memory: pages are faulted in lazily by the OS and shared across processes
+
+🔒 Security Considerations:
+    ✅ Plain UTF-8 + JSON only, no pickle - safe to load untrusted indices
+
+📚 Usage Example:
+    ```python
+    ChunkStore.write("gaceta_pdfs/2024-07-19", documents)
+
+    store = ChunkStore("gaceta_pdfs/2024-07-19")
+    docs = store.get_many([12, 3, 40])
+    ```
+
+Author: GacetaChat Team | Version: 2.1.0 | Last Updated: 2024-12-19
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+"""
+
+# chunk_store.py
+import json
+import mmap
+import os
+from typing import Iterable, List
+
+import numpy as np
+from langchain.docstore.document import Document
+
+CHUNKS_DATA_FILE = "chunks.dat"
+CHUNKS_INDEX_FILE = "chunks.idx.npy"
+
+
+class ChunkStore:
+    def __init__(self, directory):
+        self.directory = directory
+        self._offsets = np.load(
+            os.path.join(directory, CHUNKS_INDEX_FILE), mmap_mode="r"
+        )
+        data_path = os.path.join(directory, CHUNKS_DATA_FILE)
+        self._file = open(data_path, "rb")
+        if os.path.getsize(data_path) > 0:
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            # mmap refuses zero-length files (index with no chunks)
+            self._data = b""
+
+    @staticmethod
+    def exists(directory) -> bool:
+        return os.path.exists(
+            os.path.join(directory, CHUNKS_INDEX_FILE)
+        ) and os.path.exists(os.path.join(directory, CHUNKS_DATA_FILE))
+
+    @staticmethod
+    def write(directory, documents: Iterable[Document]):
+        """Serialize documents in FAISS row order."""
+        os.makedirs(directory, exist_ok=True)
+        offsets = []
+        position = 0
+        data_path = os.path.join(directory, CHUNKS_DATA_FILE)
+        with open(data_path + ".tmp", "wb") as f:
+            for doc in documents:
+                text = doc.page_content.encode("utf-8")
+                meta = json.dumps(doc.metadata or {}, ensure_ascii=False).encode(
+                    "utf-8"
+                )
+                f.write(text)
+                f.write(meta)
+                offsets.append(
+                    (position, position + len(text), position + len(text) + len(meta))
+                )
+                position += len(text) + len(meta)
+        index = np.asarray(offsets, dtype=np.int64).reshape(-1, 3)
+        np.save(os.path.join(directory, CHUNKS_INDEX_FILE), index)
+        # Data file goes last so a crash never leaves an index pointing past EOF
+        os.replace(data_path + ".tmp", data_path)
+
+    def __len__(self):
+        return self._offsets.shape[0]
+
+    def __getitem__(self, i: int) -> Document:
+        text_start, meta_start, end = (int(x) for x in self._offsets[i])
+        return Document(
+            page_content=self._data[text_start:meta_start].decode("utf-8"),
+            metadata=json.loads(self._data[meta_start:end].decode("utf-8")),
+        )
+
+    def get_many(self, ids: Iterable[int]) -> List[Document]:
+        return [self[i] for i in ids]
+
+    def close(self):
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
@@ -138,6 +138,7 @@
     # .env file (development)
     OPENAI_API_KEY=sk-your-actual-api-key
     DATABASE_URL=sqlite:///dev.db
+    EMBEDDING_BACKEND=hashing        # offline embeddings, no API calls
 
     # Production environment
     export OPENAI_API_KEY="sk-prod-key"
@@ -171,6 +172,47 @@ class Config:
     OPENAI_MODEL_NAME = "gpt-4o"  # or any other model you prefer
     OPENAI_MAX_TOKENS = 2000
     OPENAI_TEMPERATURE = 0.3
+    EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "openai")  # or "hashing"
+    LOCAL_EMBEDDING_DIM = int(os.getenv("LOCAL_EMBEDDING_DIM", "1024"))
+    RETRIEVAL_K = 4  # chunks sent to the LLM per question
+    RETRIEVAL_FETCH_K = 20  # candidates from each of FAISS and BM25
+    RETRIEVAL_RERANK = True
+    MAX_CONTEXT_TOKENS = 4000  # prompt budget for question + packed chunks
+    # Cosine similarity above which a cached chat answer is reused for a new query
+    ANSWER_CACHE_THRESHOLD = float(os.getenv("ANSWER_CACHE_THRESHOLD", "0.95"))
+    # Template prompts without {{alias}} dependencies on each other run in parallel
+    PROMPT_EXECUTION_WORKERS = int(os.getenv("PROMPT_EXECUTION_WORKERS", "4"))
+    # FastAPI worker threads for blocking routes; also the SQLite pool size
+    API_THREADPOOL_SIZE = int(os.getenv("API_THREADPOOL_SIZE", "30"))
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+    GLOBAL_QUERY_LIMIT = 50  # chat questions answered by the LLM per day
+    GLOBAL_QUERY_CHECK_TTL = 5  # seconds a process trusts its cached budget
+    # Read endpoints: seconds a cached response is served before revalidation
+    RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "30"))
+    RESPONSE_CACHE_MAX_ENTRIES = 256
+    # Shared invalidation stamp; defaults to <sqlite db file>.cache-generation
+    RESPONSE_CACHE_GENERATION_FILE = os.getenv("RESPONSE_CACHE_GENERATION_FILE")
+    OAUTH_STATE_TTL = 600  # seconds a Twitter login may take to call back
+    GZIP_MINIMUM_SIZE = 1000  # bytes; smaller responses are sent uncompressed
+    # Ingestion daemon (download_gaceta.py); window times are Costa Rica time
+    PUBLICATION_WINDOW_START = os.getenv("PUBLICATION_WINDOW_START", "05:00")
+    PUBLICATION_WINDOW_END = os.getenv("PUBLICATION_WINDOW_END", "16:00")
+    INGESTION_POLL_INITIAL_SECONDS = 60  # doubles after every unchanged poll
+    INGESTION_POLL_MAX_SECONDS = 900
+    INGESTION_MAX_ATTEMPTS = 5  # job attempts for indexing and prompt execution
+    INGESTION_JOB_CHECK_SECONDS = 30  # daemon re-check while its job is pending
+    INGESTION_STATE_FILE = os.getenv("INGESTION_STATE_FILE", "ingestion_state.json")
+    # Job queue (jobs.py): leases are renewed every third of their length
+    JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+    JOB_LEASE_SECONDS = 600
+    JOB_MAX_ATTEMPTS = 3
+    JOB_RETRY_BASE_SECONDS = 60  # doubles with every failed attempt
+    JOB_POLL_SECONDS = 2  # idle worker sleep between claims
+    UI_JOB_PRIORITY = 10  # re-runs requested from Streamlit jump the queue
+    # GACETA_PROFILE=1 (or --profile): flamegraph stacks per daemon step / job
+    PROFILE_DIR = os.getenv("GACETA_PROFILE_DIR", "profiles")
 
 
 config = Config()
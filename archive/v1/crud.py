@@ -127,14 +127,12 @@ import traceback
 from datetime import datetime
 
 from fastapi import HTTPException
-from sqlalchemy import and_
+from sqlalchemy import and_, func, tuple_
 from sqlalchemy.exc import NoResultFound
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload, selectinload
 
 from config import config
-from faiss_helper import FAISSHelper
 from models import *
-from qa import get_llm, query_folder
 
 
 def get_last_executed_log(db: Session, prompt_id: int, session_id):
@@ -154,54 +152,162 @@ def get_last_executed_log(db: Session, prompt_id: int, session_id):
         return None
 
 
+def get_last_executed_logs(db: Session, session_id, prompt_ids=None):
+    """Latest executed log per prompt of a session, keyed by prompt id.
+
+    One windowed statement (ROW_NUMBER() OVER (PARTITION BY prompt_id)) with
+    the prompt and output eagerly joined, instead of one query per prompt.
+    """
+    filters = [
+        ContentExecutionLog.state == ExecutionState.EXECUTED.value,
+        ContentExecutionLog.execution_session_id == session_id,
+        ContentExecutionLog.query_response_id != None,
+    ]
+    if prompt_ids is not None:
+        filters.append(ContentExecutionLog.prompt_id.in_(prompt_ids))
+    ranked = (
+        db.query(
+            ContentExecutionLog.id.label("log_id"),
+            func.row_number()
+            .over(
+                partition_by=ContentExecutionLog.prompt_id,
+                order_by=ContentExecutionLog.created_at.desc(),
+            )
+            .label("rank"),
+        )
+        .filter(*filters)
+        .subquery()
+    )
+    logs = (
+        db.query(ContentExecutionLog)
+        .join(
+            ranked, and_(ContentExecutionLog.id == ranked.c.log_id, ranked.c.rank == 1)
+        )
+        .options(
+            joinedload(ContentExecutionLog.prompt),
+            joinedload(ContentExecutionLog.output),
+        )
+        .all()
+    )
+    return {log.prompt_id: log for log in logs}
+
+
+def _twitter_prompt_log_json(exec_log):
+    return {
+        "id": exec_log.id,
+        "name": exec_log.prompt.name,
+        "state": exec_log.state,
+        "short_description": exec_log.prompt.short_description,
+        "prompt_text": exec_log.prompt.prompt_text,
+        "response": exec_log.output.response if exec_log.query_response_id else None,
+        "sources": exec_log.output.sources if exec_log.query_response_id else None,
+        "raw_prompt": (
+            exec_log.output.raw_prompt if exec_log.query_response_id else None
+        ),
+        "prompt_id": exec_log.prompt.id,
+        "execution_session_id": exec_log.execution_session_id,
+    }
+
+
+def _twitter_prompt_sessions(gaceta):
+    return [
+        {
+            "exec_session": session.to_json() if session else None,
+            "logs": [_twitter_prompt_log_json(exec_log) for exec_log in session.logs],
+        }
+        for session in gaceta.exec_sess or []
+    ]
+
+
+def _with_twitter_prompt_logs(query, twitter_prompt_id):
+    """Eager-load sessions and only the logs of ``twitter_prompt_id``."""
+    return query.options(
+        selectinload(GacetaPDF.exec_sess)
+        .selectinload(
+            ExecutionSession.logs.and_(
+                ContentExecutionLog.prompt_id == twitter_prompt_id
+            )
+        )
+        .options(
+            joinedload(ContentExecutionLog.prompt),
+            joinedload(ContentExecutionLog.output),
+        )
+    )
+
+
 def get_twitter_prompts(db: Session, gaceta_id: int, twitter_prompt_id):
     try:
-        gaceta = db.query(GacetaPDF).filter_by(id=gaceta_id).one()
-        exec_session = gaceta.exec_sess
-        exec = []
-        if exec_session:
-            for session in exec_session:
-                logs = []
-                content_exec_logs = session.logs
-                for exec_log in content_exec_logs:
-                    if exec_log.prompt_id == twitter_prompt_id:
-                        logs.append(
-                            {
-                                "id": exec_log.id,
-                                "name": exec_log.prompt.name,
-                                "state": exec_log.state,
-                                "short_description": exec_log.prompt.short_description,
-                                "prompt_text": exec_log.prompt.prompt_text,
-                                "response": (
-                                    exec_log.output.response
-                                    if exec_log.query_response_id
-                                    else None
-                                ),
-                                "sources": (
-                                    exec_log.output.sources
-                                    if exec_log.query_response_id
-                                    else None
-                                ),
-                                "raw_prompt": (
-                                    exec_log.output.raw_prompt
-                                    if exec_log.query_response_id
-                                    else None
-                                ),
-                                "prompt_id": exec_log.prompt.id,
-                                "execution_session_id": exec_log.execution_session_id,
-                            }
-                        )
-                exec.append(
-                    {
-                        "exec_session": session.to_json() if session else None,
-                        "logs": logs,
-                    }
-                )
-        return exec
+        gaceta = _with_twitter_prompt_logs(
+            db.query(GacetaPDF).filter_by(id=gaceta_id), twitter_prompt_id
+        ).one()
+        return _twitter_prompt_sessions(gaceta)
     except NoResultFound:
         raise HTTPException(status_code=404, detail="Execution session not found")
 
 
+def encode_keyset_cursor(timestamp: datetime, row_id):
+    return f"{timestamp.isoformat()}_{row_id}"
+
+
+def decode_keyset_cursor(cursor: str, id_type=int):
+    """Inverse of ``encode_keyset_cursor``; 400 on anything else."""
+    try:
+        timestamp, row_id = cursor.rsplit("_", 1)
+        return datetime.fromisoformat(timestamp), id_type(row_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def list_gacetas_with_twitter_prompts(
+    db: Session,
+    twitter_prompt_id: int,
+    limit: int = 20,
+    cursor: str = None,
+    order: str = "desc",
+    date=None,
+):
+    """One page of gacetas with their sessions and twitter prompt logs.
+
+    Keyset pagination on (date, id): ``cursor`` is the ``next_cursor`` of the
+    previous page, so deep pages cost the same as the first one. Sessions and
+    logs are eager-loaded in a constant number of queries per page.
+    """
+    query = db.query(GacetaPDF)
+    if date:
+        start_date = datetime.combine(date, datetime.min.time())
+        end_date = datetime.combine(date, datetime.max.time())
+        query = query.filter(
+            and_(GacetaPDF.date >= start_date, GacetaPDF.date <= end_date)
+        )
+
+    key = tuple_(GacetaPDF.date, GacetaPDF.id)
+    if cursor:
+        position = tuple_(*decode_keyset_cursor(cursor))
+        query = query.filter(key > position if order == "asc" else key < position)
+
+    if order == "asc":
+        query = query.order_by(GacetaPDF.date.asc(), GacetaPDF.id.asc())
+    else:
+        query = query.order_by(GacetaPDF.date.desc(), GacetaPDF.id.desc())
+
+    gacetas = _with_twitter_prompt_logs(query, twitter_prompt_id).limit(limit + 1).all()
+    page = gacetas[:limit]
+    return {
+        "gacetas": [
+            {
+                "gaceta": gaceta.to_json(),
+                "twitter_prompts": _twitter_prompt_sessions(gaceta),
+            }
+            for gaceta in page
+        ],
+        "next_cursor": (
+            encode_keyset_cursor(page[-1].date, page[-1].id)
+            if len(gacetas) > limit
+            else None
+        ),
+    }
+
+
 import logging
 
 
@@ -209,14 +315,16 @@ def display_last_execution_session(db: Session, session_id: str):
     try:
         logging.info(f"Fetching execution session with ID: {session_id}")
         exec_session = db.query(ExecutionSession).filter_by(id=session_id).one()
-        content_template = exec_session.content_template
         logs = []
         all_prompts = (
-            db.query(Prompt).filter(Prompt.template_id == content_template.id).all()
+            db.query(Prompt)
+            .filter(Prompt.template_id == exec_session.content_template_id)
+            .all()
         )
+        last_logs = get_last_executed_logs(db, session_id)
 
         for prompt in all_prompts:
-            log = get_last_executed_log(db, prompt.id, session_id)
+            log = last_logs.get(prompt.id)
             if log:
                 logs.append(
                     {
@@ -283,25 +391,24 @@ def get_manual_prompts(db: Session, template_id: int):
 
 
 def get_execution_session_prompts_results(db: Session, session_id: str):
-    session = db.query(ExecutionSession).filter_by(id=session_id).first()
-    if not session:
-        return {}
-    prompt_results = {}
-    for log in session.logs:
-        if log.state == ExecutionState.EXECUTED.value and log.query_response_id:
-            prompt_results[log.prompt.alias] = log.output.response
-    return prompt_results
+    return {
+        log.prompt.alias: log.output.response
+        for log in get_last_executed_logs(db, session_id).values()
+    }
 
 
 import os
+import re
+import threading
 import traceback
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
 from datetime import datetime
 
-from langchain.prompts import PromptTemplate
 from sqlalchemy.orm import Session
 
 from config import config
-from faiss_helper import FAISSHelper
 from models import (
     ContentExecutionLog,
     ExecutionSession,
@@ -309,14 +416,81 @@ from models import (
     Prompt,
     PromptQueryResponse,
 )
-from qa import get_llm, query_folder
+from services.response_cache import response_cache
+
+ALIAS_PATTERN = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+
+def prompt_dependencies(prompts):
+    """Map each prompt id to the ids of the prompts whose ``{{alias}}`` it uses."""
+    by_alias = {prompt.alias: prompt.id for prompt in prompts if prompt.alias}
+    return {
+        prompt.id: {
+            by_alias[alias]
+            for alias in ALIAS_PATTERN.findall(prompt.prompt_text or "")
+            if by_alias.get(alias, prompt.id) != prompt.id
+        }
+        for prompt in prompts
+    }
 
 
 class PromptExecutionEngine:
     def __init__(self, db: Session):
         self.db = db
+        self._buffered = False
+        self._indexes = {}
+        self._index_lock = threading.Lock()
+
+    @contextmanager
+    def unit_of_work(self):
+        """Buffer the writes made inside the block and commit them once.
+
+        Keep the block short: autoflush is off, so nothing reaches SQLite
+        until the commit, and everything in it is lost together on a crash.
+        A block nested in another one joins it.
+        """
+        if self._buffered:
+            yield
+            return
+        self._buffered = True
+        try:
+            with self.db.no_autoflush:
+                yield
+            self.db.commit()
+            response_cache.invalidate()
+        except Exception:
+            self.db.rollback()
+            raise
+        finally:
+            self._buffered = False
+
+    def _commit(self):
+        if not self._buffered:
+            self.db.commit()
+            response_cache.invalidate()
+
+    def gaceta_index(self, date):
+        """The FAISS index of ``date``'s gaceta, or None if it has none.
+
+        Loaded once per engine (one template run) and shared read-only by the
+        prompt workers. Loading it per worker also raced on the one-off
+        legacy/BM25 upgrade that the first load writes to disk.
+        """
+        from faiss_helper import FAISSHelper
+
+        directory = os.path.join(config.GACETA_PDFS_DIR, date.strftime("%Y-%m-%d"))
+        with self._index_lock:
+            if directory not in self._indexes:
+                if not os.path.exists(os.path.join(directory, "index.faiss")):
+                    return None
+                self._indexes[directory] = FAISSHelper().load_faiss_index(directory)
+            return self._indexes[directory]
 
     def run_prompt_by_date(self, query: str, **kargs):
+        # LangChain, OpenAI and FAISS cost seconds to import; only prompt
+        # execution needs them, not the API routes that import this module
+        from qa import get_llm, query_folder
+
         date = kargs.pop("date", None)
         if date is None:
             llm = get_llm(**kargs)
@@ -337,14 +511,8 @@ class PromptExecutionEngine:
             }
             # return result
 
-        faiss_helper = FAISSHelper()
-        latest_gaceta_dir = os.path.join(
-            config.GACETA_PDFS_DIR, date.strftime("%Y-%m-%d")
-        )
-
-        if os.path.exists(os.path.join(latest_gaceta_dir, "index.faiss")):
-            db = faiss_helper.load_faiss_index(latest_gaceta_dir)
-
+        db = self.gaceta_index(date)
+        if db is not None:
             llm = get_llm(
                 model=config.OPENAI_MODEL_NAME,
                 openai_api_key=config.OPENAI_API_KEY,
@@ -375,14 +543,7 @@ class PromptExecutionEngine:
         date = gaceta.date if gaceta else None
 
         prompt_results = self.get_execution_session_prompts_results(session_id)
-
-        # Replace aliases with results from previous executions
-        for alias, result in prompt_results.items():
-            placeholder = f"{{{{{alias}}}}}"
-            prompt_text = prompt_text.replace(placeholder, result)
-
-        prompt_template = PromptTemplate.from_template(prompt_text)
-        formatted_prompt = prompt_template.invoke({}).text
+        formatted_prompt = self.render_prompt(prompt_text, prompt_results)
 
         return self.run_prompt_by_date(
             formatted_prompt,
@@ -392,17 +553,113 @@ class PromptExecutionEngine:
             max_tokens=max_tokens,
         )
 
+    def render_prompt(self, prompt_text: str, prompt_results: dict):
+        # Replace aliases with results from previous executions
+        for alias, result in prompt_results.items():
+            placeholder = f"{{{{{alias}}}}}"
+            prompt_text = prompt_text.replace(placeholder, result)
+
+        from langchain.prompts import PromptTemplate
+
+        prompt_template = PromptTemplate.from_template(prompt_text)
+        return prompt_template.invoke({}).text
+
     def get_prompts(self, template_id, re_execute):
         if re_execute:
             return self.db.query(Prompt).filter_by(template_id=template_id).all()
         return self.get_scheduled_prompts(template_id)
 
-    def process_prompts(self, prompts, session_id):
-        for prompt in prompts:
-            try:
-                self.execute_and_log_prompt(prompt, session_id)
-            except Exception as e:
-                self.log_execution_failure(prompt, session_id, e)
+    def process_prompts(
+        self,
+        prompts,
+        session_id,
+        max_workers: int = None,
+        model: str = config.OPENAI_MODEL_NAME,
+        temp: float = config.OPENAI_TEMPERATURE,
+        max_tokens: int = config.OPENAI_MAX_TOKENS,
+    ):
+        """Run ``prompts`` as a DAG of ``{{alias}}`` references.
+
+        A prompt is submitted to the worker pool as soon as every prompt it
+        references has finished, so independent prompts run concurrently and
+        the wall time follows the longest dependency chain. Only the LLM and
+        FAISS work runs in worker threads; rendering and logging stay on the
+        calling thread, which owns the database session.
+
+        Returns the ids of the prompts that executed successfully.
+        """
+        exec_session = self.db.query(ExecutionSession).filter_by(id=session_id).first()
+        if not exec_session:
+            for prompt in prompts:
+                self.log_execution_failure(
+                    prompt, session_id, ValueError(f"Session {session_id} not found")
+                )
+            return set()
+
+        gaceta = exec_session.gaceta
+        date = gaceta.date if gaceta else None
+        prompt_results = self.get_execution_session_prompts_results(session_id)
+
+        by_id = {prompt.id: prompt for prompt in prompts}
+        waiting_on = prompt_dependencies(prompts)
+        running = {}
+        executed = set()
+
+        with ThreadPoolExecutor(
+            max_workers=max_workers or config.PROMPT_EXECUTION_WORKERS
+        ) as pool:
+            while waiting_on or running:
+                for prompt_id in [pid for pid, deps in waiting_on.items() if not deps]:
+                    del waiting_on[prompt_id]
+                    prompt = by_id[prompt_id]
+                    try:
+                        formatted_prompt = self.render_prompt(
+                            prompt.prompt_text, prompt_results
+                        )
+                    except Exception as e:
+                        self.log_execution_failure(prompt, session_id, e)
+                        self._mark_finished(waiting_on, prompt_id)
+                        continue
+                    future = pool.submit(
+                        self.run_prompt_by_date,
+                        formatted_prompt,
+                        model=model,
+                        date=date if prompt.doc_aware else None,
+                        temperature=temp,
+                        max_tokens=max_tokens,
+                    )
+                    running[future] = prompt
+
+                if not running:
+                    if waiting_on:
+                        # Whatever is left waits on itself: an {{alias}} cycle
+                        for prompt_id in waiting_on:
+                            self.log_execution_failure(
+                                by_id[prompt_id],
+                                session_id,
+                                ValueError("Circular {{alias}} reference"),
+                            )
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    prompt = running.pop(future)
+                    try:
+                        response_text = future.result()
+                        self.log_prompt_response(prompt, session_id, response_text)
+                        if prompt.alias:
+                            prompt_results[prompt.alias] = response_text["answer"]
+                        executed.add(prompt.id)
+                    except Exception as e:
+                        self.log_execution_failure(prompt, session_id, e)
+                    self._mark_finished(waiting_on, prompt.id)
+
+        return executed
+
+    @staticmethod
+    def _mark_finished(waiting_on, prompt_id):
+        for dependencies in waiting_on.values():
+            dependencies.discard(prompt_id)
 
     def log_execution_failure(self, prompt, session_id, exception):
         error_message = f"{str(exception)}\n\n{traceback.format_exc()}"
@@ -415,37 +672,49 @@ class PromptExecutionEngine:
 
     def execute_and_log_prompt(self, prompt, session_id):
         response_text = self.execute_prompt(prompt, session_id)
+        self.log_prompt_response(prompt, session_id, response_text)
+
+    def log_prompt_response(self, prompt, session_id, response_text):
         query = PromptQueryResponse(
+            id=str(uuid.uuid4()),
             raw_prompt=(
                 response_text["partial"].format() if response_text["partial"] else None
             ),
             response=response_text["answer"],
             prompt_template_id=prompt.id,
             sources=str(response_text["sources"]),
+            created_at=datetime.utcnow(),
         )
-        self.db.add(query)
-        self.db.commit()
-        self.log_prompt_execution(
-            session_id,
-            prompt.id,
-            ExecutionState.EXECUTED.value,
-            query_response_id=query.id,
-            template_id=prompt.template_id,
-        )
+        # The paid-for response and its log are committed as soon as they exist
+        with self.unit_of_work():
+            self.db.add(query)
+            self.log_prompt_execution(
+                session_id,
+                prompt.id,
+                ExecutionState.EXECUTED.value,
+                query_response_id=query.id,
+                template_id=prompt.template_id,
+            )
 
-    def update_session_status(self, session_id, prompts):
-        session = self.db.query(ExecutionSession).filter_by(id=session_id).first()
-        all_executed = all(
-            get_last_executed_log(self.db, prompt.id, session_id) is not None
-            for prompt in prompts
-        )
+    def update_session_status(self, session_id, prompts, executed_ids=None):
+        """Mark the session EXECUTED when every prompt has an executed log.
+
+        ``executed_ids`` (as returned by ``process_prompts``) avoids reading the
+        logs back from the database.
+        """
+        session = self.db.get(ExecutionSession, session_id)
+        if executed_ids is None:
+            executed_ids = get_last_executed_logs(
+                self.db, session_id, [prompt.id for prompt in prompts]
+            )
+        all_executed = all(prompt.id in executed_ids for prompt in prompts)
         session.status = (
             ExecutionState.EXECUTED.value
             if all_executed
             else ExecutionState.FAILED.value
         )
         session.completed_at = datetime.now() if all_executed else None
-        self.db.commit()
+        self._commit()
 
     def execute_content_template_prompts(
         self, user_id: int, template_id: int, gaceta_id=None, re_execute=False
@@ -457,8 +726,26 @@ class PromptExecutionEngine:
             else self.db.query(Prompt).filter_by(template_id=template_id).all()
         )
 
-        self.process_prompts(prompts, session_id)
-        self.update_session_status(session_id, prompts)
+        # Each prompt's response and log commit on their own; the final status
+        # is a separate single commit
+        executed = self.process_prompts(prompts, session_id)
+        self.update_session_status(session_id, prompts, executed)
+        return session_id
+
+    def resume_content_template_prompts(self, session_id: str):
+        """Run only the prompts of ``session_id`` that have not executed yet.
+
+        Prompts that already succeeded keep their (paid-for) responses, which
+        also feed the ``{{alias}}`` references of the prompts run again.
+        """
+        exec_session = self.db.get(ExecutionSession, session_id)
+        prompts = self.get_scheduled_prompts(exec_session.content_template_id)
+        done = get_last_executed_logs(
+            self.db, session_id, [prompt.id for prompt in prompts]
+        )
+        pending = [prompt for prompt in prompts if prompt.id not in done]
+        executed = self.process_prompts(pending, session_id)
+        self.update_session_status(session_id, prompts, set(done) | executed)
         return session_id
 
     def re_execute_prompt(self, session_id: str, prompt_id: int, **kargs):
@@ -471,14 +758,7 @@ class PromptExecutionEngine:
                 self.log_execution_failure(prompt, session_id, e)
 
     def get_execution_session_prompts_results(self, session_id: str):
-        session = self.db.query(ExecutionSession).filter_by(id=session_id).first()
-        if not session:
-            return {}
-        prompt_results = {}
-        for log in session.logs:
-            if log.state == ExecutionState.EXECUTED.value and log.query_response_id:
-                prompt_results[log.prompt.alias] = log.output.response
-        return prompt_results
+        return get_execution_session_prompts_results(self.db, session_id)
 
     def create_execution_session(self, user_id: int, template_id: int, gaceta_id: int):
         new_session = ExecutionSession(
@@ -489,7 +769,7 @@ class PromptExecutionEngine:
             document_id=gaceta_id,
         )
         self.db.add(new_session)
-        self.db.commit()
+        self._commit()
         return new_session.id
 
     def log_prompt_execution(
@@ -500,6 +780,8 @@ class PromptExecutionEngine:
         error_message: str = None,
         **kwargs,
     ):
+        # Stamp now, not at flush time, which is deferred inside a unit of work
+        kwargs.setdefault("created_at", datetime.utcnow())
         log_entry = ContentExecutionLog(
             execution_session_id=session_id,
             prompt_id=prompt_id,
@@ -508,7 +790,7 @@ class PromptExecutionEngine:
             **kwargs,
         )
         self.db.add(log_entry)
-        self.db.commit()
+        self._commit()
         return log_entry
 
     def get_scheduled_prompts(self, template_id: int):
@@ -551,7 +833,7 @@ def get_execution_session_by_date(db: Session, date: datetime):
         )
 
     gacetas = query.first()
-    return gacetas.exec_sess
+    return gacetas.exec_sess if gacetas else []
     # return db.query(ExecutionSession).filter(
     #     ExecutionSession.created_at >= date,
     #     ExecutionSession.created_at < date + timedelta(days=1),
@@ -561,3 +843,36 @@ def get_execution_session_by_date(db: Session, date: datetime):
 
 def list_available_index_days(db: Session):
     return db.query(GacetaPDF.date.desc()).distinct().all()
+
+
+def get_execution_sessions_state(db: Session, *criteria):
+    """Last-modified state of the sessions matching ``criteria``.
+
+    One row per session: status, completion, approval and the count and
+    newest timestamp of its logs. Cheap to compute (the logs side is an index
+    scan), and it changes whenever the prompt engine writes to the session,
+    which makes it the basis of the execution session endpoints' ETags.
+    """
+    return (
+        db.query(
+            ExecutionSession.id,
+            ExecutionSession.status,
+            ExecutionSession.completed_at,
+            ExecutionSession.is_approved,
+            func.count(ContentExecutionLog.id),
+            func.max(ContentExecutionLog.created_at),
+        )
+        .outerjoin(
+            ContentExecutionLog,
+            ContentExecutionLog.execution_session_id == ExecutionSession.id,
+        )
+        .filter(*criteria)
+        .group_by(ExecutionSession.id)
+        .order_by(ExecutionSession.id)
+        .all()
+    )
+
+
+def get_gacetas_state(db: Session):
+    """Count and newest date of the gacetas: what the available days depend on."""
+    return db.query(func.count(GacetaPDF.id), func.max(GacetaPDF.date)).one()
@@ -20,7 +20,7 @@
             ▼                                 ▼
     ┌─────────────────┐               ┌──────────────────┐
     │ Connection Pool │               │   SQLite File    │
-    │ (10 + 20 ovflw) │◀──────────────│   (gaceta1.db)   │
+    │ (SQLite profile)│◀──────────────│ (gaceta1.db, WAL)│
     └─────────────────┘               └──────────────────┘
             │                                 │
             │ Session Creation                │ File I/O
@@ -93,14 +93,18 @@
     ⚠️  LOW: No connection string validation - malformed URLs crash application
 
 🛡️ Risk Analysis:
-    • Data Integrity: SQLite WAL mode not enabled, potential corruption on crashes
-    • Concurrent Access: Single-writer limitation affects high-concurrency scenarios
+    • Concurrent Access: Single writer at a time; WAL lets readers proceed and
+      busy_timeout makes writers queue instead of failing with "database is locked"
     • Resource Leaks: Session cleanup depends on proper try/finally patterns
     • File System: Database file could grow unbounded without maintenance
     • Backup Strategy: No automated backup mechanism for data protection
 
 ⚡ Performance Characteristics:
-    • Connection Pool: 10 base + 20 overflow = 30 max concurrent connections
+    • SQLite profile (applied on every new connection):
+      journal_mode=WAL, synchronous=NORMAL, busy_timeout=SQLITE_BUSY_TIMEOUT_MS,
+      mmap_size=SQLITE_MMAP_SIZE, cache_size=-SQLITE_CACHE_SIZE_KB, temp_store=MEMORY
+    • Connection Pool: QueuePool of API_THREADPOOL_SIZE long-lived connections,
+      no recycling (SQLite connections are local file handles, not sockets)
     • Session Overhead: ~1-2ms per session creation/cleanup
     • SQLite Performance: ~1000 reads/sec, ~100 writes/sec sustained
     • Memory Usage: ~10MB base + session objects + query cache
@@ -152,12 +156,17 @@
 
 🔧 Configuration Options:
     ```python
-    # Connection Pool Settings
+    # Server databases (DATABASE_URL=postgresql://...)
     POOL_SIZE = 10                    # Base connection pool size
     MAX_OVERFLOW = 20                 # Additional connections under load
     POOL_TIMEOUT = 30                 # Seconds to wait for connection
     POOL_RECYCLE = 1800              # Connection lifetime (30 minutes)
 
+    # SQLite profile (config.py)
+    SQLITE_BUSY_TIMEOUT_MS = 5000     # Writers wait for the lock this long
+    SQLITE_MMAP_SIZE = 268435456      # 256 MB memory-mapped reads
+    SQLITE_CACHE_SIZE_KB = 65536      # 64 MB page cache per connection
+
     # SQLite Settings
     DATABASE_URL = "sqlite:///gaceta1.db"
     AUTOCOMMIT = False               # Explicit transaction control
@@ -165,7 +174,6 @@
     ```
 
 🚨 Production Recommendations:
-    • Enable SQLite WAL mode for better concurrency
     • Implement database backup strategy with rotation
     • Add connection health checks and monitoring
     • Consider PostgreSQL for high-concurrency scenarios
@@ -175,21 +183,72 @@ Author: GacetaChat Team | Version: 2.1.0 | Last Updated: 2024-12-19
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 """
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 
 # app/models/base.py
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+
+from config import config
 
 Base = declarative_base()
-DATABASE_URL = "sqlite:///gaceta1.db"
-engine = create_engine(
-    DATABASE_URL,
-    pool_size=10,  # Increase the pool size
-    max_overflow=20,  # Increase the overflow size
-    pool_timeout=30,  # Adjust timeout as needed
-    pool_recycle=1800,  # Adjust recycle time as needed
-)
+DATABASE_URL = config.DATABASE_URL
+
+
+def sqlite_pragmas():
+    return {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": config.SQLITE_BUSY_TIMEOUT_MS,
+        "mmap_size": config.SQLITE_MMAP_SIZE,
+        "cache_size": -config.SQLITE_CACHE_SIZE_KB,  # negative = KiB
+        "temp_store": "MEMORY",
+    }
+
+
+def apply_sqlite_profile(dbapi_connection, connection_record=None):
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma, value in sqlite_pragmas().items():
+            cursor.execute(f"PRAGMA {pragma}={value}")
+    finally:
+        cursor.close()
+
+
+def create_db_engine(url: str = DATABASE_URL, **kwargs):
+    """Engine with a pool and connection settings suited to the backend.
+
+    File-backed SQLite gets the WAL profile on every new connection and a
+    QueuePool of long-lived connections shared across threads. In-memory
+    SQLite keeps SQLAlchemy's defaults; server databases keep the original
+    pool settings.
+    """
+    if not url.startswith("sqlite"):
+        options = dict(pool_size=10, max_overflow=20, pool_timeout=30)
+        options.update(pool_recycle=1800, **kwargs)
+        return create_engine(url, **options)
+
+    if url in ("sqlite://", "sqlite:///:memory:"):
+        return create_engine(url, **kwargs)
+
+    options = dict(
+        poolclass=QueuePool,
+        pool_size=config.API_THREADPOOL_SIZE,
+        max_overflow=10,
+        pool_timeout=30,
+        connect_args={
+            "check_same_thread": False,
+            "timeout": config.SQLITE_BUSY_TIMEOUT_MS / 1000,
+        },
+    )
+    options.update(kwargs)
+    engine = create_engine(url, **options)
+    event.listen(engine, "connect", apply_sqlite_profile)
+    return engine
+
+
+engine = create_db_engine()
 Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
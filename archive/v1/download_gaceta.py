@@ -56,7 +56,7 @@
     • requests: HTTP client for web scraping and PDF downloads
     • beautifulsoup4: HTML parsing for PDF link extraction
     • pytz: Timezone handling for Costa Rica time calculations
-    • schedule: Task scheduling for automated daily execution
+    • resource: Per-day CPU and block IO accounting (optional on Windows)
     • crud: AI prompt execution engine and session management
     • pdf_processor: Document processing and vector index creation
 
@@ -105,10 +105,14 @@
 
 ⚡ Performance Characteristics:
     • Download Speed: ~2-5 seconds per PDF (5-20MB typical file size)
-    • Scheduling Overhead: <1 second for daily check and execution
+    • Scheduling Overhead: event-driven, no fixed tick; a finished day costs
+      no DB session, index load or HTTP request until tomorrow's window
+    • Polling: homepage only, inside the publication window, with exponential
+      backoff (60s doubling to 15 min); the PDF is fetched once its link changes
     • Memory Usage: ~50MB baseline + 2x PDF size during processing
     • Disk Usage: ~50MB per day (varies by gazette size)
-    • Processing Time: 30-120 seconds for complete PDF→FAISS pipeline
+    • Processing Time: 30-120 seconds for complete PDF→FAISS pipeline, run by
+      the job workers (jobs.py); the daemon only queues and checks the jobs
 
 🧪 Testing Strategy:
     • Unit Tests: PDF extraction, file operations, database persistence
@@ -135,31 +139,31 @@
     # Manual execution
     download_daily_gaceta()
 
-    # Scheduled execution
-    schedule.every().day.at("09:00").do(download_daily_gaceta)
-
-    # Process existing PDF
+    # Whole pipeline once, now (download, index, prompts)
     check_and_download_today_pdf()
 
+    # One state machine step; returns when the next one is due
+    next_run = IngestionDaemon().step()
+
     # Run with AI processing
     python download_gaceta.py  # Background daemon mode
     ```
 
 🔧 Scheduling Configuration:
     ```python
-    # Daily Schedule (Costa Rica Time)
-    DOWNLOAD_TIME = "09:00"              # 9 AM daily download
-    RETRY_INTERVAL = 3600                # 1 hour retry on failure
-    MAX_RETRIES = 3                      # Maximum retry attempts
+    # Daily state machine (Costa Rica time), see config.py
+    # WAITING → POLLING → DOWNLOADED → INDEXED → COMPLETE (or MISSED / FAILED)
+    PUBLICATION_WINDOW_START = "05:00"   # first homepage poll
+    PUBLICATION_WINDOW_END = "16:00"     # day is MISSED after this
+    INGESTION_POLL_INITIAL_SECONDS = 60  # backoff doubles per unchanged poll
+    INGESTION_POLL_MAX_SECONDS = 900
+    INGESTION_MAX_ATTEMPTS = 5           # attempts of the index / prompts jobs
+    INGESTION_STATE_FILE = "ingestion_state.json"  # survives restarts
 
     # File Organization
     STORAGE_PATTERN = "gaceta_pdfs/{date}/gaceta.pdf"
     DATE_FORMAT = "%Y-%m-%d"             # ISO date format
     TIMEZONE = "America/Costa_Rica"      # Local government timezone
-
-    # Processing Triggers
-    AUTO_PROCESS_NEW_PDFS = True         # Trigger AI pipeline automatically
-    AI_TEMPLATE_ID = 1                   # Default prompt template for processing
     ```
 
 🚨 Error Handling Patterns:
@@ -194,40 +198,52 @@ Author: GacetaChat Team | Version: 2.1.0 | Last Updated: 2024-12-19
 """
 
 # download_gaceta.py
-import datetime
+import enum
+import json
 import logging
 import os
 import time
-from datetime import datetime
+from datetime import datetime, timedelta
 
 import pytz
 import requests
-import schedule
-
-# def fetch_pdf(url):
-#     import requests
 from bs4 import BeautifulSoup
 
 from config import config
 from crud import PromptExecutionEngine, get_execution_session_by_date
 from db import Session
-from faiss_helper import FAISSHelper
+from jobs import enqueue
 from logging_setup import setup_logging
-from models import ExecutionState, GacetaPDF  # , Session
-from pdf_processor import PDFProcessor
+from models import ExecutionSession, ExecutionState, GacetaPDF, JobState, init_db
+from profiling import profile_run
+from services.response_cache import response_cache
+
+try:
+    import resource
+except ImportError:  # Windows: CPU time only
+    resource = None
 
 setup_logging()
 
+GACETA_SITE = "https://www.imprentanacional.go.cr"
+COSTA_RICA_TZ = pytz.timezone("America/Costa_Rica")
+REQUEST_TIMEOUT = 30  # seconds, homepage and PDF downloads
 
-def download_pdf():
-    response = requests.get("https://www.imprentanacional.go.cr/gaceta/")
+
+def find_pdf_url():
+    """Relative URL of the PDF currently linked from the gazette homepage."""
+    response = requests.get(f"{GACETA_SITE}/gaceta/", timeout=REQUEST_TIMEOUT)
     soup = BeautifulSoup(response.text, "html.parser")
 
     anchor = soup.select_one("#ctl00_PdfGacetaDescargarHyperLink")
+    return anchor["href"] if anchor else None
+
 
-    if anchor:
-        pdf_url = anchor["href"]
-        pdf_response = requests.get("https://www.imprentanacional.go.cr" + pdf_url)
+def download_pdf(pdf_url=None):
+    pdf_url = pdf_url or find_pdf_url()
+
+    if pdf_url:
+        pdf_response = requests.get(GACETA_SITE + pdf_url, timeout=REQUEST_TIMEOUT)
 
         return pdf_response.content
     else:
@@ -243,12 +259,79 @@ def save_pdf_to_db(file_path, date_str):
         session.add(gaceta)
         session.commit()
         session.close()
+        # New day for /execution_session/available in every API worker
+        response_cache.invalidate()
         logging.info(f"Saved PDF to database for {date_str}")
         return gaceta
     except Exception as e:
         logging.error(f"Failed to save PDF to database: {e}")
 
 
+def gaceta_pdf_path(date_str):
+    return os.path.join(config.GACETA_PDFS_DIR, date_str, "gaceta.pdf")
+
+
+def gaceta_exists(date_str):
+    session = Session()
+    try:
+        return (
+            session.query(GacetaPDF.id)
+            .filter_by(date=datetime.strptime(date_str, "%Y-%m-%d"))
+            .first()
+            is not None
+        )
+    finally:
+        session.close()
+
+
+def store_gaceta_pdf(date_str, pdf_data=None):
+    """Write the day's PDF (unless already on disk) and record it in GacetaPDF."""
+    file_path = gaceta_pdf_path(date_str)
+    if pdf_data is not None:
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, "wb") as f:
+            f.write(pdf_data)
+    return save_pdf_to_db(file_path, date_str)
+
+
+def build_gaceta_index(date_str):
+    """Create the day's FAISS index unless it is already on disk."""
+    directory = os.path.dirname(gaceta_pdf_path(date_str))
+    if os.path.exists(os.path.join(directory, "index.faiss")):
+        return
+    # Heavy (LangChain, FAISS): imported by the job that indexes, not the daemon
+    from faiss_helper import FAISSHelper
+    from pdf_processor import PDFProcessor
+
+    PDFProcessor(FAISSHelper()).process_pdf(gaceta_pdf_path(date_str), directory)
+
+
+def execute_gaceta_prompts(date_str, template_id=1):
+    """Run (or resume) the day's content template; returns the session status."""
+    session = Session()
+    try:
+        date_obj = datetime.strptime(date_str, "%Y-%m-%d")
+        sessions = get_execution_session_by_date(session, date_obj)
+        if any(s.status == ExecutionState.EXECUTED.value for s in sessions):
+            return ExecutionState.EXECUTED.value
+
+        engine = PromptExecutionEngine(session)
+        # A retry resumes the day's unfinished run instead of paying again for
+        # the prompts that already succeeded
+        unfinished = [s for s in sessions if s.content_template_id == template_id]
+        if unfinished:
+            latest = max(unfinished, key=lambda s: s.created_at or datetime.min)
+            session_id = engine.resume_content_template_prompts(latest.id)
+        else:
+            gaceta = session.query(GacetaPDF).filter_by(date=date_obj).one()
+            session_id = engine.execute_content_template_prompts(
+                None, template_id, gaceta_id=gaceta.id
+            )
+        return session.get(ExecutionSession, session_id).status
+    finally:
+        session.close()
+
+
 def download_daily_gaceta():
 
     # Set the timezone to Costa Rica
@@ -291,59 +374,268 @@ def download_daily_gaceta():
 
 
 def check_and_download_today_pdf():
+    """Run today's whole pipeline once, right now (manual runs).
 
-    # Set the timezone to Costa Rica
-    costa_rica_tz = pytz.timezone("America/Costa_Rica")
-    current_time = datetime.now(costa_rica_tz)
+    The daemon is IngestionDaemon; this ignores the publication window and
+    the persisted state.
+    """
+    date_str = datetime.now(COSTA_RICA_TZ).strftime("%Y-%m-%d")
+    if not gaceta_exists(date_str):
+        logging.info(f"Downloading PDF for {date_str}")
+        download_daily_gaceta()
+    if not gaceta_exists(date_str):
+        return None
 
-    # Get the date string in the format "YYYY-MM-DD"
-    date_str = current_time.strftime("%Y-%m-%d")
-    latest_gaceta_dir = os.path.join(config.GACETA_PDFS_DIR, date_str)
+    build_gaceta_index(date_str)
+    return execute_gaceta_prompts(date_str)
 
+
+def run_stage_job(kind, date_str):
+    """Queue the day's ``kind`` job (once per day) and return its state."""
     session = Session()
-    existing_gaceta = (
-        session.query(GacetaPDF)
-        .filter_by(date=datetime.strptime(date_str, "%Y-%m-%d"))
-        .first()
-    )
-    if not existing_gaceta:
-        logging.info(f"Downloading PDF for {date_str}")
-        download_daily_gaceta()
-    else:
-        logging.info(f"PDF for {date_str} already exists")
+    try:
+        job = enqueue(
+            session,
+            kind,
+            {"day": date_str},
+            max_attempts=config.INGESTION_MAX_ATTEMPTS,
+            dedupe_key=f"{kind}:{date_str}",
+        )
+        return job.state
+    finally:
+        session.close()
 
-    faiss_helper = FAISSHelper()
-    pdf_processor = PDFProcessor(faiss_helper)
 
-    # Check if FAISS index exists, load if it does, else process latest PDF
-    if os.path.exists(os.path.join(latest_gaceta_dir, "index.faiss")):
-        db = faiss_helper.load_faiss_index(latest_gaceta_dir)
-        db.index
-        # documents = db.docstore.get_all_documents()
-    else:
-        db, documents = pdf_processor.process_latest_pdf()
-        db.index
+class IngestionStage(enum.Enum):
+    WAITING = "WAITING"  # before the publication window
+    POLLING = "POLLING"  # in the window, today's PDF not linked yet
+    DOWNLOADED = "DOWNLOADED"  # PDF on disk and in GacetaPDF
+    INDEXED = "INDEXED"  # FAISS index written
+    COMPLETE = "COMPLETE"  # prompts executed, nothing left until tomorrow
+    MISSED = "MISSED"  # the window closed without a new PDF
+    FAILED = "FAILED"  # the indexing or prompts job ran out of attempts
+
+
+def _resource_usage():
+    """(CPU seconds, blocks read, blocks written) of this process so far."""
+    if resource is None:
+        return time.process_time(), 0, 0
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime, usage.ru_inblock, usage.ru_oublock
+
+
+class IngestionDaemon:
+    """State machine that ingests one gaceta per day.
+
+    A day moves WAITING → POLLING → DOWNLOADED → INDEXED → COMPLETE (or
+    MISSED / FAILED). Instead of a fixed tick, each ``step`` returns when
+    the next one is due: the window opening, the next homepage poll
+    (exponential backoff, only inside the publication window), a retry, or
+    tomorrow's window once the day is finished, when no DB session, index
+    load or HTTP request happens at all.
+
+    The state is written to INGESTION_STATE_FILE after every step, so a
+    restart resumes the day where it stopped. Per-day usage (wake-ups, HTTP
+    requests, CPU seconds, block IO) is kept there as well, with a short
+    history of previous days.
+
+    Indexing and prompt execution are queued as jobs (one per stage and
+    day) and run by the workers in jobs.py, which own their retries; the
+    daemon checks back every INGESTION_JOB_CHECK_SECONDS until the job is
+    DONE or FAILED.
+    """
+
+    HISTORY_DAYS = 14
+
+    def __init__(self, state_file=None, clock=None, sleep=time.sleep):
+        self.state_file = state_file or config.INGESTION_STATE_FILE
+        self.clock = clock or (lambda: datetime.now(COSTA_RICA_TZ))
+        self.sleep = sleep
+        self.state = self.load()
+
+    def load(self):
+        try:
+            with open(self.state_file) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            logging.warning(f"Ignoring unreadable ingestion state {self.state_file}")
+            return {}
+
+    def save(self):
+        tmp_file = f"{self.state_file}.tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_file, self.state_file)
+
+    @property
+    def stage(self):
+        return IngestionStage(self.state["stage"])
+
+    def _set_stage(self, stage):
+        logging.info(
+            f"Gaceta {self.state['day']}: {self.state['stage']} → {stage.value}"
+        )
+        self.state["stage"] = stage.value
+        self.state["attempts"] = 0
+
+    @staticmethod
+    def _at(day, hh_mm):
+        hour, minute = map(int, hh_mm.split(":"))
+        return day.replace(hour=hour, minute=minute, second=0, microsecond=0)
 
-    date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-    session_for_today = get_execution_session_by_date(session, date_obj)
+    def _tomorrow(self, now):
+        return self._at(now + timedelta(days=1), config.PUBLICATION_WINDOW_START)
 
-    prompt_execution_engine = PromptExecutionEngine(session)
+    def start_day(self, now):
+        day = now.strftime("%Y-%m-%d")
+        history = self.state.get("history", [])
+        if "usage" in self.state:
+            logging.info(
+                f"Ingestion usage for {self.state['day']}: {self.state['usage']}"
+            )
+            history = (history + [self.state["usage"]])[-self.HISTORY_DAYS :]
+
+        self.state = {
+            "day": day,
+            "stage": IngestionStage.WAITING.value,
+            "attempts": 0,
+            # Until today's PDF is linked, the homepage still points here
+            "last_pdf_url": self.state.get("pdf_url", self.state.get("last_pdf_url")),
+            "pdf_url": None,
+            "usage": {
+                "day": day,
+                "wakeups": 0,
+                "http_requests": 0,
+                "cpu_seconds": 0.0,
+                "read_blocks": 0,
+                "write_blocks": 0,
+            },
+            "history": history,
+        }
+        # Restarted on a day that was ingested by an earlier run or by hand
+        if gaceta_exists(day):
+            self._set_stage(IngestionStage.DOWNLOADED)
+
+    def _backoff(self, now, until=None):
+        delay = min(
+            config.INGESTION_POLL_INITIAL_SECONDS * 2 ** self.state["attempts"],
+            config.INGESTION_POLL_MAX_SECONDS,
+        )
+        self.state["attempts"] += 1
+        next_run = now + timedelta(seconds=delay)
+        return min(next_run, until) if until else next_run
+
+    def _wait(self, now):
+        opens = self._at(now, config.PUBLICATION_WINDOW_START)
+        if now < opens:
+            return opens
+        self._set_stage(IngestionStage.POLLING)
+        return now
+
+    def _poll(self, now):
+        closes = self._at(now, config.PUBLICATION_WINDOW_END)
+        if now >= closes:
+            logging.warning(f"No gaceta published for {self.state['day']}")
+            self._set_stage(IngestionStage.MISSED)
+            return self._tomorrow(now)
+
+        day = self.state["day"]
+        if os.path.exists(gaceta_pdf_path(day)):
+            store_gaceta_pdf(day)
+            self._set_stage(IngestionStage.DOWNLOADED)
+            return now
+
+        self.state["usage"]["http_requests"] += 1
+        pdf_url = find_pdf_url()
+        if not pdf_url or pdf_url == self.state["last_pdf_url"]:
+            return self._backoff(now, until=closes)
+
+        self.state["usage"]["http_requests"] += 1
+        pdf_data = download_pdf(pdf_url)
+        if not pdf_data:
+            return self._backoff(now, until=closes)
+        store_gaceta_pdf(day, pdf_data)
+        self.state["pdf_url"] = pdf_url
+        self._set_stage(IngestionStage.DOWNLOADED)
+        return now
+
+    def _await_job(self, now, kind, done_stage, then):
+        """Queue the stage's job; advance to ``done_stage`` once a worker ran it."""
+        state = run_stage_job(kind, self.state["day"])
+        if state == JobState.DONE.value:
+            self._set_stage(done_stage)
+            return then
+        if state == JobState.FAILED.value:
+            logging.error(f"Gaceta {self.state['day']}: {kind} job failed")
+            self._set_stage(IngestionStage.FAILED)
+            return self._tomorrow(now)
+        return now + timedelta(seconds=config.INGESTION_JOB_CHECK_SECONDS)
+
+    def _index(self, now):
+        return self._await_job(now, "index_gaceta", IngestionStage.INDEXED, now)
+
+    def _execute(self, now):
+        return self._await_job(
+            now, "execute_gaceta_prompts", IngestionStage.COMPLETE, self._tomorrow(now)
+        )
 
-    if isinstance(session_for_today, list):
-        session_for_today = session_for_today[0] if session_for_today else None
+    def step(self, now=None):
+        """Advance the state machine once and return when to step again."""
+        now = now or self.clock()
+        if self.state.get("day") != now.strftime("%Y-%m-%d"):
+            self.start_day(now)
+
+        handler = {
+            IngestionStage.WAITING: self._wait,
+            IngestionStage.POLLING: self._poll,
+            IngestionStage.DOWNLOADED: self._index,
+            IngestionStage.INDEXED: self._execute,
+        }.get(self.stage)
+        if handler is None:
+            self.state["usage"]["wakeups"] += 1
+            return self._tomorrow(now)
+
+        started = _resource_usage()
+        artifacts = []
+        try:
+            with profile_run(
+                f"ingestion-{self.stage.value}", config.PROFILE_DIR
+            ) as artifacts:
+                next_run = handler(now)
+        except Exception as e:
+            logging.error(f"Gaceta {self.state['day']} {self.stage.value} failed: {e}")
+            if (
+                self.stage != IngestionStage.POLLING
+                and self.state["attempts"] + 1 >= config.INGESTION_MAX_ATTEMPTS
+            ):
+                self._set_stage(IngestionStage.FAILED)
+                next_run = self._tomorrow(now)
+            else:
+                next_run = self._backoff(now)
 
-    if (
-        session_for_today is None
-        or session_for_today.status != ExecutionState.EXECUTED.value
-    ) and existing_gaceta is not None:
-        prompt_execution_engine.execute_content_template_prompts(
-            None, 1, gaceta_id=existing_gaceta.id
+        for path in artifacts:
+            logging.info(f"Profile saved: {path}")
+        usage = self.state["usage"]
+        cpu, read_blocks, write_blocks = (
+            end - begin for end, begin in zip(_resource_usage(), started)
         )
-    else:
-        if session_for_today.document_id is None:
-            session_for_today.document_id = existing_gaceta.id
-            session.commit()
-    session.close()
+        usage["wakeups"] += 1
+        usage["cpu_seconds"] = round(usage["cpu_seconds"] + cpu, 6)
+        usage["read_blocks"] += read_blocks
+        usage["write_blocks"] += write_blocks
+        self.state["next_run"] = next_run.isoformat()
+        self.save()
+        return next_run
+
+    def run_forever(self):
+        while True:
+            next_run = self.step()
+            delay = (next_run - self.clock()).total_seconds()
+            if delay > 0:
+                # Capped so wall-clock jumps (suspend, NTP) are caught within the hour
+                self.sleep(min(delay, 3600))
 
 
 # Configure logging
@@ -357,6 +649,10 @@ logging.basicConfig(
 def initial_check_and_create_missing_entries():
     session = Session()
     directory = config.GACETA_PDFS_DIR
+    known_days = {
+        date.strftime("%Y-%m-%d") for (date,) in session.query(GacetaPDF.date)
+    }
+    session.close()
 
     for date_folder in os.listdir(directory):
         folder_path = os.path.join(directory, date_folder)
@@ -364,12 +660,7 @@ def initial_check_and_create_missing_entries():
             date_str = date_folder
             try:
                 datetime.strptime(date_str, "%Y-%m-%d")
-                existing_gaceta = (
-                    session.query(GacetaPDF)
-                    .filter_by(date=datetime.strptime(date_str, "%Y-%m-%d"))
-                    .first()
-                )
-                if not existing_gaceta:
+                if date_str not in known_days:
                     file_path = os.path.join(folder_path, "gaceta.pdf")
                     if os.path.exists(file_path):
                         logging.info(
@@ -378,14 +669,22 @@ def initial_check_and_create_missing_entries():
                         save_pdf_to_db(file_path, date_str)
             except ValueError:
                 logging.warning(f"Skipping invalid date folder: {date_folder}")
-    session.close()
-
 
-schedule.every(1).minutes.do(check_and_download_today_pdf)
 
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Gaceta ingestion daemon")
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="1",
+        metavar="MODE",
+        help="profile every step (sample, cprofile or pyinstrument; GACETA_PROFILE)",
+    )
+    args = parser.parse_args()
+    if args.profile:
+        os.environ["GACETA_PROFILE"] = args.profile
+    init_db()
     initial_check_and_create_missing_entries()
-    check_and_download_today_pdf()
-    while True:
-        schedule.run_pending()
-        time.sleep(60)
+    IngestionDaemon().run_forever()
@@ -12,10 +12,22 @@ module.exports = {
                 // Custom environment variables for this instance
             },
         },
+        {
+            name: 'JobWorkers',
+            script: '/home/fastapiuser/gacetachat/venv/bin/python',
+            args: '/home/fastapiuser/gacetachat/jobs.py --workers 2', // one process per worker
+            interpreter: '/home/fastapiuser/gacetachat/venv/bin/python', // path to the Python interpreter
+            exec_mode: 'fork',
+            watch: true,
+            env: {
+                NODE_ENV: 'development',
+                // Custom environment variables for this instance
+            },
+        },
         {
             name: 'FastAPIApp',
             script: '/home/fastapiuser/gacetachat/venv/bin/uvicorn',
-            args: 'fastapp:app --host 127.0.0.1 --port 8050', // Specify the main file and the app object
+            args: 'fastapp:app --host 127.0.0.1 --port 8050 --workers 2', // Specify the main file and the app object; workers share state through the database
             interpreter: '/home/fastapiuser/gacetachat/venv/bin/python', // path to the Python interpreter
             exec_mode: 'fork',
             watch: true,
@@ -19,15 +19,15 @@
             │                                 │ Embedding
             ▼                                 ▼
     ┌─────────────────┐               ┌──────────────────┐
-    │ Document Store  │               │  OpenAI API      │
-    │ (Persistent)    │               │  (ada-002)       │
+    │ Chunk Store     │               │  OpenAI API      │
+    │ (Memory-mapped) │               │  (ada-002)       │
     └─────────────────┘               └──────────────────┘
             │                                 │
             │ FAISS Index                     │ Vector Embeddings
             ▼                                 ▼
     ┌─────────────────┐               ┌──────────────────┐
     │ index.faiss +   │◀──────────────│   FAISS Vector   │
-    │ index.pkl       │   Serialize   │   Database       │
+    │ chunks.dat/.idx │   Serialize   │   Database       │
     └─────────────────┘               └──────────────────┘
     ```
 
@@ -42,12 +42,13 @@
     • FAISS indices: Serialized vector databases with similarity search capability
     • Document chunks: Text segments optimized for retrieval (1000 char chunks)
     • Similarity scores: Ranked document relevance for user queries
-    • Persistent storage: index.faiss + index.pkl files for efficient loading
+    • Hybrid retrieval: FAISS + BM25 (bm25.py) fused with reciprocal rank fusion
+    • Persistent storage: index.faiss + memory-mapped chunk store (chunk_store.py)
     • Vector embeddings: High-dimensional representations via OpenAI ada-002
 
 🔗 Dependencies:
     • langchain_community: FAISS vector store integration and persistence
-    • langchain_openai: OpenAI embeddings API client and model access
+    • embeddings: Pluggable backend (OpenAI or offline HashingEmbeddings)
     • langchain_text_splitters: Document chunking with overlap management
     • faiss-cpu: Core similarity search engine and indexing algorithms
     • config: Application configuration and API key management
@@ -80,7 +81,7 @@
 
 🔒 Security Considerations:
     ⚠️  HIGH: OpenAI API key exposure in constructor - ensure secure credential storage
-    ⚠️  HIGH: allow_dangerous_deserialization=True enables arbitrary code execution
+    ⚠️  HIGH: Legacy index.pkl migration unpickles once - only migrate trusted indices
     ⚠️  MEDIUM: No input validation on document content - potential injection vectors
     ⚠️  MEDIUM: File system access without path validation - directory traversal risk
     ⚠️  LOW: Embedding data contains original text snippets - privacy implications
@@ -89,12 +90,13 @@
     • API Cost Control: No rate limiting on embedding generation, cost escalation risk
     • Data Security: Original document content embedded in vectors, potential leakage
     • System Resources: Large indices consume significant memory and disk space
-    • Dependency Risk: FAISS deserialization vulnerability in untrusted environments
+    • Dependency Risk: Legacy pickle docstores are converted once, then never loaded
     • Data Integrity: No checksum validation for index files, corruption possible
 
 ⚡ Performance Characteristics:
     • Time Complexity: O(d*log(n)) for similarity search, O(n*d) for index creation
-    • Memory Usage: ~50MB base + 4 bytes per dimension per document
+    • Memory Usage: ~50MB base + 4 bytes per dimension per document (text is mmapped)
+    • Load Time: proportional to the vectors only, chunk text is read for top-k hits
     • Index Size: ~1MB per 1000 documents with 1536-dimensional embeddings
     • Search Speed: <100ms for k=5 similarity search on 10K documents
     • Embedding API: 8191 tokens max per request, rate limited to 3M tokens/min
@@ -123,6 +125,7 @@
     ```python
     # Initialize FAISS helper
     helper = FAISSHelper(openai_api_key="sk-your-key")
+    offline_helper = FAISSHelper(embedding_backend="hashing")  # no network
 
     # Create index from documents
     documents = [Document(page_content="text content")]
@@ -144,60 +147,181 @@
     CHUNK_SIZE = 1000          # Characters per document chunk
     CHUNK_OVERLAP = 0          # Overlap between chunks (disabled)
 
-    # Embedding Model
+    # Embedding Model (EMBEDDING_BACKEND=openai | hashing)
     EMBEDDING_MODEL = "text-embedding-ada-002"  # OpenAI embedding model
-    EMBEDDING_DIMENSIONS = 1536                 # Vector dimensions
+    EMBEDDING_DIMENSIONS = 1536                 # Vector dimensions (hashing: 1024)
 
     # Index Storage
     INDEX_FILE_PATTERN = "{date}/index.faiss"  # Date-based organization
-    METADATA_FILE = "index.pkl"                 # Document metadata storage
+    CHUNKS_FILES = "chunks.dat + chunks.idx.npy" # Memory-mapped chunk text + metadata
     ```
 
 🚨 Critical Security Notice:
-    The allow_dangerous_deserialization=True parameter in load_faiss_index() enables
-    pickle deserialization which can execute arbitrary code. Only load indices from
-    trusted sources and consider implementing signature verification for production.
+    Indices written by older versions store their docstore in index.pkl. The first
+    load_faiss_index() on such a directory unpickles it once (arbitrary code risk)
+    to write the chunk store; every later load reads plain UTF-8/JSON only. Only
+    migrate indices from trusted sources.
 
 Author: GacetaChat Team | Version: 2.1.0 | Last Updated: 2024-12-19
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 """
 
 # faiss_helper.py
+import logging
 import os
 
+import faiss
+import numpy as np
 from langchain_community.vectorstores import FAISS
-from langchain_openai import OpenAIEmbeddings
 from langchain_text_splitters import CharacterTextSplitter
 
+from bm25 import BM25Index, reciprocal_rank_fusion
+from chunk_store import ChunkStore
 from config import config
+from embeddings import get_embeddings
+
+INDEX_FILE = "index.faiss"
+LEGACY_DOCSTORE_FILE = "index.pkl"
+
+
+class FAISSChunkIndex:
+    """FAISS vectors backed by a ChunkStore: row i of the index is chunk i."""
+
+    def __init__(self, index, chunks, embeddings, bm25=None):
+        self.index = index
+        self.chunks = chunks
+        self.embeddings = embeddings
+        self.bm25 = bm25
+
+    @classmethod
+    def from_documents(cls, documents, embeddings):
+        vectors = np.asarray(
+            embeddings.embed_documents([doc.page_content for doc in documents]),
+            dtype=np.float32,
+        )
+        index = faiss.IndexFlatL2(vectors.shape[1])
+        index.add(vectors)
+        bm25 = BM25Index.from_texts(doc.page_content for doc in documents)
+        return cls(index, list(documents), embeddings, bm25)
+
+    @classmethod
+    def load_local(cls, directory, embeddings):
+        path = os.path.join(directory, INDEX_FILE)
+        try:
+            index = faiss.read_index(path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+        except RuntimeError:
+            # Index types without mmap support are read into memory
+            index = faiss.read_index(path)
+        bm25 = BM25Index.load(directory) if BM25Index.exists(directory) else None
+        return cls(index, ChunkStore(directory), embeddings, bm25)
+
+    def save_local(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        # index.faiss is written last, callers treat it as "index is ready"
+        ChunkStore.write(directory, (self.chunks[i] for i in range(len(self.chunks))))
+        if self.bm25 is not None:
+            self.bm25.save(directory)
+        faiss.write_index(self.index, os.path.join(directory, INDEX_FILE))
+
+    def _search_ids(self, embedding, k):
+        vector = np.asarray([embedding], dtype=np.float32)
+        scores, ids = self.index.search(vector, k)
+        return [
+            (int(i), float(score)) for score, i in zip(scores[0], ids[0]) if i != -1
+        ]
+
+    def similarity_search_with_score_by_vector(self, embedding, k=4):
+        return [(self.chunks[i], score) for i, score in self._search_ids(embedding, k)]
+
+    def similarity_search_with_score(self, query, k=4):
+        return self.similarity_search_with_score_by_vector(
+            self.embeddings.embed_query(query), k
+        )
+
+    def similarity_search(self, query, k=4):
+        return [doc for doc, _ in self.similarity_search_with_score(query, k)]
+
+    def hybrid_search(self, query, k=4, fetch_k=20, rrf_k=60, rerank=True):
+        """Fuse vector and BM25 rankings with RRF, then rerank the top hits.
+
+        Without a BM25 index (not yet built) this is a plain similarity search.
+        """
+        if self.bm25 is None:
+            return self.similarity_search(query, k)
+
+        vector_ids = [
+            i for i, _ in self._search_ids(self.embeddings.embed_query(query), fetch_k)
+        ]
+        keyword_ids, _ = self.bm25.search(query, fetch_k)
+        fused = reciprocal_rank_fusion([vector_ids, keyword_ids], k=rrf_k)
+
+        if not rerank:
+            return [self.chunks[i] for i, _ in fused[:k]]
+
+        # Cheap rerank of the fused head: blend normalized RRF score with the
+        # IDF-weighted share of query tokens that literally occur in the chunk
+        candidates = fused[: max(k * 2, 10)]
+        if not candidates:
+            return []
+        top_score = candidates[0][1]
+        scored = []
+        for i, fused_score in candidates:
+            doc = self.chunks[i]
+            coverage = self.bm25.coverage(query, doc.page_content)
+            scored.append((0.5 * fused_score / top_score + 0.5 * coverage, doc))
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [doc for _, doc in scored[:k]]
 
 
 class FAISSHelper:
     def __init__(
-        self, model_name=None, max_tokens=None, temperature=None, openai_api_key=None
+        self,
+        model_name=None,
+        max_tokens=None,
+        temperature=None,
+        openai_api_key=None,
+        embedding_backend=None,
     ):
         self.model_name = model_name or config.OPENAI_MODEL_NAME
         self.max_tokens = max_tokens or config.OPENAI_MAX_TOKENS
         self.temperature = temperature or config.OPENAI_TEMPERATURE
         self.openai_api_key = openai_api_key or config.OPENAI_API_KEY
-        self.embeddings = OpenAIEmbeddings(
-            # model=self.model_name,
-            # max_tokens=self.max_tokens,
-            # temperature=self.temperature,
-            openai_api_key=self.openai_api_key
+        self.embeddings = get_embeddings(
+            embedding_backend, openai_api_key=self.openai_api_key
         )
 
-    def save_faiss_index(self, db: FAISS, directory):
+    def save_faiss_index(self, db: FAISSChunkIndex, directory):
         os.makedirs(directory, exist_ok=True)
         db.save_local(directory)
 
     def load_faiss_index(self, directory):
-        return FAISS.load_local(
+        if not ChunkStore.exists(directory) and os.path.exists(
+            os.path.join(directory, LEGACY_DOCSTORE_FILE)
+        ):
+            self.migrate_legacy_index(directory)
+        db = FAISSChunkIndex.load_local(directory, self.embeddings)
+        if db.bm25 is None:
+            # Indices written before hybrid retrieval get their BM25 index once
+            db.bm25 = BM25Index.from_texts(
+                db.chunks[i].page_content for i in range(len(db.chunks))
+            )
+            db.bm25.save(directory)
+        return db
+
+    def migrate_legacy_index(self, directory):
+        """Convert a pickled LangChain docstore (index.pkl) into a ChunkStore."""
+        logging.warning(f"Migrating legacy pickle docstore in {directory}")
+        legacy = FAISS.load_local(
             directory, self.embeddings, allow_dangerous_deserialization=True
         )
+        documents = [
+            legacy.docstore.search(legacy.index_to_docstore_id[i])
+            for i in range(legacy.index.ntotal)
+        ]
+        ChunkStore.write(directory, documents)
 
     def create_faiss_index(self, documents):
         text_splitter = CharacterTextSplitter(chunk_size=1000, chunk_overlap=0)
         docs = text_splitter.split_documents(documents)
-        db = FAISS.from_documents(docs, self.embeddings)
+        db = FAISSChunkIndex.from_documents(docs, self.embeddings)
         return db
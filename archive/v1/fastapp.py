@@ -103,7 +103,15 @@
     • Data Validation: Limited input sanitization on user-provided parameters
 
 ⚡ Performance Characteristics:
-    • Concurrency: Async FastAPI handles ~1000 concurrent requests
+    • Concurrency: Blocking routes (SQLAlchemy, Redis, Tweepy) are plain
+      ``def`` endpoints run on a thread pool of API_THREADPOOL_SIZE workers,
+      sized to the DB connection pool; the event loop only does I/O dispatch
+    • Caching: execution session reads carry strong ETags (304 on match) and
+      are served from a TTL'd in-process cache; /bootstrap batches a page's
+      reads into one request
+    • Cold Start: importing the app loads no LangChain/OpenAI/FAISS, Tweepy
+      or Redis client (imported where used); the schema is created by the
+      startup hook via ``init_db``, not at import
     • Response Time: 100-500ms for database operations, 2-8s for AI processing
     • Memory Usage: ~100MB baseline + session data + AI model overhead
     • Database Pool: SQLite single-writer limitation affects write throughput
@@ -181,7 +189,6 @@ Author: GacetaChat Team | Version: 2.1.0 | Last Updated: 2024-12-19
 from datetime import datetime
 from typing import List
 
-import tweepy
 from fastapi import Depends, FastAPI, HTTPException
 from sqlalchemy.orm import Session
 
@@ -189,7 +196,11 @@ from db import get_db
 from logging_setup import setup_logging
 from models import *
 from models import GacetaPDF
-from services.counter import check_global_limit, increment_global_query_count
+from services.counter import (
+    check_global_limit,
+    increment_global_query_count,
+    release_global_query,
+)
 
 setup_logging()
 
@@ -197,8 +208,11 @@ setup_logging()
 import os
 from datetime import datetime
 
+from anyio import to_thread
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
+from config import config
 from db import get_db
 from models import *
 
@@ -220,11 +234,12 @@ API_KEY = os.environ.get("APP_SECRET_API_KEY")
 from datetime import datetime
 from typing import List
 
-from fastapi import Depends, FastAPI, HTTPException, Request
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 
 from crud import *
+from services.response_cache import cached_json_response
 
 # CORS settings for local development
 app.add_middleware(
@@ -234,12 +249,27 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Large JSON payloads (logs, gacetas); cached responses arrive pre-compressed
+app.add_middleware(GZipMiddleware, minimum_size=config.GZIP_MINIMUM_SIZE)
+
+
+@app.on_event("startup")
+async def size_thread_pool():
+    # Sync routes and dependencies run here; keep it within the DB pool size
+    to_thread.current_default_thread_limiter().total_tokens = config.API_THREADPOOL_SIZE
+
+
+@app.on_event("startup")
+def initialize_database():
+    # Schema and preset seeding run once per server start, not on import
+    init_db()
 
 
 @app.middleware("http")
 async def api_key_middleware(request: Request, call_next):
     api_key = request.headers.get("X-API-KEY")
-    if request.url.path == "/twitter/callback":
+    # OAuth redirects and readiness probes carry no API key
+    if request.url.path in ("/twitter/callback", "/health_check"):
         return await call_next(request)
     if api_key != API_KEY:
         raise HTTPException(status_code=401, detail="Invalid API Key")
@@ -248,32 +278,51 @@ async def api_key_middleware(request: Request, call_next):
 
 
 @app.get("/execution_session_by_date/")
-async def get_execution_session(date: str, db: Session = Depends(get_db)):
+def get_execution_session(date: str, request: Request, db: Session = Depends(get_db)):
     try:
         date_obj = datetime.strptime(date, "%Y-%m-%d")
+    except ValueError:
+        raise HTTPException(
+            status_code=400, detail="Invalid date format, should be YYYY-MM-DD"
+        )
+
+    def build():
         exec_sessions = get_execution_session_by_date(db, date_obj)
         if exec_sessions:
             return exec_sessions
-        else:
-            raise HTTPException(
-                status_code=404, detail="Execution session not found for the given date"
-            )
-    except ValueError:
         raise HTTPException(
-            status_code=400, detail="Invalid date format, should be YYYY-MM-DD"
+            status_code=404, detail="Execution session not found for the given date"
+        )
+
+    day = ExecutionSession.gaceta.has(
+        and_(
+            GacetaPDF.date >= datetime.combine(date_obj, datetime.min.time()),
+            GacetaPDF.date <= datetime.combine(date_obj, datetime.max.time()),
         )
+    )
+    return cached_json_response(
+        request, lambda: get_execution_sessions_state(db, day), build
+    )
 
 
 @app.get("/execution_session/available/")
-async def list_available_index_days_api(db: Session = Depends(get_db)):
-    days = list_available_index_days(db)
-    return [day[0] for day in days]
+def list_available_index_days_api(request: Request, db: Session = Depends(get_db)):
+    return cached_json_response(
+        request,
+        lambda: get_gacetas_state(db),
+        lambda: [day[0] for day in list_available_index_days(db)],
+    )
 
 
 @app.get("/execution_session/", response_model=List[dict])
-async def execution_session_api(session_id: str, db: Session = Depends(get_db)):
-    logs = display_last_execution_session(db, session_id)
-    return logs
+def execution_session_api(
+    session_id: str, request: Request, db: Session = Depends(get_db)
+):
+    return cached_json_response(
+        request,
+        lambda: get_execution_sessions_state(db, ExecutionSession.id == session_id),
+        lambda: display_last_execution_session(db, session_id),
+    )
 
 
 from datetime import datetime
@@ -291,6 +340,7 @@ class LogQueryParams(BaseModel):
     order: Optional[str] = "desc"
     prompt_text: Optional[str] = None
     state: Optional[str] = None
+    cursor: Optional[str] = None
 
 
 class LogResponseSchema(BaseModel):
@@ -311,33 +361,72 @@ class LogResponseSchema(BaseModel):
 
 
 import models
+from sqlalchemy import column, text, tuple_
+from sqlalchemy.orm import joinedload
+
+
+def prompt_text_filter(db: Session, prompt_text: str):
+    """FTS5 trigram match on prompt text, LIKE when FTS is unavailable."""
+    if len(prompt_text) >= 3 and models.has_prompt_fts(db.get_bind()):
+        phrase = '"' + prompt_text.replace('"', '""') + '"'
+        matches = (
+            text(
+                f"SELECT rowid FROM {models.PROMPT_FTS_TABLE} "
+                f"WHERE {models.PROMPT_FTS_TABLE} MATCH :phrase"
+            )
+            .bindparams(phrase=phrase)
+            .columns(column("rowid"))
+        )
+        return models.Prompt.id.in_(matches)
+    return models.Prompt.prompt_text.contains(prompt_text)
 
 
-def get_content_logs(db: Session, params: LogQueryParams):
+def get_content_logs_page(db: Session, params: LogQueryParams):
+    """One page of logs plus the cursor of the next page (None on the last).
+
+    With ``cursor`` the page starts after that (created_at, id) position,
+    which the composite indexes serve directly; ``offset`` is only honoured
+    without a cursor, for older clients.
+    """
     query = (
         db.query(models.ContentExecutionLog)
         .join(models.Prompt)
         .add_entity(models.Prompt)
+        .options(joinedload(models.ContentExecutionLog.output))
     )
 
     if params.prompt_text:
-        query = query.filter(models.Prompt.prompt_text.contains(params.prompt_text))
+        query = query.filter(prompt_text_filter(db, params.prompt_text))
 
     if params.state:
         query = query.filter(models.ContentExecutionLog.state == params.state)
 
+    key = tuple_(models.ContentExecutionLog.created_at, models.ContentExecutionLog.id)
+    if params.cursor:
+        position = tuple_(*decode_keyset_cursor(params.cursor, id_type=str))
+        query = query.filter(
+            key > position if params.order == "asc" else key < position
+        )
+
     if params.order == "asc":
-        query = query.order_by(asc(models.ContentExecutionLog.created_at))
+        query = query.order_by(
+            asc(models.ContentExecutionLog.created_at),
+            asc(models.ContentExecutionLog.id),
+        )
     else:
-        query = query.order_by(desc(models.ContentExecutionLog.created_at))
-
-    query = query.offset(params.offset).limit(params.limit)
+        query = query.order_by(
+            desc(models.ContentExecutionLog.created_at),
+            desc(models.ContentExecutionLog.id),
+        )
 
-    logs = query.all()
+    if not params.cursor:
+        query = query.offset(params.offset)
+    logs = query.limit(params.limit + 1).all()
+    page = logs[: params.limit]
 
     # Transform the result to match the response schema
     log_responses = []
-    for log, prompt in logs:
+    for log, prompt in page:
         log_response = LogResponseSchema(
             id=log.id,
             execution_session_id=log.execution_session_id,
@@ -353,26 +442,44 @@ def get_content_logs(db: Session, params: LogQueryParams):
         )
         log_responses.append(log_response)
 
-    return log_responses
+    next_cursor = None
+    if len(logs) > params.limit:
+        last = page[-1][0]
+        next_cursor = encode_keyset_cursor(last.created_at, last.id)
+    return log_responses, next_cursor
+
+
+def get_content_logs(db: Session, params: LogQueryParams):
+    return get_content_logs_page(db, params)[0]
 
 
 @app.get("/content_logs/", response_model=List[LogResponseSchema])
-async def get_content_logs_api(
+def get_content_logs_api(
+    response: Response,
     limit: int = 10,
     offset: int = 0,
     order: str = "desc",
     prompt_text: Optional[str] = None,
     state: Optional[str] = None,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
 ):
     params = LogQueryParams(
-        limit=limit, offset=offset, order=order, prompt_text=prompt_text, state=state
+        limit=limit,
+        offset=offset,
+        order=order,
+        prompt_text=prompt_text,
+        state=state,
+        cursor=cursor,
     )
-    return get_content_logs(db, params)
+    logs, next_cursor = get_content_logs_page(db, params)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return logs
 
 
 @app.get("/check_global_limit/")
-async def check_global_limit_api(db: Session = Depends(get_db)):
+def check_global_limit_api(db: Session = Depends(get_db)):
     if check_global_limit(db):
         return {"allowed": True}
     else:
@@ -380,36 +487,94 @@ async def check_global_limit_api(db: Session = Depends(get_db)):
 
 
 @app.post("/increment_global_query_count/")
-async def increment_global_query_count_api(db: Session = Depends(get_db)):
-    if check_global_limit(db):
-        increment_global_query_count(db)
+def increment_global_query_count_api(db: Session = Depends(get_db)):
+    if increment_global_query_count(db):
         return {"success": True}
     else:
         raise HTTPException(status_code=429, detail="Global query limit reached")
 
 
+@app.post("/release_global_query_count/")
+def release_global_query_count_api(db: Session = Depends(get_db)):
+    return {"success": release_global_query(db)}
+
+
+@app.get("/answer_cache/stats/")
+def get_answer_cache_stats_api(
+    date: Optional[str] = None, db: Session = Depends(get_db)
+):
+    from services.answer_cache import get_answer_cache_stats
+
+    return get_answer_cache_stats(db, date)
+
+
+@app.get("/bootstrap")
+def bootstrap_api(
+    date: Optional[str] = None,
+    logs_limit: int = Query(3, ge=0, le=10),
+    db: Session = Depends(get_db),
+):
+    """Everything a Streamlit page render reads, in one round trip.
+
+    Available days, the sessions of ``date`` with their last logs, the
+    global query limit, answer cache stats and the ``logs_limit`` most
+    recent logs (skipped when 0).
+    """
+    from services.answer_cache import get_answer_cache_stats
+
+    page = {
+        "available_days": [day[0] for day in list_available_index_days(db)],
+        "execution_sessions": [],
+        "session_logs": {},
+        "global_limit": {"allowed": check_global_limit(db)},
+        "answer_cache_stats": get_answer_cache_stats(db),
+        "recent_logs": [],
+    }
+    if date:
+        try:
+            date_obj = datetime.strptime(date, "%Y-%m-%d")
+        except ValueError:
+            raise HTTPException(
+                status_code=400, detail="Invalid date format, should be YYYY-MM-DD"
+            )
+        page["execution_sessions"] = get_execution_session_by_date(db, date_obj)
+        page["session_logs"] = {
+            session.id: display_last_execution_session(db, session.id)
+            for session in page["execution_sessions"]
+        }
+    if logs_limit:
+        page["recent_logs"] = get_content_logs(db, LogQueryParams(limit=logs_limit))
+    return page
+
+
 from fastapi.responses import RedirectResponse
 
 twitter_scope = ["tweet.read", "tweet.write", "users.read", "offline.access"]
 
-# In-memory storage for code verifiers
-code_verifiers = {}
-
-from redis import Redis
+from functools import lru_cache
 
 from oauth_helpers import generate_code_challenge, generate_code_verifier
+from services.oauth_state import pop_oauth_state, save_oauth_state
 
-redis_client = Redis(
-    host="165.227.177.167",
-    port=6379,
-    db=0,
-    password="foofoojaaa",
-    decode_responses=True,
-)
+
+@lru_cache(maxsize=1)
+def get_redis_client():
+    # Created on first use: only the Twitter routes need Redis
+    from redis import Redis
+
+    return Redis(
+        host="165.227.177.167",
+        port=6379,
+        db=0,
+        password="foofoojaaa",
+        decode_responses=True,
+    )
 
 
 def get_refreshed_access_token():
-    refresh_token = redis_client.get("refresh_token")
+    import tweepy
+
+    refresh_token = get_redis_client().get("refresh_token")
     if not refresh_token:
         raise HTTPException(
             status_code=400, detail="Refresh token not found or expired"
@@ -429,7 +594,8 @@ def get_refreshed_access_token():
             refresh_token=refresh_token,
             body=f"grant_type=refresh_token&client_id={twitter_api_key}",
         )
-        redis_client.set("access_token", access_token, ex=3600)  # Expire after 1 hour
+        # Expire after 1 hour
+        get_redis_client().set("access_token", access_token, ex=3600)
         return access_token
     except Exception as e:
         raise HTTPException(
@@ -438,7 +604,9 @@ def get_refreshed_access_token():
 
 
 @app.get("/twitter/login")
-async def login():
+def login(db: Session = Depends(get_db)):
+    import tweepy
+
     code_verifier = generate_code_verifier()
     generate_code_challenge(code_verifier)
     auth = tweepy.OAuth2UserHandler(
@@ -452,7 +620,9 @@ async def login():
 
     try:
         redirect_url = auth.get_authorization_url()
-        code_verifiers[auth._state] = auth
+        # The callback may reach another worker process: keep the PKCE
+        # verifier in the database, not in this process
+        save_oauth_state(db, auth._state, auth._client.code_verifier)
         print(f"state: {auth._state}")
         return RedirectResponse(f"{redirect_url}")
     except Exception as e:
@@ -463,31 +633,34 @@ async def login():
 
 @app.get("/twitter/callback")
 # async def callback(request: Request):
-async def callback(state: str, code: str):
+def callback(state: str, code: str, db: Session = Depends(get_db)):
+    import tweepy
+
     # state = request.get('state')
     # code = request.get('code')
-    code_verifier = code_verifiers.pop(state, None)
-
-    # if not code_verifier:
-    #     raise HTTPException(status_code=400, detail="Invalid state parameter")
-
-    # auth = tweepy.OAuth2UserHandler(
-    #     client_id=twitter_api_key,
-    #     redirect_uri=callback_url,
-    #     scope=twitter_scope,
-    #     client_secret=twitter_api_secret_key,
-    #     # state=state
-    # )
+    code_verifier = pop_oauth_state(db, state)
+
+    if not code_verifier:
+        raise HTTPException(status_code=400, detail="Invalid state parameter")
+
+    auth = tweepy.OAuth2UserHandler(
+        client_id=twitter_api_key,
+        redirect_uri=callback_url,
+        scope=twitter_scope,
+        client_secret=twitter_api_secret_key,
+    )
+    auth._state = state
+    auth._client.code_verifier = code_verifier
     try:
-        access_token = code_verifier.fetch_token(
+        access_token = auth.fetch_token(
             f"{callback_url}?state={state}&code={code}",
         )
         # refresh_token = access_token['refresh_token']
         # Store access token and refresh token in Redis
-        redis_client.set(
+        get_redis_client().set(
             "access_token", access_token["access_token"], ex=3600
         )  # Expire after 1 hour
-        redis_client.set(
+        get_redis_client().set(
             "refresh_token", access_token["refresh_token"]
         )  # No expiry for refresh token
         return {"access_token": access_token}
@@ -508,7 +681,9 @@ def post_tweet(tweet_text: str):
     `get_refreshed_access
     :type tweet_text: str
     """
-    access_token = redis_client.get("access_token")
+    import tweepy
+
+    access_token = get_redis_client().get("access_token")
     if not access_token:
         access_token = get_refreshed_access_token()
     client = tweepy.Client(bearer_token=access_token)
@@ -519,8 +694,10 @@ def post_tweet(tweet_text: str):
 
 
 @app.post("/twitter/tweet")
-async def post_tweet_api(tweet_text: str):
-    access_token = redis_client.get("access_token")
+def post_tweet_api(tweet_text: str):
+    import tweepy
+
+    access_token = get_redis_client().get("access_token")
     if not access_token:
         access_token = get_refreshed_access_token()
     client = tweepy.Client(bearer_token=access_token)
@@ -533,39 +710,24 @@ async def post_tweet_api(tweet_text: str):
 
 from datetime import date as date_type
 
+from fastapi import Query
+
 
 @app.get("/gacetas")
-async def get_gacetas_api(
+def get_gacetas_api(
     db: Session = Depends(get_db),
     date: Optional[date_type] = None,
     order: Optional[str] = "desc",
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    prompt_id: int = 1,
 ):
     try:
-        query = db.query(GacetaPDF)
-        if date:
-            start_date = datetime.combine(date, datetime.min.time())
-            end_date = datetime.combine(date, datetime.max.time())
-            query = query.filter(
-                and_(GacetaPDF.date >= start_date, GacetaPDF.date <= end_date)
-            )
-
-        if order == "asc":
-            query = query.order_by(asc(GacetaPDF.date))
-        else:
-            query = query.order_by(desc(GacetaPDF.date))
-
-        gacetas = query.all()
-
-        res = {
-            "gacetas": [
-                {
-                    "gaceta": gaceta.to_json(),
-                    "twitter_prompts": get_twitter_prompts(db, gaceta.id, 1),
-                }
-                for gaceta in gacetas
-            ]
-        }
-        return res
+        return list_gacetas_with_twitter_prompts(
+            db, prompt_id, limit=limit, cursor=cursor, order=order, date=date
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     finally:
@@ -582,9 +744,11 @@ class ApproveTweetRequest(BaseModel):
 
 
 @app.post("/approve_tweet")
-async def approve_tweet(request: ApproveTweetRequest):
+def approve_tweet(request: ApproveTweetRequest):
+    import tweepy
+
     # Logic to approve and post tweet
-    access_token = redis_client.get("access_token")
+    access_token = get_redis_client().get("access_token")
     if not access_token:
         access_token = get_refreshed_access_token()
 
@@ -598,7 +762,7 @@ async def approve_tweet(request: ApproveTweetRequest):
 
 
 @app.get("/health_check")
-def health_check():
+async def health_check():
     try:
         return {"status": "healthy"}
     except Exception as e:
@@ -606,6 +770,12 @@ def health_check():
 
 
 if __name__ == "__main__":
+    import argparse
+
     import uvicorn
 
-    uvicorn.run(app, host="127.0.0.1", port=8050)
+    parser = argparse.ArgumentParser(description="Run the GacetaChat API")
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+    # Worker processes import the app themselves, so pass it by name
+    uvicorn.run("fastapp:app", host="127.0.0.1", port=8050, workers=args.workers)
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+🌟 Job Queue - Durable SQLite-Backed Background Work with Leased Workers
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+📋 Description:
+    Durable queue for the slow parts of the pipeline: indexing a gaceta,
+    running its content template and re-running single prompts from the UI.
+    Producers (the ingestion daemon, Streamlit pages) only insert a row into
+    the ``jobs`` table and return; worker processes claim, run and settle
+    the jobs. Throughput scales by starting more workers.
+
+🏗️ Job Lifecycle:
+    ```
+    enqueue ──▶ QUEUED ──claim──▶ RUNNING ──▶ DONE
+                  ▲                  │
+                  └── retry (backoff)┤ attempts < max_attempts
+                                     └──▶ FAILED
+    ```
+
+⚡ Performance Characteristics:
+    • Claim: one ``UPDATE … WHERE id = (SELECT … ORDER BY priority DESC,
+      run_at LIMIT 1) RETURNING id`` statement served by ix_jobs_claim, so
+      concurrent workers never run the same job
+    • Leases: a claimed job belongs to its worker for JOB_LEASE_SECONDS and is
+      renewed by a heartbeat thread while it runs; the job of a worker that
+      dies is claimed again once its lease expires
+    • Retries: failed jobs are re-queued with exponential backoff
+      (JOB_RETRY_BASE_SECONDS · 2^(attempt-1)) up to ``max_attempts``
+    • Dedupe keys make enqueueing idempotent (one index job per gaceta day)
+
+📚 Usage Example:
+    ```python
+    job = enqueue(db, "re_execute_prompt",
+                  {"session_id": session_id, "prompt_id": 3},
+                  priority=config.UI_JOB_PRIORITY)
+
+    # Workers (one process each)
+    python jobs.py --workers 4
+    python jobs.py --profile   # folded stacks per job in profiles/
+    ```
+
+Author: GacetaChat Team | Version: 2.1.0 | Last Updated: 2024-12-19
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+"""
+
+# jobs.py
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from config import config
+from models import Job, JobState, init_db
+from profiling import profile_run
+
+HANDLERS = {}
+
+
+def job_handler(kind):
+    """Register ``function(db, **payload)`` as the handler of ``kind`` jobs."""
+
+    def register(function):
+        HANDLERS[kind] = function
+        return function
+
+    return register
+
+
+def enqueue(
+    db: Session,
+    kind: str,
+    payload: dict = None,
+    priority: int = 0,
+    max_attempts: int = None,
+    dedupe_key: str = None,
+    delay: float = 0,
+) -> Job:
+    """Queue a job; with ``dedupe_key`` an existing job with that key is returned."""
+    if dedupe_key:
+        existing = db.query(Job).filter_by(dedupe_key=dedupe_key).first()
+        if existing:
+            return existing
+
+    job = Job(
+        kind=kind,
+        payload=json.dumps(payload or {}),
+        priority=priority,
+        max_attempts=max_attempts or config.JOB_MAX_ATTEMPTS,
+        dedupe_key=dedupe_key,
+        run_at=datetime.utcnow() + timedelta(seconds=delay),
+    )
+    db.add(job)
+    try:
+        db.commit()
+    except IntegrityError:
+        # Another producer queued the same key first
+        db.rollback()
+        return db.query(Job).filter_by(dedupe_key=dedupe_key).one()
+    return job
+
+
+def claim(db: Session, worker_id: str, kinds=None, lease_seconds=None):
+    """Lease the next runnable job to ``worker_id``; None when the queue is idle.
+
+    Runnable means QUEUED and due, or RUNNING with an expired lease (its
+    worker died) and attempts left; abandoned jobs without attempts left are
+    marked FAILED here. The select and the update are one statement, so two
+    workers can never claim the same job.
+    """
+    now = datetime.utcnow()
+    lease_seconds = lease_seconds or config.JOB_LEASE_SECONDS
+    abandoned = (Job.state == JobState.RUNNING.value) & (Job.lease_expires_at < now)
+    db.execute(
+        update(Job)
+        .where(abandoned, Job.attempts >= Job.max_attempts)
+        .values(
+            state=JobState.FAILED.value,
+            lease_owner=None,
+            lease_expires_at=None,
+            finished_at=now,
+            last_error="Lease expired on the last attempt",
+        )
+    )
+    runnable = or_(
+        (Job.state == JobState.QUEUED.value) & (Job.run_at <= now),
+        abandoned & (Job.attempts < Job.max_attempts),
+    )
+    if kinds:
+        runnable = runnable & Job.kind.in_(kinds)
+    next_job = (
+        select(Job.id)
+        .where(runnable)
+        .order_by(Job.priority.desc(), Job.run_at, Job.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    job_id = db.execute(
+        update(Job)
+        .where(Job.id == next_job, runnable)
+        .values(
+            state=JobState.RUNNING.value,
+            lease_owner=worker_id,
+            lease_expires_at=now + timedelta(seconds=lease_seconds),
+            attempts=Job.attempts + 1,
+        )
+        .returning(Job.id)
+    ).scalar()
+    db.commit()
+    return db.get(Job, job_id) if job_id is not None else None
+
+
+def heartbeat(db: Session, job_id: int, worker_id: str, lease_seconds=None) -> bool:
+    """Extend the lease; False if the job is no longer leased to this worker."""
+    lease_seconds = lease_seconds or config.JOB_LEASE_SECONDS
+    renewed = db.execute(
+        update(Job)
+        .where(
+            Job.id == job_id,
+            Job.lease_owner == worker_id,
+            Job.state == JobState.RUNNING.value,
+        )
+        .values(lease_expires_at=datetime.utcnow() + timedelta(seconds=lease_seconds))
+    ).rowcount
+    db.commit()
+    return bool(renewed)
+
+
+def _settle(db: Session, job_id: int, worker_id: str, **values) -> bool:
+    settled = db.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.lease_owner == worker_id)
+        .values(lease_owner=None, lease_expires_at=None, **values)
+    ).rowcount
+    db.commit()
+    return bool(settled)
+
+
+def complete(db: Session, job_id: int, worker_id: str) -> bool:
+    return _settle(
+        db,
+        job_id,
+        worker_id,
+        state=JobState.DONE.value,
+        finished_at=datetime.utcnow(),
+        last_error=None,
+    )
+
+
+def fail(db: Session, job_id: int, worker_id: str, error: str) -> bool:
+    """Re-queue with backoff, or mark FAILED once the attempts are used up."""
+    job = db.get(Job, job_id)
+    db.refresh(job)
+    if job.attempts < job.max_attempts:
+        delay = config.JOB_RETRY_BASE_SECONDS * 2 ** (job.attempts - 1)
+        return _settle(
+            db,
+            job_id,
+            worker_id,
+            state=JobState.QUEUED.value,
+            run_at=datetime.utcnow() + timedelta(seconds=delay),
+            last_error=error,
+        )
+    return _settle(
+        db,
+        job_id,
+        worker_id,
+        state=JobState.FAILED.value,
+        finished_at=datetime.utcnow(),
+        last_error=error,
+    )
+
+
+def get_job_state(db: Session, job_id: int):
+    return db.execute(select(Job.state).where(Job.id == job_id)).scalar()
+
+
+class JobWorker:
+    """Claims and runs jobs until stopped; one per process.
+
+    While a job runs, a heartbeat thread renews its lease every third of
+    JOB_LEASE_SECONDS on its own session.
+    """
+
+    def __init__(self, session_factory=None, worker_id=None, kinds=None):
+        if session_factory is None:
+            from db import Session as session_factory
+        self.session_factory = session_factory
+        self.worker_id = worker_id or (
+            f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        )
+        self.kinds = kinds
+
+    def _heartbeat(self, job_id, stop):
+        interval = config.JOB_LEASE_SECONDS / 3
+        db = self.session_factory()
+        try:
+            while not stop.wait(interval):
+                if not heartbeat(db, job_id, self.worker_id):
+                    logging.warning(f"Job {job_id}: lease lost by {self.worker_id}")
+                    return
+        finally:
+            db.close()
+
+    def run_once(self) -> bool:
+        """Run one job if any is runnable; returns whether one was claimed."""
+        db = self.session_factory()
+        try:
+            job = claim(db, self.worker_id, self.kinds)
+            if job is None:
+                return False
+            job_id, kind, payload = job.id, job.kind, json.loads(job.payload)
+
+            stop = threading.Event()
+            beat = threading.Thread(
+                target=self._heartbeat, args=(job_id, stop), daemon=True
+            )
+            beat.start()
+            try:
+                handler = HANDLERS.get(kind)
+                if handler is None:
+                    raise LookupError(f"No handler for job kind {kind!r}")
+                logging.info(f"Job {job_id} ({kind}) started by {self.worker_id}")
+                with profile_run(f"job-{kind}", config.PROFILE_DIR) as artifacts:
+                    handler(db, **payload)
+                for path in artifacts:
+                    logging.info(f"Job {job_id} profile saved: {path}")
+            except Exception as e:
+                db.rollback()
+                logging.error(f"Job {job_id} ({kind}) failed: {e}")
+                fail(db, job_id, self.worker_id, f"{type(e).__name__}: {e}")
+            else:
+                complete(db, job_id, self.worker_id)
+                logging.info(f"Job {job_id} ({kind}) done")
+            finally:
+                stop.set()
+                beat.join()
+            return True
+        finally:
+            db.close()
+
+    def run_forever(self, stop=None):
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            if not self.run_once():
+                stop.wait(config.JOB_POLL_SECONDS)
+
+
+@job_handler("index_gaceta")
+def index_gaceta_job(db, day):
+    from download_gaceta import build_gaceta_index
+
+    build_gaceta_index(day)
+
+
+@job_handler("execute_gaceta_prompts")
+def execute_gaceta_prompts_job(db, day, template_id=1):
+    from download_gaceta import execute_gaceta_prompts
+    from models import ExecutionState
+
+    status = execute_gaceta_prompts(day, template_id)
+    if status != ExecutionState.EXECUTED.value:
+        raise RuntimeError(f"content template finished as {status}")
+
+
+@job_handler("execute_content_template")
+def execute_content_template_job(db, template_id, gaceta_id, re_execute=False):
+    from crud import PromptExecutionEngine
+
+    PromptExecutionEngine(db).execute_content_template_prompts(
+        None, template_id, gaceta_id=gaceta_id, re_execute=re_execute
+    )
+
+
+@job_handler("re_execute_prompt")
+def re_execute_prompt_job(db, session_id, prompt_id, **kargs):
+    from crud import PromptExecutionEngine
+
+    PromptExecutionEngine(db).re_execute_prompt(session_id, prompt_id, **kargs)
+
+
+def _worker_process():
+    # Connections inherited from the parent must not be shared after fork
+    from db import engine
+
+    engine.dispose(close=False)
+    JobWorker().run_forever()
+
+
+def run_workers(count):
+    processes = [
+        multiprocessing.Process(target=_worker_process, name=f"job-worker-{i}")
+        for i in range(count)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+
+if __name__ == "__main__":
+    from logging_setup import setup_logging
+
+    setup_logging()
+    parser = argparse.ArgumentParser(description="Run job queue workers")
+    parser.add_argument("--workers", type=int, default=config.JOB_WORKERS)
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="1",
+        metavar="MODE",
+        help="profile every job (sample, cprofile or pyinstrument; GACETA_PROFILE)",
+    )
+    args = parser.parse_args()
+    if args.profile:
+        # Inherited by the worker processes
+        os.environ["GACETA_PROFILE"] = args.profile
+    init_db()
+    run_workers(args.workers)
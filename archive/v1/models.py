@@ -148,6 +148,9 @@
     ```
 
 🔧 Migration Strategy:
+    • Schema Creation: explicit ``init_db()`` at service startup (tables,
+      search indexes, preset template); importing this module has no
+      database side effects
     • Schema Evolution: Alembic migrations for version control
     • Backward Compatibility: Nullable columns for new features
     • Data Preservation: Archive old sessions before schema changes
@@ -159,10 +162,22 @@ Author: GacetaChat Team | Version: 2.1.0 | Last Updated: 2024-12-19
 
 # models.py
 import enum
+import time
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    inspect,
+    text,
+)
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 
@@ -267,6 +282,18 @@ class ChatMessage(Base):
 
 class ContentExecutionLog(Base):
     __tablename__ = "execution_logs"
+    __table_args__ = (
+        # /content_logs: filter by state, keyset-paginate on (created_at, id)
+        Index("ix_execution_logs_state_created_at", "state", "created_at", "id"),
+        Index("ix_execution_logs_created_at_id", "created_at", "id"),
+        # latest executed log per prompt of a session
+        Index(
+            "ix_execution_logs_session_prompt_state",
+            "execution_session_id",
+            "prompt_id",
+            "state",
+        ),
+    )
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(Integer, ForeignKey("users.id"))
     template_id = Column(Integer, ForeignKey("content_templates.id"))
@@ -350,6 +377,171 @@ class GlobalQueryCount(Base):
     count = Column(Integer, default=0)
 
 
-from db import engine
+from sqlalchemy import Float, LargeBinary
+
+
+class AnswerCacheEntry(Base):
+    __tablename__ = "answer_cache"
+    id = Column(Integer, primary_key=True)
+    gaceta_date = Column(String, index=True, nullable=False)  # YYYY-MM-DD
+    embedding_backend = Column(String, nullable=False)
+    # The answer depends on these too; entries only match the same settings
+    model = Column(String, nullable=False, default="")
+    temperature = Column(Float, nullable=False, default=0.0)
+    prompt_version = Column(String, nullable=False, default="")
+    normalized_query = Column(Text, nullable=False)
+    # float32, L2-normalized; empty for backends not in SEMANTIC_BACKENDS
+    query_embedding = Column(LargeBinary, nullable=False)
+    answer = Column(Text, nullable=False)
+    ai_references = Column(Text, nullable=True)
+    sources = Column(Text, nullable=True)  # JSON list of {page_content, metadata}
+    hit_count = Column(Integer, default=0)
+    last_similarity = Column(Float, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class AnswerCacheStat(Base):
+    # Chat lookups answered from the cache (hits) or not (misses), per gaceta day
+    __tablename__ = "answer_cache_stats"
+    gaceta_date = Column(String, primary_key=True)  # YYYY-MM-DD
+    hits = Column(Integer, nullable=False, default=0)
+    misses = Column(Integer, nullable=False, default=0)
 
-Base.metadata.create_all(engine)
+
+class JobState(enum.Enum):
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    DONE = "DONE"
+    FAILED = "FAILED"
+
+
+class Job(Base):
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # claim: next runnable job by priority, then age
+        Index("ix_jobs_claim", "state", "priority", "run_at"),
+    )
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(64), nullable=False)
+    payload = Column(Text, nullable=False, default="{}")  # JSON kwargs
+    priority = Column(Integer, nullable=False, default=0)  # higher runs first
+    state = Column(String(16), nullable=False, default=JobState.QUEUED.value)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    run_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    lease_owner = Column(String(64), nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    dedupe_key = Column(String(255), unique=True, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+
+
+# Pending OAuth PKCE flows; in the database so any API worker can finish one
+class OAuthState(Base):
+    __tablename__ = "oauth_states"
+    state = Column(String(128), primary_key=True)
+    code_verifier = Column(Text, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+
+import weakref
+
+PROMPT_FTS_TABLE = "prompts_fts"
+
+# Trigram FTS5 index over prompts.prompt_text, kept in sync by triggers. The
+# trigram tokenizer matches arbitrary substrings of 3+ characters, which keeps
+# the semantics of the LIKE '%text%' filter it replaces.
+_PROMPT_FTS_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {PROMPT_FTS_TABLE} USING fts5(
+        prompt_text, content='prompts', content_rowid='id', tokenize='trigram'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS prompts_fts_insert AFTER INSERT ON prompts BEGIN
+        INSERT INTO {PROMPT_FTS_TABLE}(rowid, prompt_text)
+        VALUES (new.id, new.prompt_text);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS prompts_fts_delete AFTER DELETE ON prompts BEGIN
+        INSERT INTO {PROMPT_FTS_TABLE}({PROMPT_FTS_TABLE}, rowid, prompt_text)
+        VALUES ('delete', old.id, old.prompt_text);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS prompts_fts_update AFTER UPDATE ON prompts BEGIN
+        INSERT INTO {PROMPT_FTS_TABLE}({PROMPT_FTS_TABLE}, rowid, prompt_text)
+        VALUES ('delete', old.id, old.prompt_text);
+        INSERT INTO {PROMPT_FTS_TABLE}(rowid, prompt_text)
+        VALUES (new.id, new.prompt_text);
+    END""",
+]
+
+
+def create_search_indexes(bind):
+    """Add the indexes create_all skips on existing tables, plus the prompt FTS."""
+    for index in ContentExecutionLog.__table__.indexes:
+        index.create(bind, checkfirst=True)
+    if bind.dialect.name != "sqlite":
+        return
+    created = not inspect(bind).has_table(PROMPT_FTS_TABLE)
+    try:
+        with bind.begin() as conn:
+            for statement in _PROMPT_FTS_DDL:
+                conn.execute(text(statement))
+            if created:
+                conn.execute(
+                    text(
+                        f"INSERT INTO {PROMPT_FTS_TABLE}({PROMPT_FTS_TABLE}) "
+                        "VALUES ('rebuild')"
+                    )
+                )
+    except Exception:
+        # SQLite built without FTS5/trigram: callers fall back to LIKE
+        pass
+
+
+# Binds known to have the prompt FTS table. Only positive answers are kept:
+# a bind checked before create_search_indexes gets the table later
+_PROMPT_FTS_BINDS = weakref.WeakSet()
+
+
+def has_prompt_fts(bind) -> bool:
+    if bind in _PROMPT_FTS_BINDS:
+        return True
+    if bind.dialect.name == "sqlite" and inspect(bind).has_table(PROMPT_FTS_TABLE):
+        _PROMPT_FTS_BINDS.add(bind)
+        return True
+    return False
+
+
+def init_db(bind=None, seed=True):
+    """Create the tables and search indexes, then seed the preset template.
+
+    Explicit startup step: importing models no longer touches the database.
+    Each service calls this once before serving (FastAPI startup, daemon and
+    worker entry points, startup.py); it is idempotent, and safe when several
+    uvicorn workers start at once: only one of them wins the seed insert.
+    """
+    from sqlalchemy.exc import IntegrityError, OperationalError
+
+    from db import Session, engine
+
+    bind = bind or engine
+    for attempt in range(5):
+        try:
+            Base.metadata.create_all(bind)
+            break
+        except OperationalError:
+            # "... already exists": a sibling worker is creating the schema;
+            # let it finish, then the existence checks skip what it made
+            if attempt == 4:
+                raise
+            time.sleep(0.25 * (attempt + 1))
+    create_search_indexes(bind)
+    if seed:
+        from preset import create_preset_data
+
+        db = Session(bind=bind)
+        try:
+            create_preset_data(db)
+        except IntegrityError:
+            # Another process seeded the same rows concurrently
+            db.rollback()
+        finally:
+            db.close()
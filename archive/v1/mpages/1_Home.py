@@ -47,7 +47,7 @@
 
 🔗 Dependencies:
     • streamlit: Web UI framework and component library
-    • crud: PromptExecutionEngine for AI processing logic
+    • jobs: Re-runs are queued for the job workers instead of run inline
     • stream.api: API client for backend communication
     • models: Database models and schema definitions
     • logging_setup: Centralized logging configuration
@@ -96,7 +96,7 @@
     • Data Exposure: AI responses displayed without access control
 
 ⚡ Performance Characteristics:
-    • Response Time: 100-500ms for UI updates, 2-8s for AI processing
+    • Response Time: 100-500ms for UI updates; AI re-runs are queued jobs
     • Memory Usage: ~20MB per session + model-specific overhead
     • Model Selection: GPT-4o (high cost/quality) vs GPT-3.5 (faster/cheaper)
     • Token Limits: User-configurable up to 8192 tokens max
@@ -178,7 +178,8 @@ Author: GacetaChat Team | Version: 2.1.0 | Last Updated: 2024-12-19
 
 import streamlit as st
 
-from crud import PromptExecutionEngine
+from config import config
+from jobs import enqueue
 from logging_setup import setup_logging
 from models import *
 from stream.api import *
@@ -232,28 +233,35 @@ def get_and_display_execution_session(session_id):
                 st.write(f"Sources: {log['sources']}")
 
             if st.button("Re-Run Prompt", key=f"re-run-prompt-{log['prompt_id']}"):
-                prompt_execution_engine = PromptExecutionEngine(next(get_db()))
-                prompt_execution_engine.re_execute_prompt(
-                    session_id,
-                    log["prompt_id"],
-                    model=model,
-                    temp=temperature,
-                    max_tokens=maxtokens,
+                # Queued for the job workers; the page never waits on the LLM
+                enqueue(
+                    next(get_db()),
+                    "re_execute_prompt",
+                    {
+                        "session_id": session_id,
+                        "prompt_id": log["prompt_id"],
+                        "model": model,
+                        "temp": temperature,
+                        "max_tokens": maxtokens,
+                    },
+                    priority=config.UI_JOB_PRIORITY,
                 )
-                st.rerun()
+                st.info("Prompt queued, refresh in a moment to see the new response.")
     except Exception as e:
         st.error(str(e))
 
 
 def run_execution_template(session, template_id, gaceta_id):
-    prompt_execution_engine = PromptExecutionEngine(session)
     try:
-        prompt_execution_engine.execute_content_template_prompts(
-            None, template_id, gaceta_id=gaceta_id, re_execute=False
+        job = enqueue(
+            session,
+            "execute_content_template",
+            {"template_id": template_id, "gaceta_id": gaceta_id},
+            priority=config.UI_JOB_PRIORITY,
         )
-        st.success("Execution template run successfully!")
+        st.success(f"Execution template queued (job {job.id})")
     except Exception as e:
-        st.error(f"Failed to run execution template: {e}")
+        st.error(f"Failed to queue execution template: {e}")
     finally:
         session.close()
 
@@ -263,6 +271,8 @@ def main():
 
     user_id = 1  # Example user_id, should be dynamic in real use case
     template_id = 1  # Example template_id, should be dynamic in real use case
+    # One round trip for the reads below; they are then answered from the memo
+    bootstrap(st.session_state.date, logs_limit=0)
     available_days = list_available_index_days()
     available_days_str = [day.split("T")[0] for day in available_days]
     # let's make sure the session_state.date actually is in the available days
@@ -300,15 +310,13 @@ def main():
                 st.session_state["selected_session_id"] = session_id
 
                 st.header("Today's Processed Prompts")
-                st.markdown(
-                    """
+                st.markdown("""
                 ## How It Works
                 This web application processes prompts based on the Daily Gaceta of Costa Rica and allows users to interact with the processed PDF of the day. 
                 - **Today's Processed Prompts**: View and manage the prompts processed for today.
                 - **Chat with Today's PDF**: Enter questions to search through today's PDF and get answers.
                 - **Admin**: View detailed logs of prompt executions.
-                """
-                )
+                """)
                 # st.subheader(f"Completed At: {session['completed_at']}")
                 # st.subheader(f"status: {session['status']}")
                 get_and_display_execution_session(session_id)
@@ -336,7 +344,6 @@ def main():
         run_execution_template(
             next(get_db()), template_id, gacetas["gacetas"][0]["gaceta"]["id"]
         )
-        st.rerun()
 
 
 main()
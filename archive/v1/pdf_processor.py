@@ -48,7 +48,7 @@
 📤 Outputs:
     • FAISS vector database: Searchable index with document embeddings
     • Document objects: LangChain Document list with extracted text content
-    • Index files: Persistent storage (index.faiss + index.pkl)
+    • Index files: Persistent storage (index.faiss + chunks.dat + chunks.idx.npy)
     • Processing status: Success/failure indicators for pipeline monitoring
     • Error diagnostics: File existence validation and path resolution
 
@@ -205,12 +205,16 @@ class PDFProcessor:
             else:
                 print(f"File does not exist at: {absolute_path}")
 
-            loader = PyPDFLoader(absolute_path)
-            documents = loader.load()
-            db = self.faiss_helper.create_faiss_index(documents)
             directory = os.path.dirname(latest_gaceta.file_path)
-            self.faiss_helper.save_faiss_index(db, directory)
+            db, documents = self.process_pdf(absolute_path, directory)
             session.close()
             return db, documents
         session.close()
         return None, None
+
+    def process_pdf(self, file_path, directory):
+        """Index one PDF and save the FAISS index into ``directory``."""
+        documents = PyPDFLoader(file_path).load()
+        db = self.faiss_helper.create_faiss_index(documents)
+        self.faiss_helper.save_faiss_index(db, directory)
+        return db, documents
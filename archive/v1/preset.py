@@ -172,7 +172,8 @@ def create_preset_data(db: Session):
     db.commit()
 
 
-# Run the function to create preset data
-db_session = next(get_db())
-create_preset_data(db_session)
-db_session.close()
+if __name__ == "__main__":
+    # Seeding normally runs from models.init_db at service startup
+    db_session = next(get_db())
+    create_preset_data(db_session)
+    db_session.close()
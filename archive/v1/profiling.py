@@ -0,0 +1,147 @@
+"""
+Opt-in profiling for pipeline entry points.
+
+Enabled with GACETA_PROFILE (or an entry point's --profile flag):
+    GACETA_PROFILE=1             stack sampling only (low overhead)
+    GACETA_PROFILE=cprofile      + deterministic cProfile stats (.prof)
+    GACETA_PROFILE=pyinstrument  + pyinstrument HTML report, if installed
+
+Every profiled run writes <timestamp>-<pid>-<name>.folded: one
+"thread;outer;...;inner count" line per sampled stack, the collapsed
+format read by flamegraph.pl, inferno and speedscope. Two runs can be
+diffed with difffolded.pl. Only the last GACETA_PROFILE_KEEP (default 10)
+runs of each name are kept.
+
+    with profile_run("scrape", PROFILES_DIR) as artifacts:
+        main()
+    # artifacts: paths written, once the block exits
+
+Lives with the v1 services, which are deployed from archive/v1 alone.
+Used by the ingestion daemon (one profile per stage step) and the job
+workers (one per job), with output in config.PROFILE_DIR; the serverless
+scraper (scripts/scrape_and_summarize.py --profile) imports it from here.
+"""
+
+import cProfile
+import logging
+import os
+import re
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+DEFAULT_KEEP = 10
+DEFAULT_INTERVAL = 0.005  # seconds between stack samples
+MODES = {"1", "true", "yes", "sample", "cprofile", "pyinstrument"}
+ARTIFACT = re.compile(r"^\d{8}-\d{6}-\d{6}-\d+-(?P<name>.+)\.(folded|prof|html)$")
+
+
+def profile_mode():
+    """The requested profiler ("sample", "cprofile", "pyinstrument") or None"""
+    value = os.environ.get("GACETA_PROFILE", "").strip().lower()
+    if value not in MODES:
+        return None
+    return "sample" if value in {"1", "true", "yes"} else value
+
+
+def _label(code):
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+class StackSampler:
+    """Counts the stacks of every other thread every ``interval`` seconds"""
+
+    def __init__(self, interval=DEFAULT_INTERVAL):
+        self.interval = interval
+        self.counts = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(names.get(ident, f"thread-{ident}"))
+                self.counts[";".join(reversed(stack))] += 1
+
+    def write_folded(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in sorted(self.counts.items()):
+                f.write(f"{stack} {count}\n")
+
+
+def prune_profiles(output_dir, name, keep):
+    """Delete all but the newest ``keep`` runs named ``name``"""
+    runs = {}
+    for path in Path(output_dir).iterdir():
+        match = ARTIFACT.match(path.name)
+        if match and match["name"] == name:
+            runs.setdefault(path.name.split(".")[0], []).append(path)
+    for stem in sorted(runs)[: max(len(runs) - keep, 0)]:
+        for path in runs[stem]:
+            path.unlink(missing_ok=True)
+
+
+@contextmanager
+def profile_run(name, output_dir, mode=None, keep=None, interval=DEFAULT_INTERVAL):
+    """Profile the block if profiling is enabled; yields the artifact list"""
+    mode = mode or profile_mode()
+    artifacts = []
+    if mode is None:
+        yield artifacts
+        return
+
+    keep = keep or int(os.environ.get("GACETA_PROFILE_KEEP", DEFAULT_KEEP))
+    name = re.sub(r"[^\w.-]+", "_", name)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    stem = output_dir / f"{datetime.now():%Y%m%d-%H%M%S-%f}-{os.getpid()}-{name}"
+
+    sampler = StackSampler(interval)
+    profiler = cProfile.Profile() if mode == "cprofile" else None
+    html = None
+    if mode == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+
+            html = Profiler(interval=interval)
+        except ImportError:
+            logging.warning("pyinstrument not installed - stack sampling only")
+
+    sampler.start()
+    if profiler:
+        profiler.enable()
+    if html:
+        html.start()
+    try:
+        yield artifacts
+    finally:
+        if html:
+            html.stop()
+            Path(f"{stem}.html").write_text(html.output_html(), encoding="utf-8")
+            artifacts.append(Path(f"{stem}.html"))
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(f"{stem}.prof")
+            artifacts.append(Path(f"{stem}.prof"))
+        sampler.stop()
+        sampler.write_folded(f"{stem}.folded")
+        artifacts.insert(0, Path(f"{stem}.folded"))
+        prune_profiles(output_dir, name, keep)
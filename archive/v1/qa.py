@@ -19,8 +19,8 @@
             │                                 │ Similarity Search
             ▼                                 ▼
     ┌─────────────────┐              ┌──────────────────┐
-    │ FAISS Vector DB │              │  Document Chunk  │
-    │ (Embeddings)    │◀─────────────│  Retrieval (k=5) │
+    │ FAISS + BM25    │              │  Hybrid (RRF)    │
+    │ (Embeddings)    │◀─────────────│  Retrieval (k=4) │
     └─────────────────┘              └──────────────────┘
             │                                 │
             │ Context Docs                    │ LLM Processing
@@ -36,7 +36,7 @@
     • Document indices: FAISS vector stores with embedded text chunks
     • Model configuration: GPT model selection, temperature, max tokens
     • Context limits: Token count thresholds for prompt management
-    • Retrieval parameters: Number of similar documents to consider (k=5)
+    • Retrieval parameters: Chunks sent to the LLM (k=4) out of fused candidates
 
 📤 Outputs:
     • AI answers: Structured responses with source attribution
@@ -140,9 +140,13 @@
     # Model Selection
     SUPPORTED_MODELS = ["gpt-4", "gpt-3.5-turbo", "debug"]
 
-    # Context Management
+    # Context Management (pack_docs_upto_limit, tokens cached per chunk)
     MAX_CONTEXT_TOKENS = 4000
-    SIMILARITY_SEARCH_K = 5
+
+    # Hybrid Retrieval (config.py)
+    RETRIEVAL_K = 4            # Chunks sent to the LLM
+    RETRIEVAL_FETCH_K = 20     # Candidates taken from FAISS and from BM25
+    RETRIEVAL_RERANK = True    # Coverage rerank of the fused head
 
     # Prompt Template
     STUFF_PROMPT_TEMPLATE = "Answer using provided sources..."
@@ -152,8 +156,11 @@ Author: GacetaChat Team | Version: 2.1.0 | Last Updated: 2024-12-19
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 """
 
+import hashlib
+from functools import lru_cache
 from typing import List
 
+import tiktoken
 from langchain.chains.combine_documents.stuff import StuffDocumentsChain
 
 # from knowledge_gpt.core.debug import FakeChatModel
@@ -161,18 +168,47 @@ from langchain.chat_models.base import BaseChatModel
 from langchain.docstore.document import Document
 from langchain_openai import ChatOpenAI
 
+from config import config
+
+# Tokens spent on the "\n\n" joiner between stuffed documents
+DOC_SEPARATOR_TOKENS = 2
+
+
+@lru_cache(maxsize=None)
+def _get_encoding(model: str):
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        # tiktoken downloads its BPE files on first use; offline we estimate
+        return None
+
+
+@lru_cache(maxsize=8192)
+def count_tokens(text: str, model: str = config.OPENAI_MODEL_NAME) -> int:
+    """Token count of ``text``, cached so each chunk is tokenized only once."""
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return (len(text) + 3) // 4  # ~4 chars per token
+    return len(encoding.encode(text))
+
 
 def pop_docs_upto_limit(
     query: str, chain: StuffDocumentsChain, docs: List[Document], max_len: int
 ) -> List[Document]:
     """Pops documents from a list until the final prompt length is less
-    than the max length."""
+    than the max length.
+
+    The full prompt is measured once; each pop subtracts the cached count of
+    the removed document instead of re-tokenizing the whole prompt."""
 
     token_count: int = chain.prompt_length(docs, question=query)  # type: ignore
 
     while token_count > max_len and len(docs) > 0:
-        docs.pop()
-        token_count = chain.prompt_length(docs, question=query)  # type: ignore
+        doc = docs.pop()
+        token_count -= count_tokens(doc.page_content) + DOC_SEPARATOR_TOKENS
 
     return docs
 
@@ -210,6 +246,34 @@ FINAL ANSWER:"""
 STUFF_PROMPT = PromptTemplate(
     template=template, input_variables=["context", "question"]
 )
+# Changes whenever the template does; cached chat answers are keyed on it
+STUFF_PROMPT_VERSION = hashlib.sha256(template.encode("utf-8")).hexdigest()[:12]
+
+
+def pack_docs_upto_limit(
+    query: str,
+    docs: List[Document],
+    max_len: int,
+    model: str = config.OPENAI_MODEL_NAME,
+) -> List[Document]:
+    """Greedily packs documents, in relevance order, into the token budget.
+
+    Each chunk is tokenized once (see count_tokens). A chunk that does not fit
+    is skipped rather than ending the packing, so a smaller, less relevant
+    chunk can still use the remaining budget."""
+
+    budget = max_len - count_tokens(
+        STUFF_PROMPT.format(context="", question=query), model
+    )
+    packed = []
+    for doc in docs:
+        cost = count_tokens(doc.page_content, model) + DOC_SEPARATOR_TOKENS
+        if cost <= budget:
+            packed.append(doc)
+            budget -= cost
+    return packed
+
+
 from langchain.chat_models.base import BaseChatModel
 from langchain.docstore.document import Document
 
@@ -237,6 +301,7 @@ def query_folder(
     llm: BaseChatModel,
     return_all: bool = False,
     debug: bool = True,
+    k: int = None,
 ):
     """Queries a folder index for an answer.
 
@@ -247,6 +312,7 @@ def query_folder(
         just the sources for the answer.
         model (str): The model to use for the answer generation.
         **model_kwargs (Any): Keyword arguments for the model.
+        k (int): Number of chunks sent to the LLM (default config.RETRIEVAL_K).
 
     Returns:
         AnswerWithSources: The answer and the source documents.
@@ -259,7 +325,25 @@ def query_folder(
     #         "ai_references": None,
     #     }
 
-    relevant_docs = folder_index.similarity_search(query, k=5)
+    k = k or config.RETRIEVAL_K
+    if hasattr(folder_index, "hybrid_search"):
+        # Vector + BM25 fusion, so exact identifiers (decree numbers, SINAC,
+        # cédulas) are found and fewer chunks are needed in the prompt
+        relevant_docs = folder_index.hybrid_search(
+            query,
+            k=k,
+            fetch_k=config.RETRIEVAL_FETCH_K,
+            rerank=config.RETRIEVAL_RERANK,
+        )
+    else:
+        relevant_docs = folder_index.similarity_search(query, k=k)
+
+    relevant_docs = pack_docs_upto_limit(
+        query,
+        relevant_docs,
+        config.MAX_CONTEXT_TOKENS,
+        model=getattr(llm, "model_name", None) or config.OPENAI_MODEL_NAME,
+    )
 
     partial_prompt = STUFF_PROMPT.partial(context=relevant_docs, question=query)
 
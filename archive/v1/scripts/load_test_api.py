@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+Module Name: load_test_api.py
+Description: In-process load test for the FastAPI backend (fastapp.py)
+
+Drives the real ASGI app through httpx's ASGITransport with N concurrent
+clients against a seeded temporary SQLite database, and compares two modes:
+
+- threadpool: the routes as shipped (plain ``def`` endpoints that FastAPI runs
+  on its worker thread pool)
+- event-loop: the same route functions wrapped in ``async def`` so they run
+  inline on the event loop, i.e. how fastapp.py behaved before
+
+A per-statement delay (``--query-latency-ms``) stands in for a slow disk or
+a busy writer, which is what makes blocking the loop visible.
+
+``--workers 1,2,4`` instead starts a real ``uvicorn fastapp:app --workers N``
+per count against the seeded database and hammers it from client processes
+over keep-alive HTTP, reporting read throughput and scaling efficiency
+relative to one worker. Expect close to linear scaling up to the number of
+cores; past that the workers only contend.
+
+Key Features:
+- No network, no server process: requests go straight into the ASGI app
+  (except in ``--workers`` mode, which measures real uvicorn processes)
+- Reports throughput, p50/p95 latency and errors per mode
+- Reusable from tests through ``run_load_test`` and ``run_worker_scaling_test``
+
+Usage Example:
+    ```python
+    # From archive/v1
+    python scripts/load_test_api.py --clients 50 --requests 10
+
+    # Only the current implementation, with a slower "disk"
+    python scripts/load_test_api.py --mode threadpool --query-latency-ms 50
+
+    # Multi-process scaling: 1, 2 and 4 uvicorn workers, 8 client processes
+    python scripts/load_test_api.py --workers 1,2,4 --clients 8 --seconds 5
+    ```
+
+Dependencies:
+    - httpx: ASGI client transport
+    - fastapi / anyio: application under test
+    - sqlalchemy: temporary database
+
+Author: GacetaChat Development Team
+Created: 2024-12-19
+Last Modified: 2024-12-19
+Version: 1.0.0
+
+License: MIT License
+Copyright (c) 2024-2025 GacetaChat Team
+
+Notes:
+    - Run from archive/v1 (or with it on PYTHONPATH)
+    - Only the temporary database is touched: importing fastapp does not
+      create gaceta1.db (init_db is an explicit startup step)
+
+See Also:
+    - fastapp.py: Application under test
+    - test/smoke/test_performance_smoke.py: Throughput budget
+"""
+
+import argparse
+import asyncio
+import http.client
+import inspect
+import multiprocessing
+import os
+import queue
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import httpx
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+import fastapp  # noqa: E402
+from db import get_db  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from fastapi.routing import APIRoute  # noqa: E402
+from models import (  # noqa: E402
+    Base,
+    ContentExecutionLog,
+    ContentTemplate,
+    ExecutionSession,
+    GacetaPDF,
+    GlobalQueryCount,
+    Prompt,
+    PromptQueryResponse,
+    create_search_indexes,
+)
+
+ENDPOINTS = [
+    "/content_logs/?limit=10",
+    "/gacetas?limit=5",
+    "/check_global_limit/",
+    "/health_check",
+]
+
+
+def seed_database(path, query_latency):
+    engine = create_engine(
+        f"sqlite:///{path}",
+        connect_args={"check_same_thread": False},
+        pool_size=10,
+        max_overflow=20,
+    )
+    Base.metadata.create_all(engine)
+    create_search_indexes(engine)
+
+    db = sessionmaker(bind=engine)()
+    # Present so the server's startup seeding leaves this data alone
+    db.add(ContentTemplate(id=1, title="Load test"))
+    db.add(
+        Prompt(
+            id=1,
+            template_id=1,
+            alias="twitter_summary",
+            prompt_text="Resumen para Twitter",
+        )
+    )
+    db.add(GlobalQueryCount(date=datetime.now().date(), count=0))
+    start = datetime(2024, 1, 1, 6, 0)
+    for day in range(30):
+        gaceta = GacetaPDF(date=start + timedelta(days=day), file_path=f"{day}.pdf")
+        db.add(gaceta)
+        db.flush()
+        session = ExecutionSession(document_id=gaceta.id)
+        db.add(session)
+        db.flush()
+        output = PromptQueryResponse(response=f"Tweet {day}")
+        db.add(output)
+        db.flush()
+        db.add(
+            ContentExecutionLog(
+                prompt_id=1,
+                execution_session_id=session.id,
+                query_response_id=output.id,
+                state="EXECUTED",
+            )
+        )
+    db.commit()
+    db.close()
+
+    if query_latency:
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def slow_statement(*args):
+            time.sleep(query_latency)
+
+    return engine
+
+
+def event_loop_app():
+    """fastapp's routes re-registered as ``async def`` wrappers (old behaviour)."""
+    legacy = FastAPI()
+    for route in fastapp.app.routes:
+        if not isinstance(route, APIRoute):
+            continue
+        endpoint = route.endpoint
+        if inspect.iscoroutinefunction(endpoint):
+            inline = endpoint
+        else:
+
+            async def inline(*args, _endpoint=endpoint, **kwargs):
+                return _endpoint(*args, **kwargs)
+
+            inline.__signature__ = inspect.signature(endpoint)
+        legacy.add_api_route(
+            route.path,
+            inline,
+            methods=list(route.methods),
+            response_model=route.response_model,
+        )
+    return legacy
+
+
+async def _client(client, requests_per_client, latencies, errors):
+    for i in range(requests_per_client):
+        path = ENDPOINTS[i % len(ENDPOINTS)]
+        started = time.perf_counter()
+        response = await client.get(path)
+        latencies.append(time.perf_counter() - started)
+        if response.status_code != 200:
+            errors.append((path, response.status_code))
+
+
+async def _run(app, clients, requests_per_client):
+    await fastapp.size_thread_pool()
+    headers = {"X-API-KEY": fastapp.API_KEY} if fastapp.API_KEY else {}
+    latencies, errors = [], []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://loadtest", headers=headers
+    ) as client:
+        started = time.perf_counter()
+        await asyncio.gather(
+            *[
+                _client(client, requests_per_client, latencies, errors)
+                for _ in range(clients)
+            ]
+        )
+        elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "seconds": elapsed,
+        "throughput": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "errors": errors,
+    }
+
+
+def run_load_test(
+    mode="threadpool", clients=50, requests_per_client=10, query_latency_ms=10
+):
+    """Run one load test and return its throughput and latency summary."""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = seed_database(os.path.join(tmp, "load.db"), query_latency_ms / 1000)
+        SessionLocal = sessionmaker(bind=engine)
+
+        def override_get_db():
+            db = SessionLocal()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app = fastapp.app if mode == "threadpool" else event_loop_app()
+        app.dependency_overrides[get_db] = override_get_db
+        try:
+            return asyncio.run(_run(app, clients, requests_per_client))
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+            engine.dispose()
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _start_server(workers, port, database_url, api_key, timeout=60):
+    env = dict(
+        os.environ,
+        DATABASE_URL=database_url,
+        APP_SECRET_API_KEY=api_key,
+        # Cache invalidations stay private to this run
+        RESPONSE_CACHE_GENERATION_FILE=database_url.rsplit("/", 1)[-1] + ".gen",
+    )
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "fastapp:app",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--log-level",
+            "warning",
+        ],
+        cwd=os.path.dirname(database_url.split("///", 1)[1]),
+        env=dict(env, PYTHONPATH=APP_DIR),
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/health_check")
+            if conn.getresponse().status == 200:
+                return server
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError(f"uvicorn with {workers} workers did not start")
+
+
+def _http_client(port, api_key, seconds, results):
+    headers = {"X-API-KEY": api_key}
+    conn = None
+    attempts = done = errors = 0
+    try:
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            attempts += 1
+            try:
+                if conn is None:
+                    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+                path = ENDPOINTS[attempts % len(ENDPOINTS)]
+                conn.request("GET", path, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                done += 1
+                errors += response.status != 200
+            except (OSError, http.client.HTTPException):
+                # Refused, reset or timed out: count it and reconnect
+                errors += 1
+                if conn is not None:
+                    conn.close()
+                    conn = None
+                time.sleep(0.05)
+    finally:
+        if conn is not None:
+            conn.close()
+        results.put((done, errors))
+
+
+def _measure(port, api_key, clients, seconds):
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(
+            target=_http_client, args=(port, api_key, seconds, results)
+        )
+        for _ in range(clients)
+    ]
+    for process in processes:
+        process.start()
+    counts = []
+    for _ in processes:
+        try:
+            counts.append(results.get(timeout=seconds + 30))
+        except queue.Empty:
+            # A client died without reporting; count it as a failed request
+            counts.append((0, 1))
+    for process in processes:
+        process.join(5)
+        if process.is_alive():
+            process.terminate()
+    requests = sum(done for done, _ in counts)
+    return {
+        "requests": requests,
+        "throughput": requests / seconds,
+        "errors": sum(errors for _, errors in counts),
+    }
+
+
+def run_worker_scaling_test(worker_counts=(1, 2, 4), clients=8, seconds=5):
+    """Read throughput of ``uvicorn --workers N`` for each N.
+
+    Returns ``{workers: {"requests", "throughput", "errors", "efficiency"}}``
+    where efficiency is throughput / (N * single-worker throughput).
+    """
+    api_key = "load-test-key"
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "load.db")
+        seed_database(path, 0).dispose()
+        for workers in worker_counts:
+            port = _free_port()
+            server = _start_server(workers, port, f"sqlite:///{path}", api_key)
+            try:
+                # Warm every worker's caches before measuring
+                _measure(port, api_key, clients, 0.5)
+                results[workers] = _measure(port, api_key, clients, seconds)
+            finally:
+                server.terminate()
+                server.wait(30)
+    base = results[min(results)]["throughput"] / min(results)
+    for workers, result in results.items():
+        result["efficiency"] = result["throughput"] / (workers * base)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2])
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=10, help="per client")
+    parser.add_argument("--query-latency-ms", type=float, default=10)
+    parser.add_argument(
+        "--mode", choices=["both", "threadpool", "event-loop"], default="both"
+    )
+    parser.add_argument(
+        "--workers",
+        help="comma-separated uvicorn worker counts, e.g. 1,2,4 (multi-process)",
+    )
+    parser.add_argument("--seconds", type=float, default=5, help="per worker count")
+    args = parser.parse_args()
+
+    if args.workers:
+        counts = [int(n) for n in args.workers.split(",")]
+        results = run_worker_scaling_test(counts, args.clients, args.seconds)
+        print(f"{os.cpu_count()} cores, {args.clients} client processes")
+        for workers, result in results.items():
+            print(
+                f"{workers:>2} workers: {result['throughput']:.0f} req/s, "
+                f"efficiency {result['efficiency']:.0%}, errors {result['errors']}"
+            )
+        return
+
+    modes = ["event-loop", "threadpool"] if args.mode == "both" else [args.mode]
+    for mode in modes:
+        result = run_load_test(mode, args.clients, args.requests, args.query_latency_ms)
+        print(
+            f"{mode:>11}: {result['requests']} requests in {result['seconds']:.2f}s "
+            f"= {result['throughput']:.0f} req/s, p50 {result['p50_ms']:.0f}ms, "
+            f"p95 {result['p95_ms']:.0f}ms, errors {len(result['errors'])}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Module Name: measure_ingestion.py
+Description: Per-day CPU and IO of the ingestion scheduler, before and after
+
+Compares the steady-state cost of keeping today's gaceta ingested:
+
+- legacy: the former ``schedule.every(1).minutes`` loop, where every tick
+  opened a DB session, queried GacetaPDF, loaded the day's FAISS index and
+  looked up its execution sessions, even with everything already done.
+  A sample of ticks is measured and scaled to 1,440 ticks per day.
+- daemon: ``IngestionDaemon`` driven through a whole simulated day with a
+  fake clock: waiting for the window, polling with backoff until the PDF
+  appears, then idling until tomorrow.
+
+Network access and the indexing / prompt jobs are stubbed out in the
+daemon run. They happen once per day under either scheduler, so they are
+left out of both sides; what remains is the scheduling overhead itself.
+
+Key Features:
+- Temporary SQLite database and a gazette-sized FAISS index (hashing
+  embeddings, no network)
+- CPU seconds from time.process_time, bytes read/written from /proc/self/io
+
+Usage Example:
+    ```python
+    # From archive/v1
+    python scripts/measure_ingestion.py
+    python scripts/measure_ingestion.py --legacy-ticks 50 --chunks 4000
+    ```
+
+Dependencies:
+    - faiss / numpy: index written and loaded by the legacy tick
+    - sqlalchemy: temporary database
+
+Author: GacetaChat Development Team
+Created: 2024-12-19
+Last Modified: 2024-12-19
+Version: 1.0.0
+
+License: MIT License
+Copyright (c) 2024-2025 GacetaChat Team
+
+Notes:
+    - Run from archive/v1 (or with it on PYTHONPATH)
+    - /proc/self/io is Linux only; elsewhere the IO columns read 0
+
+See Also:
+    - download_gaceta.py: IngestionDaemon
+    - scripts/load_test_api.py: same harness style for the API
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("EMBEDDING_BACKEND", "hashing")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain.docstore.document import Document  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+import download_gaceta  # noqa: E402
+from config import config  # noqa: E402
+from crud import get_execution_session_by_date  # noqa: E402
+from download_gaceta import COSTA_RICA_TZ, IngestionDaemon  # noqa: E402
+from faiss_helper import FAISSHelper  # noqa: E402
+from models import Base, ExecutionSession, GacetaPDF  # noqa: E402
+
+TICKS_PER_DAY = 24 * 60
+
+
+def _usage():
+    """(CPU seconds, bytes read, bytes written) of this process so far."""
+    cpu = time.process_time()
+    read = written = 0
+    try:
+        with open("/proc/self/io") as f:
+            fields = dict(line.split(": ") for line in f.read().splitlines())
+        read, written = int(fields["rchar"]), int(fields["wchar"])
+    except OSError:
+        pass
+    return cpu, read, written
+
+
+def _measure(function):
+    started = _usage()
+    function()
+    return [end - begin for end, begin in zip(_usage(), started)]
+
+
+def seed(directory, day, chunks):
+    """Today's gaceta, its FAISS index and an EXECUTED session."""
+    engine = create_engine(f"sqlite:///{os.path.join(directory, 'ingestion.db')}")
+    Base.metadata.create_all(engine)
+    SessionLocal = sessionmaker(bind=engine)
+
+    gaceta_dir = os.path.join(directory, day)
+    documents = [
+        Document(page_content=f"Decreto {i} del Poder Ejecutivo. " * 30)
+        for i in range(chunks)
+    ]
+    helper = FAISSHelper()
+    helper.save_faiss_index(helper.create_faiss_index(documents), gaceta_dir)
+
+    db = SessionLocal()
+    gaceta = GacetaPDF(
+        date=datetime.strptime(day, "%Y-%m-%d"),
+        file_path=os.path.join(gaceta_dir, "gaceta.pdf"),
+    )
+    db.add(gaceta)
+    db.flush()
+    db.add(ExecutionSession(document_id=gaceta.id, status="EXECUTED"))
+    db.commit()
+    db.close()
+    return SessionLocal
+
+
+def legacy_tick(SessionLocal, day):
+    """What each minute of the old loop did once the day was complete."""
+    session = SessionLocal()
+    date_obj = datetime.strptime(day, "%Y-%m-%d")
+    session.query(GacetaPDF).filter_by(date=date_obj).first()
+    db = FAISSHelper().load_faiss_index(os.path.join(config.GACETA_PDFS_DIR, day))
+    db.index
+    get_execution_session_by_date(session, date_obj)
+    session.close()
+
+
+def simulate_daemon_day(state_file, day, published_at):
+    """Run IngestionDaemon over one day with a fake clock and stubbed stages."""
+    clock = COSTA_RICA_TZ.localize(datetime.strptime(day, "%Y-%m-%d"))
+    end = clock + timedelta(days=1)
+    stored = set()
+
+    download_gaceta.find_pdf_url = lambda: (
+        "/today.pdf" if clock >= published_at else "/yesterday.pdf"
+    )
+    download_gaceta.download_pdf = lambda url: b"%PDF"
+    download_gaceta.store_gaceta_pdf = lambda d, data=None: stored.add(d)
+    # Indexing and prompts are job-queue work, done by the workers
+    download_gaceta.run_stage_job = lambda kind, d: "DONE"
+
+    daemon = IngestionDaemon(state_file=state_file)
+    daemon.state = {"last_pdf_url": "/yesterday.pdf"}
+    while clock < end:
+        next_run = daemon.step(clock)
+        # run_forever never sleeps longer than an hour at a time
+        clock = max(clock, min(next_run, clock + timedelta(hours=1)))
+    return daemon.state["usage"]
+
+
+def run_measurement(legacy_ticks=20, chunks=2000, day="2024-12-19"):
+    with tempfile.TemporaryDirectory() as tmp:
+        config.GACETA_PDFS_DIR = tmp
+        SessionLocal = seed(tmp, day, chunks)
+        download_gaceta.Session = SessionLocal
+
+        legacy_tick(SessionLocal, day)  # warm imports and the page cache
+        cpu, read, written = _measure(
+            lambda: [legacy_tick(SessionLocal, day) for _ in range(legacy_ticks)]
+        )
+        scale = TICKS_PER_DAY / legacy_ticks
+        legacy = {
+            "wakeups": TICKS_PER_DAY,
+            "cpu_seconds": cpu * scale,
+            "read_bytes": read * scale,
+            "write_bytes": written * scale,
+        }
+
+        published_at = COSTA_RICA_TZ.localize(datetime(2024, 12, 19, 7, 10))
+        state_file = os.path.join(tmp, "ingestion_state.json")
+        usage = {}
+        cpu, read, written = _measure(
+            lambda: usage.update(simulate_daemon_day(state_file, day, published_at))
+        )
+        daemon = {
+            "wakeups": usage["wakeups"],
+            "cpu_seconds": cpu,
+            "read_bytes": read,
+            "write_bytes": written,
+        }
+    return {"legacy": legacy, "daemon": daemon}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2])
+    parser.add_argument("--legacy-ticks", type=int, default=20)
+    parser.add_argument("--chunks", type=int, default=2000, help="index size")
+    args = parser.parse_args()
+
+    result = run_measurement(args.legacy_ticks, args.chunks)
+    for name, day in result.items():
+        print(
+            f"{name:>6}: {day['wakeups']:>5} wake-ups/day, "
+            f"{day['cpu_seconds']:8.3f} CPU s/day, "
+            f"{day['read_bytes'] / 2**20:9.2f} MiB read/day, "
+            f"{day['write_bytes'] / 2**20:7.2f} MiB written/day"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""Cache of chat answers per gaceta day, model, temperature and prompt version.
+
+Exact (normalized) repeats of a question are always served from the cache.
+Near-paraphrases are matched by embedding similarity only with a semantic
+embedding backend: the offline hashing vectors are bags of character
+n-grams, so "¿sube el impuesto?" and "¿baja el impuesto?" look alike to them.
+"""
+
+import json
+from typing import Optional
+
+import numpy as np
+from langchain.docstore.document import Document
+from sqlalchemy import func, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from config import config
+from embeddings import fold_accents
+from models import AnswerCacheEntry, AnswerCacheStat
+
+# Backends whose vectors capture meaning well enough for similarity matching
+SEMANTIC_BACKENDS = {"openai"}
+
+_UPSERTS = {"sqlite": sqlite_insert, "postgresql": postgresql_insert}
+
+
+def normalize_query(query: str) -> str:
+    """Accent-folded, lowercased, whitespace-collapsed form of a chat query."""
+    return " ".join(fold_accents(query).split())
+
+
+def _unit_vector(vector) -> np.ndarray:
+    vector = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def record_lookup(db: Session, date: str, hit: bool):
+    """Count one cache hit or miss for ``date`` (atomic increment)."""
+    field = "hits" if hit else "misses"
+    column = getattr(AnswerCacheStat, field)
+    upsert = _UPSERTS.get(db.get_bind().dialect.name)
+    if upsert is not None:
+        db.execute(
+            upsert(AnswerCacheStat)
+            .values(gaceta_date=date, hits=int(hit), misses=int(not hit))
+            .on_conflict_do_update(
+                index_elements=[AnswerCacheStat.gaceta_date],
+                set_={field: column + 1},
+            )
+        )
+    else:
+        if db.get(AnswerCacheStat, date) is None:
+            db.add(AnswerCacheStat(gaceta_date=date, hits=0, misses=0))
+            db.flush()
+        db.execute(
+            update(AnswerCacheStat)
+            .where(AnswerCacheStat.gaceta_date == date)
+            .values({field: column + 1})
+        )
+    db.commit()
+
+
+class AnswerCache:
+    """Chat answers keyed by (gaceta date, model, temperature, prompt version).
+
+    A lookup first tries the normalized query text (no embedding call), then,
+    for backends in SEMANTIC_BACKENDS, the cosine similarity of the query
+    embedding against the answers cached under the same key. Every lookup is
+    counted as a hit or a miss for ``get_answer_cache_stats``.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        embeddings,
+        model: str,
+        temperature: float,
+        prompt_version: str,
+        backend=None,
+        threshold=None,
+    ):
+        self.db = db
+        self.embeddings = embeddings
+        self.model = model
+        self.temperature = round(float(temperature), 2)
+        self.prompt_version = prompt_version
+        self.backend = backend or config.EMBEDDING_BACKEND
+        self.semantic = self.backend in SEMANTIC_BACKENDS
+        self.threshold = (
+            config.ANSWER_CACHE_THRESHOLD if threshold is None else threshold
+        )
+        self._last_query = None
+        self._last_vector = None
+
+    def _embed(self, query: str) -> np.ndarray:
+        if self._last_query != query:
+            self._last_vector = _unit_vector(self.embeddings.embed_query(query))
+            self._last_query = query
+        return self._last_vector
+
+    def _entries(self, date: str):
+        return (
+            self.db.query(AnswerCacheEntry)
+            .filter_by(
+                gaceta_date=date,
+                embedding_backend=self.backend,
+                model=self.model,
+                temperature=self.temperature,
+                prompt_version=self.prompt_version,
+            )
+            .all()
+        )
+
+    def _match(self, date: str, query: str):
+        entries = self._entries(date)
+        if not entries:
+            return None, None
+
+        normalized = normalize_query(query)
+        for entry in entries:
+            if entry.normalized_query == normalized:
+                return entry, 1.0
+        if not self.semantic:
+            return None, None
+
+        matrix = np.vstack(
+            [np.frombuffer(e.query_embedding, dtype=np.float32) for e in entries]
+        )
+        scores = matrix @ self._embed(query)
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            return None, None
+        return entries[best], float(scores[best])
+
+    def lookup(self, date: str, query: str) -> Optional[dict]:
+        match, similarity = self._match(date, query)
+        if match is not None:
+            match.hit_count = (match.hit_count or 0) + 1
+            match.last_similarity = similarity
+        record_lookup(self.db, date, hit=match is not None)
+        return self._to_result(match) if match is not None else None
+
+    def store(self, date: str, query: str, result: dict):
+        sources = [
+            {"page_content": doc.page_content, "metadata": doc.metadata}
+            for doc in result.get("sources") or []
+        ]
+        entry = AnswerCacheEntry(
+            gaceta_date=date,
+            embedding_backend=self.backend,
+            model=self.model,
+            temperature=self.temperature,
+            prompt_version=self.prompt_version,
+            normalized_query=normalize_query(query),
+            # Hashing vectors are never compared, so skip computing them
+            query_embedding=(self._embed(query).tobytes() if self.semantic else b""),
+            answer=result["answer"],
+            ai_references=result.get("ai_references"),
+            sources=json.dumps(sources, ensure_ascii=False),
+        )
+        self.db.add(entry)
+        self.db.commit()
+        return entry
+
+    @staticmethod
+    def _to_result(entry: AnswerCacheEntry) -> dict:
+        return {
+            "answer": entry.answer,
+            "sources": [Document(**doc) for doc in json.loads(entry.sources or "[]")],
+            "ai_references": entry.ai_references,
+            "cached": True,
+        }
+
+
+def get_answer_cache_stats(db: Session, date: Optional[str] = None) -> dict:
+    """Recorded hits and misses, plus the number of stored answers."""
+    counts = db.query(
+        func.coalesce(func.sum(AnswerCacheStat.hits), 0),
+        func.coalesce(func.sum(AnswerCacheStat.misses), 0),
+    )
+    entries = db.query(func.count(AnswerCacheEntry.id))
+    if date:
+        counts = counts.filter(AnswerCacheStat.gaceta_date == date)
+        entries = entries.filter(AnswerCacheEntry.gaceta_date == date)
+    hits, misses = counts.one()
+    total = hits + misses
+    return {
+        "entries": entries.scalar(),
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / total if total else 0.0,
+    }
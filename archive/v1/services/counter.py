@@ -1,12 +1,70 @@
+import threading
+import time
 from datetime import datetime
 
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
+from config import config
 from models import GlobalQueryCount
 
+_UPSERTS = {"sqlite": sqlite_insert, "postgresql": postgresql_insert}
+
+
+class QueryBudget:
+    """Process-local token bucket mirroring today's remaining global queries.
+
+    Checks are answered from the bucket while it is fresh (``ttl`` seconds).
+    Counts only go up within a day (bar a failed call's released query), so
+    an empty bucket stays empty until the date changes and needs no database
+    round trip at all. The cap itself
+    is enforced by the atomic increment, never by this cache, so it holds
+    across any number of API worker processes; each worker's bucket can only
+    lag the others' increments by ``ttl`` seconds.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self.day = None
+            self.tokens = None
+            self.refreshed_at = 0.0
+
+    def get(self, day, ttl):
+        with self._lock:
+            if self.day != day or self.tokens is None:
+                return None
+            if self.tokens <= 0 or time.monotonic() - self.refreshed_at < ttl:
+                return self.tokens
+            return None
+
+    def set(self, day, tokens):
+        with self._lock:
+            self.day = day
+            self.tokens = max(tokens, 0)
+            self.refreshed_at = time.monotonic()
+
+
+query_budget = QueryBudget()
+
 
 def get_global_query_count(db: Session):
     today = datetime.now().date()
+    upsert = _UPSERTS.get(db.get_bind().dialect.name)
+    if upsert is not None:
+        db.execute(
+            upsert(GlobalQueryCount)
+            .values(date=today, count=0)
+            .on_conflict_do_nothing(index_elements=[GlobalQueryCount.date])
+        )
+        db.commit()
+        return db.query(GlobalQueryCount).filter_by(date=today).one()
+
     query_count = db.query(GlobalQueryCount).filter_by(date=today).first()
     if not query_count:
         query_count = GlobalQueryCount(date=today, count=0)
@@ -15,12 +73,71 @@ def get_global_query_count(db: Session):
     return query_count
 
 
-def increment_global_query_count(db: Session):
-    query_count = get_global_query_count(db)
-    query_count.count += 1
+def increment_global_query_count(db: Session, limit: int = None) -> bool:
+    """Atomically take one of today's queries; False once the cap is reached.
+
+    A single upsert: ``INSERT (date, 1) ON CONFLICT(date) DO UPDATE SET
+    count = count + 1 WHERE count < limit``, so concurrent requests can never
+    push the counter past ``limit``.
+    """
+    limit = limit or config.GLOBAL_QUERY_LIMIT
+    today = datetime.now().date()
+    upsert = _UPSERTS.get(db.get_bind().dialect.name)
+    if upsert is not None:
+        statement = (
+            upsert(GlobalQueryCount)
+            .values(date=today, count=1)
+            .on_conflict_do_update(
+                index_elements=[GlobalQueryCount.date],
+                set_={"count": GlobalQueryCount.count + 1},
+                where=GlobalQueryCount.count < limit,
+            )
+            .returning(GlobalQueryCount.count)
+        )
+    else:
+        get_global_query_count(db)
+        statement = (
+            update(GlobalQueryCount)
+            .where(GlobalQueryCount.date == today, GlobalQueryCount.count < limit)
+            .values(count=GlobalQueryCount.count + 1)
+            .returning(GlobalQueryCount.count)
+        )
+    count = db.execute(statement).scalar()
     db.commit()
 
+    query_budget.set(today, limit - count if count is not None else 0)
+    return count is not None
 
-def check_global_limit(db: Session):
-    query_count = get_global_query_count(db)
-    return query_count.count < 50
+
+def release_global_query(db: Session, limit: int = None) -> bool:
+    """Give back a query taken by ``increment_global_query_count``.
+
+    For a reservation whose LLM call failed. Other processes whose bucket is
+    already empty only see the freed slot once the day changes.
+    """
+    limit = limit or config.GLOBAL_QUERY_LIMIT
+    today = datetime.now().date()
+    count = db.execute(
+        update(GlobalQueryCount)
+        .where(GlobalQueryCount.date == today, GlobalQueryCount.count > 0)
+        .values(count=GlobalQueryCount.count - 1)
+        .returning(GlobalQueryCount.count)
+    ).scalar()
+    db.commit()
+
+    if count is not None:
+        query_budget.set(today, limit - count)
+    return count is not None
+
+
+def check_global_limit(db: Session, limit: int = None):
+    limit = limit or config.GLOBAL_QUERY_LIMIT
+    today = datetime.now().date()
+    tokens = query_budget.get(today, config.GLOBAL_QUERY_CHECK_TTL)
+    if tokens is None:
+        count = db.execute(
+            select(GlobalQueryCount.count).where(GlobalQueryCount.date == today)
+        ).scalar()
+        tokens = limit - (count or 0)
+        query_budget.set(today, tokens)
+    return tokens > 0
@@ -0,0 +1,38 @@
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+from config import config
+from models import OAuthState
+
+
+def save_oauth_state(db: Session, state: str, code_verifier: str, ttl: int = None):
+    """Remember the PKCE verifier of a login until its callback (or ``ttl``)."""
+    now = datetime.utcnow()
+    ttl = config.OAUTH_STATE_TTL if ttl is None else ttl
+    db.execute(delete(OAuthState).where(OAuthState.expires_at <= now))
+    db.merge(
+        OAuthState(
+            state=state,
+            code_verifier=code_verifier,
+            expires_at=now + timedelta(seconds=ttl),
+        )
+    )
+    db.commit()
+
+
+def pop_oauth_state(db: Session, state: str) -> Optional[str]:
+    """Take the verifier for ``state``; each state can be redeemed only once.
+
+    The delete and the read are one statement, so when two workers receive
+    the same callback only one of them gets the verifier.
+    """
+    code_verifier = db.execute(
+        delete(OAuthState)
+        .where(OAuthState.state == state, OAuthState.expires_at > datetime.utcnow())
+        .returning(OAuthState.code_verifier)
+    ).scalar()
+    db.commit()
+    return code_verifier
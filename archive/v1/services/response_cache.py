@@ -0,0 +1,215 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.engine import make_url
+
+from config import config
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+CACHE_CONTROL = "private, no-cache"
+
+
+class CachedResponse:
+    """A serialized JSON body, its ETag and lazily compressed variants."""
+
+    def __init__(self, etag: str, body: bytes):
+        self.etag = etag
+        self.body = body
+        self.stored_at = time.monotonic()
+        self._encoded = {}
+
+    def encoded(self, encoding: str) -> bytes:
+        if encoding not in self._encoded:
+            if encoding == "br":
+                self._encoded[encoding] = brotli.compress(self.body)
+            else:
+                self._encoded[encoding] = gzip.compress(self.body, mtime=0)
+        return self._encoded[encoding]
+
+
+def _default_generation_file():
+    """Shared by every process using the same database, and only by them.
+
+    SQLite: next to the database file. Server databases: one file per
+    DATABASE_URL in the working directory. In-memory SQLite is private to its
+    process, so it needs none (None).
+    """
+    url = make_url(config.DATABASE_URL)
+    if url.get_backend_name() == "sqlite":
+        if url.database in (None, "", ":memory:"):
+            return None
+        return os.path.abspath(url.database) + ".cache-generation"
+    digest = hashlib.sha1(config.DATABASE_URL.encode("utf-8")).hexdigest()[:12]
+    return os.path.abspath(f"response-cache-{digest}.generation")
+
+
+class ResponseCache:
+    """TTL'd in-process cache of read-endpoint responses, keyed by URL.
+
+    Within ``ttl`` seconds an entry is served without touching the database.
+    After that it is revalidated against the current ETag, so an unchanged
+    resource only costs the (cheap) state query. ``invalidate`` drops every
+    entry; the prompt engine calls it whenever it commits.
+
+    Invalidation reaches every process on the host: ``invalidate`` appends a
+    byte to a shared generation file and each lookup compares that file's
+    stat with the last one seen, clearing the local entries on a change (API
+    workers, job workers and the daemon each hold their own copy).
+    """
+
+    MAX_GENERATION_FILE_SIZE = 64 * 1024
+
+    def __init__(self, ttl=None, max_entries=None, generation_file=None):
+        self.ttl = config.RESPONSE_CACHE_TTL if ttl is None else ttl
+        self.max_entries = max_entries or config.RESPONSE_CACHE_MAX_ENTRIES
+        self.generation_file = (
+            generation_file
+            or config.RESPONSE_CACHE_GENERATION_FILE
+            or _default_generation_file()
+        )
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._generation = self._read_generation()
+
+    def _read_generation(self):
+        if self.generation_file is None:
+            return None
+        try:
+            stat = os.stat(self.generation_file)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def _sync(self):
+        # Called with the lock held
+        generation = self._read_generation()
+        if generation != self._generation:
+            self._entries.clear()
+            self._generation = generation
+
+    def get(self, key: str):
+        with self._lock:
+            self._sync()
+            entry = self._entries.get(key)
+            if entry and time.monotonic() - entry.stored_at < self.ttl:
+                return entry
+            return None
+
+    def revalidate(self, key: str, etag: str):
+        """The stale entry for ``key`` if its ETag still matches, refreshed."""
+        with self._lock:
+            self._sync()
+            entry = self._entries.get(key)
+            if entry is None or entry.etag != etag:
+                return None
+            entry.stored_at = time.monotonic()
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, etag: str, body: bytes) -> CachedResponse:
+        entry = CachedResponse(etag, body)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+            if self.generation_file is None:
+                return
+            try:
+                size = os.path.getsize(self.generation_file)
+            except OSError:
+                size = 0
+            try:
+                # Growing (or, past the cap, shrinking) changes the stat
+                mode = "ab" if size < self.MAX_GENERATION_FILE_SIZE else "wb"
+                with open(self.generation_file, mode) as f:
+                    f.write(b".")
+            except OSError:
+                pass
+            self._generation = self._read_generation()
+
+
+response_cache = ResponseCache()
+
+
+def make_etag(key: str, state) -> str:
+    """Strong ETag for the resource at ``key`` in the given last-modified state."""
+    digest = hashlib.sha1(f"{key}|{state!r}".encode("utf-8")).hexdigest()
+    return f'"{digest}"'
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = {tag.strip() for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def _accepted_encoding(request: Request, size: int):
+    if size < config.GZIP_MINIMUM_SIZE:
+        return None
+    accepted = request.headers.get("accept-encoding", "")
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def cached_json_response(
+    request: Request, state: Callable[[], object], build: Callable[[], object]
+) -> Response:
+    """Serve ``build()`` as JSON with ETag/304 handling and the response cache.
+
+    ``state`` returns the resource's last-modified state (e.g. status and last
+    log timestamp); it is only called once the cached entry's TTL has expired,
+    and ``build`` only when that state has changed.
+    """
+    key = request.url.path + ("?" + request.url.query if request.url.query else "")
+    entry = response_cache.get(key)
+    if entry is None:
+        etag = make_etag(key, state())
+        if _not_modified(request, etag):
+            return Response(
+                status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
+            )
+        entry = response_cache.revalidate(key, etag)
+        if entry is None:
+            body = json.dumps(
+                jsonable_encoder(build()), ensure_ascii=False, separators=(",", ":")
+            ).encode("utf-8")
+            entry = response_cache.put(key, etag, body)
+
+    headers = {
+        "ETag": entry.etag,
+        "Cache-Control": CACHE_CONTROL,
+        "Vary": "Accept-Encoding",
+    }
+    if _not_modified(request, entry.etag):
+        return Response(status_code=304, headers=headers)
+
+    encoding = _accepted_encoding(request, len(entry.body))
+    if encoding:
+        headers["Content-Encoding"] = encoding
+        return Response(
+            entry.encoded(encoding), media_type="application/json", headers=headers
+        )
+    return Response(entry.body, media_type="application/json", headers=headers)
@@ -3,137 +3,360 @@
 🔥 ROBO-ACTIVIST STARTUP ORCHESTRATOR 🔥
 Unified startup script for democratic transparency platform
 Handles service initialization, health checks, and graceful startup
+
+Every service runs as a supervised child process:
+- readiness: HTTP services are probed (backend /health_check, Streamlit
+  /_stcore/health) and the next service starts once the previous one is
+  ready; cold-start-to-ready time is logged
+- restarts: a crashed child is restarted with exponential backoff, reset
+  once it has stayed up for SUPERVISOR_STABLE_SECONDS
+- shutdown: SIGTERM/SIGINT stop the children in reverse order with
+  SIGTERM, then SIGKILL after SUPERVISOR_GRACE_SECONDS
+- limits: optional SERVICE_MEMORY_LIMIT_MB address-space cap per child
+
+Process groups and the memory cap are POSIX-only. On Windows each child is
+stopped with terminate()/kill() and runs without a memory cap.
 """
 
-import asyncio
+import argparse
 import logging
-import multiprocessing
 import os
 import signal
+import subprocess
 import sys
 import time
+import urllib.request
 from pathlib import Path
 
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+POSIX = os.name == "posix"
+
 # Configure logging
 logging.basicConfig(
-    level=logging.INFO,
-    format='🚀 %(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    level=logging.INFO, format="🚀 %(asctime)s - %(name)s - %(levelname)s - %(message)s"
 )
 logger = logging.getLogger("GacetaChat-Startup")
 
+API_PORT = int(os.getenv("API_PORT", "8050"))
+FRONTEND_PORT = int(os.getenv("FRONTEND_PORT", "8512"))
+API_WORKERS = int(os.getenv("API_WORKERS", "1"))
+READY_TIMEOUT_SECONDS = float(os.getenv("READY_TIMEOUT_SECONDS", "60"))
+RESTART_BACKOFF_SECONDS = float(os.getenv("RESTART_BACKOFF_SECONDS", "1"))
+RESTART_BACKOFF_MAX_SECONDS = float(os.getenv("RESTART_BACKOFF_MAX_SECONDS", "60"))
+SUPERVISOR_STABLE_SECONDS = float(os.getenv("SUPERVISOR_STABLE_SECONDS", "60"))
+SUPERVISOR_GRACE_SECONDS = float(os.getenv("SUPERVISOR_GRACE_SECONDS", "10"))
+SERVICE_MEMORY_LIMIT_MB = int(os.getenv("SERVICE_MEMORY_LIMIT_MB", "0"))
+
+
 def check_environment():
     """Validate critical environment variables and dependencies"""
     logger.info("🔍 ENVIRONMENT VALIDATION STARTING...")
-    
-    required_env = [
-        "OPENAI_API_KEY"
-    ]
-    
+
+    required_env = ["OPENAI_API_KEY"]
+
     missing = []
     for env_var in required_env:
         if not os.getenv(env_var):
             missing.append(env_var)
-    
+
     if missing:
         logger.error(f"❌ MISSING ENVIRONMENT VARIABLES: {missing}")
         logger.error("💡 Copy .env.example to .env and configure!")
         sys.exit(1)
-    
+
     # Check critical files
     critical_files = [
         "fastapp.py",
-        "streamlit_app.py", 
+        "streamlit_app.py",
         "download_gaceta.py",
+        "jobs.py",
         "models.py",
-        "db.py"
+        "db.py",
     ]
-    
+
     for file in critical_files:
         if not Path(file).exists():
             logger.error(f"❌ MISSING CRITICAL FILE: {file}")
             sys.exit(1)
-    
+
     logger.info("✅ ENVIRONMENT VALIDATION PASSED!")
 
-def start_backend():
-    """Start FastAPI backend server"""
-    logger.info("🔧 STARTING FASTAPI BACKEND...")
-    os.system("python -m uvicorn fastapp:app --host 0.0.0.0 --port 8050")
 
-def start_frontend():
-    """Start Streamlit frontend server"""
-    logger.info("🎨 STARTING STREAMLIT FRONTEND...")
-    os.system("streamlit run streamlit_app.py --server.port 8512 --server.address 0.0.0.0")
+def probe(url, timeout=2.0):
+    """True if ``url`` answers 2xx."""
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            return 200 <= response.status < 300
+    except Exception:
+        return False
+
+
+def _limit_memory():
+    # Runs in the child between fork and exec
+    limit = SERVICE_MEMORY_LIMIT_MB * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+class ManagedService:
+    """A supervised child: its command, readiness URL and restart state."""
+
+    def __init__(self, name, command, ready_url=None):
+        self.name = name
+        self.command = command
+        self.ready_url = ready_url
+        self.process = None
+        self.started_at = None
+        self.ready = False
+        self.ready_at = None
+        self.failures = 0
+        self.restart_at = None
+
+    def spawn(self):
+        options = {}
+        if POSIX:
+            # Own process group: terminal signals go to the supervisor only,
+            # and stopping the group also stops uvicorn/streamlit children
+            options["start_new_session"] = True
+            if SERVICE_MEMORY_LIMIT_MB > 0 and resource is not None:
+                options["preexec_fn"] = _limit_memory
+        self.process = subprocess.Popen(self.command, **options)
+        self.started_at = time.monotonic()
+        self.ready = self.ready_url is None
+        self.restart_at = None
+        logger.info(f"▶️ {self.name} started (pid {self.process.pid})")
+
+    def check_ready(self):
+        """Probe once; logs the cold-start-to-ready time on the first success."""
+        if not self.ready and probe(self.ready_url):
+            self.ready = True
+            self.ready_at = time.monotonic()
+            elapsed = self.ready_at - self.started_at
+            logger.info(f"✅ {self.name} ready in {elapsed:.2f}s")
+        return self.ready
+
+    def wait_ready(self, timeout=None):
+        timeout = timeout or READY_TIMEOUT_SECONDS
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None or self.check_ready():
+                return self.ready
+            time.sleep(0.25)
+        logger.warning(f"⚠️ {self.name} not ready after {timeout:.0f}s")
+        return False
+
+    def terminate(self):
+        """SIGTERM the service's process group (Windows: the process only)."""
+        if POSIX:
+            self._signal_group(signal.SIGTERM)
+        else:
+            self.process.terminate()
+
+    def kill(self):
+        if POSIX:
+            self._signal_group(signal.SIGKILL)
+        else:
+            self.process.kill()
+
+    def _signal_group(self, signum):
+        try:
+            os.killpg(self.process.pid, signum)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+
+class Supervisor:
+    """Starts services in order, restarts crashed ones, stops them on signal."""
+
+    def __init__(self, services, poll_interval=1.0):
+        self.services = services
+        self.poll_interval = poll_interval
+        self.stopping = False
+
+    def start_all(self):
+        started = time.monotonic()
+        for service in self.services:
+            service.spawn()
+            # Dependents start once the previous HTTP service answers
+            if service.ready_url:
+                service.wait_ready()
+        logger.info(f"🎯 ALL SERVICES STARTED in {time.monotonic() - started:.2f}s")
+
+    def _backoff(self, service):
+        return min(
+            RESTART_BACKOFF_SECONDS * 2**service.failures, RESTART_BACKOFF_MAX_SECONDS
+        )
+
+    def poll_once(self):
+        now = time.monotonic()
+        for service in self.services:
+            if service.restart_at is not None:
+                if now >= service.restart_at:
+                    service.spawn()
+                continue
+
+            code = service.process.poll()
+            if code is None:
+                if service.ready_url:
+                    service.check_ready()
+                continue
+
+            if now - service.started_at >= SUPERVISOR_STABLE_SECONDS:
+                service.failures = 0
+            delay = self._backoff(service)
+            service.failures += 1
+            service.restart_at = now + delay
+            logger.error(
+                f"💥 {service.name} exited with {code}; restarting in {delay:.0f}s"
+            )
+
+    def stop(self, *_):
+        self.stopping = True
+
+    def shutdown(self):
+        logger.info("🛑 SHUTTING DOWN GRACEFULLY...")
+        running = [
+            s for s in reversed(self.services) if s.process and s.process.poll() is None
+        ]
+        for service in running:
+            service.terminate()
+        deadline = time.monotonic() + SUPERVISOR_GRACE_SECONDS
+        for service in running:
+            try:
+                service.process.wait(max(0.0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                logger.warning(f"⚠️ {service.name} ignored SIGTERM; killing")
+                service.kill()
+                service.process.wait()
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        try:
+            self.start_all()
+            while not self.stopping:
+                self.poll_once()
+                time.sleep(self.poll_interval)
+        finally:
+            self.shutdown()
+
+
+def backend_service(workers=None):
+    """FastAPI backend; more than one worker runs uvicorn's multi-process mode"""
+    workers = workers or API_WORKERS
+    command = [
+        sys.executable,
+        "-m",
+        "uvicorn",
+        "fastapp:app",
+        "--host",
+        "0.0.0.0",
+        "--port",
+        str(API_PORT),
+    ]
+    if workers > 1:
+        command += ["--workers", str(workers)]
+    return ManagedService(
+        "🔧 backend", command, f"http://127.0.0.1:{API_PORT}/health_check"
+    )
+
+
+def frontend_service():
+    """Streamlit frontend"""
+    command = [
+        sys.executable,
+        "-m",
+        "streamlit",
+        "run",
+        "streamlit_app.py",
+        "--server.port",
+        str(FRONTEND_PORT),
+        "--server.address",
+        "0.0.0.0",
+        "--server.headless",
+        "true",
+    ]
+    return ManagedService(
+        "🎨 frontend", command, f"http://127.0.0.1:{FRONTEND_PORT}/_stcore/health"
+    )
+
+
+def pdf_processor_service():
+    """PDF ingestion daemon"""
+    return ManagedService("📄 processor", [sys.executable, "download_gaceta.py"])
+
+
+def job_workers_service():
+    """Job queue workers (indexing, prompt runs, UI re-runs)"""
+    workers = os.getenv("JOB_WORKERS", "2")
+    return ManagedService(
+        "⚙️ workers", [sys.executable, "jobs.py", "--workers", workers]
+    )
+
+
+def build_services(mode, api_workers=None):
+    if mode == "backend":
+        return [backend_service(api_workers)]
+    if mode == "frontend":
+        return [frontend_service()]
+    if mode == "processor":
+        return [pdf_processor_service()]
+    if mode == "workers":
+        return [job_workers_service()]
+
+    services = [backend_service(api_workers), frontend_service()]
+    # PDF processor (optional in container)
+    if os.getenv("ENABLE_PDF_PROCESSOR", "true").lower() == "true":
+        services.append(pdf_processor_service())
+    # The daemon and the UI only queue jobs; these run them
+    services.append(job_workers_service())
+    return services
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Start GacetaChat services")
+    parser.add_argument(
+        "--mode",
+        choices=["all", "backend", "frontend", "processor", "workers"],
+        default=os.getenv("STARTUP_MODE", "all"),
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=API_WORKERS,
+        help="uvicorn worker processes for the backend (API_WORKERS)",
+    )
+    return parser.parse_args(argv)
 
-def start_pdf_processor():
-    """Start PDF processing daemon"""
-    logger.info("📄 STARTING PDF PROCESSOR...")
-    os.system("python download_gaceta.py")
 
 def main():
     """Main startup orchestrator"""
+    args = parse_args()
     logger.info("🔥 ROBO-ACTIVIST DEMOCRATIC TRANSPARENCY PLATFORM STARTING 🔥")
-    
+
     # Environment validation
     check_environment()
-    
+
     # Initialize database
     logger.info("🗄️ INITIALIZING DATABASE...")
     try:
-        from models import Base
-        from db import engine
-        Base.metadata.create_all(engine)
+        from models import init_db
+
+        init_db()
         logger.info("✅ DATABASE INITIALIZED")
     except Exception as e:
         logger.error(f"❌ DATABASE INITIALIZATION FAILED: {e}")
         sys.exit(1)
-    
+
     # Determine startup mode
-    mode = os.getenv("STARTUP_MODE", "all")
-    
-    if mode == "backend":
-        start_backend()
-    elif mode == "frontend":
-        start_frontend()
-    elif mode == "processor":
-        start_pdf_processor()
-    else:
-        # Start all services in parallel
-        logger.info("🚀 STARTING ALL SERVICES IN PARALLEL...")
-        
-        processes = []
-        
-        # Backend process
-        backend_process = multiprocessing.Process(target=start_backend)
-        backend_process.start()
-        processes.append(backend_process)
-        
-        time.sleep(3)  # Let backend start first
-        
-        # Frontend process  
-        frontend_process = multiprocessing.Process(target=start_frontend)
-        frontend_process.start()
-        processes.append(frontend_process)
-        
-        # PDF processor (optional in container)
-        if os.getenv("ENABLE_PDF_PROCESSOR", "true").lower() == "true":
-            pdf_process = multiprocessing.Process(target=start_pdf_processor)
-            pdf_process.start()
-            processes.append(pdf_process)
-        
-        logger.info("🎯 ALL SERVICES STARTED! Democratic transparency is ONLINE!")
-        logger.info("🌐 Frontend: http://localhost:8512")
-        logger.info("⚡ Backend: http://localhost:8050")
-        
-        # Wait for processes
-        try:
-            for process in processes:
-                process.join()
-        except KeyboardInterrupt:
-            logger.info("🛑 SHUTTING DOWN GRACEFULLY...")
-            for process in processes:
-                process.terminate()
-                process.join()
+    logger.info(f"🚀 STARTING SERVICES (mode: {args.mode})...")
+    logger.info(f"🌐 Frontend: http://localhost:{FRONTEND_PORT}")
+    logger.info(f"⚡ Backend: http://localhost:{API_PORT} ({args.workers} workers)")
+    Supervisor(build_services(args.mode, args.workers)).run()
+
 
 if __name__ == "__main__":
     main()
@@ -47,24 +47,24 @@
 
 🔒 Security Considerations:
     ⚠️  HIGH RISK: API key stored in environment variables
-    ⚠️  MEDIUM: No request timeout handling
     ⚠️  MEDIUM: No input validation on user data
     ⚠️  LOW: HTTP only (no HTTPS in development)
 
 🛡️ Risk Analysis:
     • API Key Exposure: Use secure secret management
-    • Request Timeout: Add timeout parameters to all requests
     • Data Validation: Sanitize user inputs before API calls
     • Error Handling: Improve exception handling patterns
 
 ⚡ Performance Notes:
-    • Synchronous HTTP calls block Streamlit UI
-    • No caching for frequently accessed data
-    • Consider async patterns for better UX
+    • One pooled keep-alive session (ApiClient) with (connect, read) timeouts
+    • GET results memoized for MEMO_TTL seconds, then revalidated with
+      If-None-Match (unchanged execution session data comes back as a 304)
+    • bootstrap() fetches a page's reads in one /bootstrap round trip
 
 📚 Usage Example:
     ```python
-    # Get execution session
+    # Prefetch the page, then read from the memo
+    bootstrap("2024-07-19")
     session = get_execution_session_by_date("2024-07-19")
 
     # Post tweet with error handling
@@ -82,83 +82,182 @@ Author: GacetaChat Team | Version: 1.0.0 | Last Updated: 2025-07-19
 """
 
 import os
+import threading
+import time
 
 import requests
+from requests.adapters import HTTPAdapter
 
 API_URL = "http://localhost:8050/"
 APP_SECRET_API_KEY = os.environ.get("APP_SECRET_API_KEY")
+REQUEST_TIMEOUT = (3.05, 30)  # (connect, read) seconds
+MEMO_TTL = 5  # seconds a GET result is reused without asking the backend
+
+
+class ApiClient:
+    """Pooled HTTP client for the FastAPI backend.
+
+    Every helper shares one keep-alive connection pool. GET results are
+    memoized for ``memo_ttl`` seconds, so the repeated reads of a Streamlit
+    rerun cost nothing; after that they are revalidated with If-None-Match,
+    and an unchanged resource comes back as a bodyless 304.
+    """
+
+    def __init__(
+        self,
+        base_url=API_URL,
+        api_key=APP_SECRET_API_KEY,
+        timeout=REQUEST_TIMEOUT,
+        memo_ttl=MEMO_TTL,
+        pool_size=10,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.memo_ttl = memo_ttl
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["X-API-KEY"] = api_key
+        self._lock = threading.Lock()
+        self._memo = {}  # key -> (expires_at, value)
+        self._validators = {}  # key -> (etag, value)
+
+    @staticmethod
+    def _key(path, params=None):
+        return path, tuple(sorted((params or {}).items()))
+
+    def remember(self, path, params, value):
+        with self._lock:
+            self._memo[self._key(path, params)] = (
+                time.monotonic() + self.memo_ttl,
+                value,
+            )
+
+    def forget(self, path=None):
+        with self._lock:
+            for key in [k for k in self._memo if path is None or k[0] == path]:
+                del self._memo[key]
+
+    def request(self, method, path, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.request(method, self.base_url + path, **kwargs)
+
+    def get_json(self, path, params=None, error="Request failed."):
+        key = self._key(path, params)
+        with self._lock:
+            memo = self._memo.get(key)
+            if memo and memo[0] > time.monotonic():
+                return memo[1]
+            validator = self._validators.get(key)
+
+        headers = {"If-None-Match": validator[0]} if validator else None
+        response = self.request("GET", path, params=params, headers=headers)
+        if response.status_code == 304 and validator:
+            value = validator[1]
+        elif response.status_code == 200:
+            value = response.json()
+            if "ETag" in response.headers:
+                with self._lock:
+                    self._validators[key] = (response.headers["ETag"], value)
+        else:
+            raise Exception(error)
+
+        self.remember(path, params, value)
+        return value
+
+
+client = ApiClient()
 
 
 def get_execution_session_by_date(date):
-    response = requests.get(
-        f"{API_URL}/execution_session_by_date/",
-        params={"date": date},
-        headers={"X-API-KEY": APP_SECRET_API_KEY},
+    return client.get_json(
+        "/execution_session_by_date/",
+        {"date": date},
+        "Failed to get execution session for the given date.",
     )
-    if response.status_code == 200:
-        return response.json()
-    else:
-        raise Exception(
-            "Failed to get execution session for the given date.",
-            headers={"X-API-KEY": APP_SECRET_API_KEY},
-        )
 
 
 def list_available_index_days():
-    response = requests.get(
-        f"{API_URL}/execution_session/available",
-        headers={"X-API-KEY": APP_SECRET_API_KEY},
+    return client.get_json(
+        "/execution_session/available/", error="Failed to list available index days."
     )
-    if response.status_code == 200:
-        return response.json()
-    else:
-        raise Exception("Failed to list available index days.")
 
 
 def get_last_execution_session(session_id):
-    response = requests.get(
-        f"{API_URL}/execution_session/",
-        params={"session_id": session_id},
-        headers={"X-API-KEY": APP_SECRET_API_KEY},
+    return client.get_json(
+        "/execution_session/",
+        {"session_id": session_id},
+        "Failed to display last execution session.",
     )
-    if response.status_code == 200:
-        return response.json()
-    else:
-        raise Exception("Failed to display last execution session.")
 
 
 def fetch_recent_exec_logs(limit=3):
-    response = requests.get(
-        f"{API_URL}/content_logs/?limit={limit}",
-        headers={"X-API-KEY": APP_SECRET_API_KEY},
+    return client.get_json(
+        "/content_logs/", {"limit": limit}, "Failed to load execution logs."
     )
-    if response.status_code == 200:
-        return response.json()
-    else:
-        raise Exception("Failed to load execution logs.")
 
 
 def check_global_limit():
-    response = requests.get(
-        f"{API_URL}/check_global_limit/", headers={"X-API-KEY": APP_SECRET_API_KEY}
-    )
-    if response.status_code == 200:
-        return response.json()["allowed"]
-    else:
-        raise Exception("Failed to check global query limit.")
+    return client.get_json(
+        "/check_global_limit/", error="Failed to check global query limit."
+    )["allowed"]
 
 
 def increment_global_query_count():
-    response = requests.post(
-        f"{API_URL}/increment_global_query_count/",
-        headers={"X-API-KEY": APP_SECRET_API_KEY},
-    )
+    """Take one of today's global queries; False once the cap is reached."""
+    response = client.request("POST", "/increment_global_query_count/")
+    client.forget("/check_global_limit/")
     if response.status_code == 200:
         return response.json()["success"]
+    elif response.status_code == 429:
+        return False
     else:
         raise Exception("Failed to increment global query count.")
 
 
+def release_global_query_count():
+    response = client.request("POST", "/release_global_query_count/")
+    client.forget("/check_global_limit/")
+    if response.status_code == 200:
+        return response.json()["success"]
+    else:
+        raise Exception("Failed to release global query count.")
+
+
+def get_answer_cache_stats(date=None):
+    return client.get_json(
+        "/answer_cache/stats/",
+        {"date": date} if date else None,
+        "Failed to load answer cache stats.",
+    )
+
+
+def bootstrap(date=None, logs_limit=3):
+    """Prefetch what a page render reads with a single /bootstrap request.
+
+    The parts are memoized under the same keys the helpers above use, so the
+    page's usual calls are then answered without further round trips.
+    """
+    params = {"logs_limit": logs_limit}
+    if date:
+        params["date"] = date
+    page = client.get_json("/bootstrap", params, "Failed to load page data.")
+
+    client.remember("/execution_session/available/", None, page["available_days"])
+    if page["execution_sessions"]:
+        client.remember(
+            "/execution_session_by_date/", {"date": date}, page["execution_sessions"]
+        )
+    for session_id, logs in page["session_logs"].items():
+        client.remember("/execution_session/", {"session_id": session_id}, logs)
+    if logs_limit:
+        client.remember("/content_logs/", {"limit": logs_limit}, page["recent_logs"])
+    client.remember("/check_global_limit/", None, page["global_limit"])
+    client.remember("/answer_cache/stats/", None, page["answer_cache_stats"])
+    return page
+
+
 import streamlit as st
 
 
@@ -168,9 +267,7 @@ def authenticate():
     st.write("Click the button below to authenticate the bot account.")
 
     if st.button("Authenticate with Twitter"):
-        response = requests.get(
-            f"{API_URL}/twitter/login", headers={"X-API-KEY": APP_SECRET_API_KEY}
-        )
+        response = client.request("GET", "/twitter/login")
         if response.status_code == 200 or response.status_code == 400:
             auth_url = response.url
             st.write(f"[Authenticate with Twitter]({auth_url})")
@@ -184,8 +281,9 @@ def post_tweet_form():
     tweet_text = st.text_area("Enter your tweet:")
 
     if st.button("Post Tweet"):
-        response = requests.post(
-            f"{API_URL}/twitter/tweet",
+        response = client.request(
+            "POST",
+            "/twitter/tweet",
             params={
                 "tweet_text": tweet_text,
             },
@@ -199,19 +297,19 @@ def post_tweet_form():
 
 
 def get_gacetas(endpoint, params=None):
-    response = requests.get(
-        f"{API_URL}{endpoint}", params=params, headers={"X-API-KEY": APP_SECRET_API_KEY}
-    )
-    return response
+    return client.request("GET", endpoint, params=params)
 
 
 def list_gacetas():
     st.title("Gacetas List")
-    response = get_gacetas("/gacetas", params={"order": "desc"})
+    params = {"order": "desc"}
+    if st.session_state.get("gacetas_cursor"):
+        params["cursor"] = st.session_state["gacetas_cursor"]
+    response = get_gacetas("/gacetas", params=params)
 
-    # response = requests.get(f"{API_URL}/gacetas", headers={"X-API-KEY": APP_SECRET_API_KEY})
     if response.status_code == 200:
         gacetas = response.json().get("gacetas", [])
+        next_cursor = response.json().get("next_cursor")
         for gacet in gacetas:
             gaceta = gacet["gaceta"]
             twitter_prompts = gacet["twitter_prompts"]
@@ -276,6 +374,12 @@ def list_gacetas():
                         )
 
         st.divider()
+        if st.session_state.get("gacetas_cursor") and st.button("Newest gacetas"):
+            st.session_state["gacetas_cursor"] = None
+            st.rerun()
+        if next_cursor and st.button("Older gacetas"):
+            st.session_state["gacetas_cursor"] = next_cursor
+            st.rerun()
         #     generate_prompt(gaceta['id'])
         # if st.button("Approve Tweet", key=f"approve_{gaceta['id']}"):
         #     approve_tweet(gaceta['id'])
@@ -284,9 +388,9 @@ def list_gacetas():
 
 
 def approve_tweet(gaceta_id, content_exec_id, tweet_text):
-    response = requests.post(
-        f"{API_URL}/approve_tweet",
-        headers={"X-API-KEY": APP_SECRET_API_KEY},
+    response = client.request(
+        "POST",
+        "/approve_tweet",
         json={
             "gaceta_id": gaceta_id,
             "content_exec_id": content_exec_id,
@@ -300,9 +404,7 @@ def approve_tweet(gaceta_id, content_exec_id, tweet_text):
 
 
 def get_me():
-    response = requests.get(
-        f"{API_URL}/twitter/me", headers={"X-API-KEY": APP_SECRET_API_KEY}
-    )
+    response = client.request("GET", "/twitter/me")
     if response.status_code == 200:
         user = response.json()
         st.write(f"User ID: {user['id']}")
@@ -314,9 +416,7 @@ def get_me():
 
 def check_health():
     try:
-        response = requests.get(
-            f"{API_URL}/health_check", headers={"X-API-KEY": APP_SECRET_API_KEY}
-        )
+        response = client.request("GET", "/health_check", timeout=3.05)
         if response.status_code == 200:
             return True
         else:
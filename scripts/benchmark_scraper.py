@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark for the daily scraper (scrape_and_summarize.py).
+
+Generates synthetic gazette-like PDFs (10, 100 and 300 pages by default),
+serves them from a local HTTP fixture server that mimics the Imprenta
+Nacional homepage, and runs the real scraper main() against it with a
+deterministic fake call_ai_model. Per-stage wall/CPU time, bytes and
+throughput come from the scraper's own telemetry spans; each size runs in
+a fresh process so its peak RSS is its own.
+
+Usage:
+    python scripts/benchmark_scraper.py
+    python scripts/benchmark_scraper.py --pages 10,100 --threshold 0.5
+    python scripts/benchmark_scraper.py --update-baseline
+
+Results are compared against scripts/benchmark_baseline.json: a stage that
+is more than --threshold slower (and at least NOISE_FLOOR_S slower in
+absolute terms), or a peak RSS that grew by more than --threshold, is a
+regression and the script exits with status 1.
+
+Requirements:
+    pip install -r requirements-scraper.txt
+    (header images also need poppler-utils; without it that stage fails
+    fast and is reported as ok=false)
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import scrape_and_summarize as scraper  # noqa: E402
+from pypdf import PdfWriter  # noqa: E402
+from pypdf.generic import (  # noqa: E402
+    DecodedStreamObject,
+    DictionaryObject,
+    NameObject,
+)
+
+# Configuration
+DEFAULT_PAGES = [10, 100, 300]
+BASELINE_FILE = Path(__file__).parent / "benchmark_baseline.json"
+DEFAULT_THRESHOLD = 0.25  # 25% slower / bigger = regression
+NOISE_FLOOR_S = 0.05  # ignore stage slowdowns smaller than this
+NOISE_FLOOR_MB = 10
+PDF_PATH = "/pub/2025/11/12/COMP_12_11_2025.pdf"
+LINES_PER_PAGE = 60
+PER_PAGE_STAGES = {"extract_text_from_pdf"}
+
+INSTITUTIONS = [
+    "MINISTERIO DE AMBIENTE Y ENERGÍA",
+    "MINISTERIO DE HACIENDA",
+    "CAJA COSTARRICENSE DE SEGURO SOCIAL",
+    "MINISTERIO DE EDUCACIÓN PÚBLICA",
+    "MUNICIPALIDAD DE NANDAYURE",
+    "ASAMBLEA LEGISLATIVA",
+]
+SECTIONS = ["PODER EJECUTIVO", "DECRETOS", "REGLAMENTOS", "AVISOS", "NOTIFICACIONES"]
+CLAUSES = [
+    "El presente decreto tiene por objeto regular el uso de los recursos públicos",
+    "Se autoriza la donación de un terreno para el salón comunal del distrito",
+    "Rige a partir de su publicación en el Diario Oficial La Gaceta",
+    "Se reforma el artículo 12 del Reglamento a la Ley de Contratación Pública",
+    "La tarifa aplicable a las pequeñas y medianas empresas será del trece por ciento",
+    "Publíquese en el Diario Oficial y comuníquese a las instituciones competentes",
+]
+
+
+# ===== Synthetic gazette =====
+
+
+def _pdf_string(text):
+    escaped = text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+    return escaped.encode("cp1252", errors="replace")
+
+
+def gazette_page_lines(page_num, rng):
+    """Deterministic, gazette-like text for one page"""
+    lines = [f"La Gaceta Nº 213 — Miércoles 12 de noviembre del 2025 — Pág {page_num}"]
+    while len(lines) < LINES_PER_PAGE:
+        lines.append(rng.choice(SECTIONS))
+        lines.append(f"N° {rng.randint(1000, 49999)}-{rng.choice(INSTITUTIONS)}")
+        for article in range(1, rng.randint(3, 7)):
+            lines.append(f"Artículo {article}°—{rng.choice(CLAUSES)}.")
+    return lines[:LINES_PER_PAGE]
+
+
+def make_gazette_pdf(pages, seed=213):
+    """Bytes of a ``pages``-page PDF with extractable Spanish legal text"""
+    rng = random.Random(seed)
+    writer = PdfWriter()
+    font = writer._add_object(
+        DictionaryObject(
+            {
+                NameObject("/Type"): NameObject("/Font"),
+                NameObject("/Subtype"): NameObject("/Type1"),
+                NameObject("/BaseFont"): NameObject("/Helvetica"),
+                NameObject("/Encoding"): NameObject("/WinAnsiEncoding"),
+            }
+        )
+    )
+    resources = DictionaryObject(
+        {NameObject("/Font"): DictionaryObject({NameObject("/F1"): font})}
+    )
+    for page_num in range(1, pages + 1):
+        content = [b"BT /F1 8 Tf 11 TL 40 770 Td"]
+        for line in gazette_page_lines(page_num, rng):
+            content.append(b"(" + _pdf_string(line) + b") Tj T*")
+        content.append(b"ET")
+        stream = DecodedStreamObject()
+        stream.set_data(b"\n".join(content))
+
+        page = writer.add_blank_page(612, 792)
+        page[NameObject("/Resources")] = resources
+        page[NameObject("/Contents")] = writer._add_object(stream)
+        page.compress_content_streams()
+
+    out = io.BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+
+# ===== Fixture server =====
+
+
+def homepage_html():
+    return (
+        "<html><body><h1>La Gaceta</h1>"
+        f'<a id="ctl00_PdfGacetaDescargarHyperLink" href="{PDF_PATH}">Descargar</a>'
+        "</body></html>"
+    ).encode("utf-8")
+
+
+@contextlib.contextmanager
+def fixture_server(pdf_bytes):
+    """Serve /gaceta/ and the PDF on localhost; yields the base URL"""
+    routes = {
+        "/gaceta/": ("text/html; charset=utf-8", homepage_html()),
+        PDF_PATH: ("application/pdf", pdf_bytes),
+    }
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path not in routes:
+                self.send_error(404)
+                return
+            content_type, body = routes[self.path]
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+# ===== Fake AI provider =====
+
+
+def make_fake_call_ai_model(latency_s=0.0):
+    """Deterministic stand-in for call_ai_model (same signature and spans)"""
+
+    seen_prefixes = set()
+
+    @scraper.traced
+    def call_ai_model(
+        prompt, system_message=None, cached_prefix=None, response_schema=None
+    ):
+        time.sleep(latency_s)
+        # Provider-style prefix cache: a repeated prefix is served from cache
+        cached_tokens = len(cached_prefix or "") // 4
+        if cached_prefix not in seen_prefixes:
+            seen_prefixes.add(cached_prefix)
+            cached_tokens = 0
+        prompt = (cached_prefix or "") + prompt
+        pages = sorted({int(n) for n in re.findall(r"\[PÁGINA (\d+)\]", prompt)})
+        picks = pages[:: max(1, len(pages) // 5)][:5] or [1]
+
+        def version(summary, topics):
+            bullets = [
+                {"icon": "⚖️", "text": f"{summary} (página {p})", "pages": [p]}
+                for p in picks
+            ]
+            return {"summary": summary, "bullets": bullets, "topics": topics}
+
+        result = json.dumps(
+            {
+                "es": version("Resumen sintético", ["Legal", "Fiscal"]),
+                "en": version("Synthetic summary", ["Legal", "Fiscal"]),
+            },
+            ensure_ascii=False,
+        )
+        usage = scraper._usage(len(prompt) // 4, len(result) // 4, cached_tokens)
+        scraper._annotate_usage(usage)
+        return result, usage
+
+    return call_ai_model
+
+
+# ===== Benchmark =====
+
+
+@contextlib.contextmanager
+def patched_scraper(base_url, data_dir, call_ai_model):
+    overrides = {
+        "GACETA_BASE_URL": base_url,
+        "DATA_DIR": data_dir,
+        "SUMMARIES_FILE": data_dir / "summaries.json",
+        "IMAGES_DIR": data_dir / "header_images",
+        "TELEMETRY_FILE": data_dir / "telemetry.jsonl",
+        "call_ai_model": call_ai_model,
+    }
+    saved = {name: getattr(scraper, name) for name in overrides}
+    for name, value in overrides.items():
+        setattr(scraper, name, value)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(scraper, name, value)
+
+
+def stage_metrics(spans, pages):
+    stages = {}
+    for span in spans:
+        wall = span["wall_s"]
+        stage = {
+            "ok": span["ok"],
+            "wall_s": wall,
+            "cpu_s": span["cpu_s"],
+            "bytes": span["bytes"],
+        }
+        if span["span"] in PER_PAGE_STAGES and wall:
+            stage["pages_per_s"] = round(pages / wall, 1)
+        if isinstance(span["bytes"], int) and wall:
+            stage["mb_per_s"] = round(span["bytes"] / wall / 1e6, 2)
+        if span["tokens"]:
+            stage["tokens"] = span["tokens"]
+        stages[span["span"]] = stage
+    return stages
+
+
+def run_benchmark(pages, llm_latency_s=0.0, quiet=True):
+    """Run the full scraper once against a synthetic ``pages``-page gazette"""
+    started = time.perf_counter()
+    pdf_bytes = make_gazette_pdf(pages)
+    generate_s = time.perf_counter() - started
+
+    with tempfile.TemporaryDirectory() as tmp, fixture_server(pdf_bytes) as url:
+        data_dir = Path(tmp)
+        fake = make_fake_call_ai_model(llm_latency_s)
+        output = io.StringIO() if quiet else sys.stdout
+        with patched_scraper(url, data_dir, fake), contextlib.redirect_stdout(output):
+            started = time.perf_counter()
+            scraper.main()
+            total_s = time.perf_counter() - started
+
+        summaries = json.loads((data_dir / "summaries.json").read_text("utf-8"))
+
+    return {
+        "pages": pages,
+        "pdf_bytes": len(pdf_bytes),
+        "generate_s": round(generate_s, 4),
+        "total_wall_s": round(total_s, 4),
+        "pages_per_s": round(pages / total_s, 1),
+        "peak_rss_mb": scraper._peak_rss_mb(),
+        "summary_saved": "2025-11-12" in summaries,
+        "stages": stage_metrics(scraper.TELEMETRY.spans, pages),
+    }
+
+
+def run_isolated(pages, llm_latency_s=0.0):
+    """run_benchmark in a fresh interpreter, so peak RSS is per size"""
+    completed = subprocess.run(
+        [
+            sys.executable,
+            __file__,
+            "--child",
+            str(pages),
+            "--llm-latency-ms",
+            str(llm_latency_s * 1000),
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Regression messages for ``results`` against ``baseline`` (empty = OK)"""
+    regressions = []
+    for pages, result in results.items():
+        base = baseline.get("results", {}).get(str(pages))
+        if not base:
+            continue
+        for name, stage in result["stages"].items():
+            base_stage = base["stages"].get(name)
+            if not base_stage or not base_stage["ok"]:
+                continue
+            if not stage["ok"]:
+                regressions.append(f"{pages} pages / {name}: failed")
+                continue
+            slower = stage["wall_s"] - base_stage["wall_s"]
+            if (
+                stage["wall_s"] > base_stage["wall_s"] * (1 + threshold)
+                and slower > NOISE_FLOOR_S
+            ):
+                regressions.append(
+                    f"{pages} pages / {name}: {base_stage['wall_s']:.3f}s -> "
+                    f"{stage['wall_s']:.3f}s"
+                )
+        rss, base_rss = result["peak_rss_mb"], base.get("peak_rss_mb")
+        if (
+            rss
+            and base_rss
+            and rss > base_rss * (1 + threshold)
+            and rss - base_rss > NOISE_FLOOR_MB
+        ):
+            regressions.append(
+                f"{pages} pages / peak RSS: {base_rss:.0f}MB -> {rss:.0f}MB"
+            )
+    return regressions
+
+
+def failed_stages(results):
+    return [
+        f"{pages} pages / {name}"
+        for pages, result in results.items()
+        for name, stage in result["stages"].items()
+        if not stage["ok"]
+    ]
+
+
+def unbaselined_stages(results, baseline):
+    """Stages that ran but have no successful baseline to compare with"""
+    missing = set()
+    for pages, result in results.items():
+        base = baseline.get("results", {}).get(str(pages), {}).get("stages", {})
+        missing.update(
+            name for name in result["stages"] if not base.get(name, {}).get("ok")
+        )
+    return sorted(missing)
+
+
+def print_report(results):
+    for pages, result in results.items():
+        print(
+            f"\n📄 {pages} pages ({result['pdf_bytes'] / 1e6:.1f} MB): "
+            f"{result['total_wall_s']:.2f}s total, {result['pages_per_s']} pages/s, "
+            f"peak RSS {result['peak_rss_mb']} MB"
+        )
+        for name, stage in result["stages"].items():
+            rate = f"{stage['mb_per_s']} MB/s" if "mb_per_s" in stage else ""
+            if "tokens" in stage:
+                tokens = stage["tokens"]
+                rate = f"{tokens['input']:,} in / {tokens['output']:,} out tokens"
+            status = "" if stage["ok"] else " (failed)"
+            print(
+                f"   {name:<26} {stage['wall_s']:>8.3f}s wall "
+                f"{stage['cpu_s']:>8.3f}s cpu {rate}{status}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline scraper benchmark")
+    parser.add_argument(
+        "--pages", default=",".join(str(p) for p in DEFAULT_PAGES), help="e.g. 10,100"
+    )
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--llm-latency-ms", type=float, default=0)
+    parser.add_argument("--json", type=Path, help="also write the results here")
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    latency_s = args.llm_latency_ms / 1000
+
+    if args.child:
+        print(json.dumps(run_benchmark(args.child, latency_s)))
+        return
+
+    results = {
+        pages: run_isolated(pages, latency_s)
+        for pages in (int(p) for p in args.pages.split(","))
+    }
+    print_report(results)
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    if args.update_baseline:
+        failed = failed_stages(results)
+        if failed:
+            # A failed stage (e.g. create_header_image without poppler) would
+            # silently drop out of every later comparison
+            print(f"\n❌ Not saving a baseline with failed stages: {', '.join(failed)}")
+            sys.exit(1)
+        baseline = {
+            "recorded_at": datetime.now().isoformat(timespec="seconds"),
+            "machine": f"{platform.platform()} / {os.cpu_count()} cpu / "
+            f"Python {platform.python_version()}",
+            "results": {str(pages): result for pages, result in results.items()},
+        }
+        args.baseline.write_text(
+            json.dumps(baseline, indent=2, ensure_ascii=False) + "\n", encoding="utf-8"
+        )
+        print(f"\n💾 Baseline saved to {args.baseline}")
+        return
+
+    if not args.baseline.exists():
+        print(f"\n⚠️ No baseline at {args.baseline} (run with --update-baseline)")
+        return
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    regressions = compare(results, baseline, args.threshold)
+    missing = unbaselined_stages(results, baseline)
+    if missing:
+        print(f"\n⚠️ Not in the baseline, not compared: {', '.join(missing)}")
+    if regressions:
+        print(f"\n❌ Regressions over {args.threshold:.0%} vs baseline:")
+        for regression in regressions:
+            print(f"   {regression}")
+        sys.exit(1)
+    print(f"\n✅ No regressions over {args.threshold:.0%} vs baseline")
+
+
+if __name__ == "__main__":
+    main()
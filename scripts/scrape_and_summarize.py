@@ -5,21 +5,40 @@ Scrapes La Gaceta, analyzes FULL document with GPT-5-mini, saves to JSON
 
 Cost: ~$0.04 per day (OpenAI GPT-5-mini API)
 Runtime: ~2-5 minutes per day
+
+Telemetry: every stage runs inside a span that records wall time, CPU time,
+peak RSS, bytes and tokens. Spans are appended to data/telemetry.jsonl (one
+JSON object per line) and summarized in the "timings" block of each summary.
+Run with --profile (or GACETA_PROFILE=1) for a flamegraph of the whole run
+in profiles/ (see archive/v1/profiling.py).
 """
 
 import os
+import sys
 import json
+import time
+import hashlib
+import uuid
+import functools
 import requests
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from pathlib import Path
+from types import SimpleNamespace
 import pytz
 import pypdf
 from io import BytesIO
+from jsonschema import Draft202012Validator
 from openai import OpenAI
 from bs4 import BeautifulSoup
 from pdf2image import convert_from_bytes
 from PIL import Image, ImageEnhance
 
+try:
+    import resource
+except ImportError:  # Windows: no peak RSS
+    resource = None
+
 # AI Model Configuration (easy switching between providers/models)
 AI_CONFIG = {
     "provider": "openai",  # Options: "openai", "gemini", "anthropic"
@@ -29,6 +48,7 @@ AI_CONFIG = {
 
     # Pricing (for cost tracking)
     "cost_per_1m_input": 0.25,
+    "cost_per_1m_cached_input": 0.025,  # prompt-cache hits
     "cost_per_1m_output": 2.00,
 }
 
@@ -39,6 +59,7 @@ AI_CONFIG = {
 #     "temperature": 0.3,
 #     "max_tokens": 2000,
 #     "cost_per_1m_input": 0.10,
+#     "cost_per_1m_cached_input": 0.025,
 #     "cost_per_1m_output": 0.40,
 # }
 
@@ -48,8 +69,114 @@ SUMMARIES_FILE = DATA_DIR / "summaries.json"
 IMAGES_DIR = DATA_DIR / "header_images"
 MAX_SUMMARIES = 90  # Keep last 90 days
 GACETA_BASE_URL = "https://www.imprentanacional.go.cr"
+TELEMETRY_FILE = DATA_DIR / "telemetry.jsonl"
+PROFILES_DIR = DATA_DIR.parent / "profiles"  # GACETA_PROFILE=1 or --profile
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    # ru_maxrss is KiB on Linux (bytes on macOS)
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+class Telemetry:
+    """Per-run span recorder: JSON lines out, "timings" block for the summary"""
+
+    def __init__(self):
+        self.run_id = None
+        self.sink = None
+        self.spans = []
+        self._stack = []
+        self._started = time.perf_counter()
+
+    def start(self, sink=None):
+        """Begin a run; spans are appended to ``sink`` (a .jsonl path) if given"""
+        self.run_id = uuid.uuid4().hex[:12]
+        self.sink = sink
+        self.spans = []
+        self._stack = []
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def span(self, name):
+        record = {"span": name, "bytes": None, "tokens": None, "ok": True}
+        wall, cpu = time.perf_counter(), time.process_time()
+        self._stack.append(record)
+        try:
+            yield record
+        except BaseException:
+            record["ok"] = False
+            raise
+        finally:
+            self._stack.pop()
+            record["wall_s"] = round(time.perf_counter() - wall, 4)
+            record["cpu_s"] = round(time.process_time() - cpu, 4)
+            record["peak_rss_mb"] = _peak_rss_mb()
+            self._emit(record)
+
+    def annotate(self, **fields):
+        """Add ``bytes``/``tokens``/... to the innermost open span"""
+        if self._stack:
+            self._stack[-1].update(fields)
+
+    def _emit(self, record):
+        record = {"ts": datetime.now().isoformat(), "run_id": self.run_id, **record}
+        self.spans.append(record)
+        if self.sink is None:
+            return
+        try:
+            Path(self.sink).parent.mkdir(parents=True, exist_ok=True)
+            with open(self.sink, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except OSError as e:
+            print(f"⚠️ Failed to write telemetry: {e}")
+
+    def timings(self):
+        """Spans so far, aggregated per stage (retried stages are summed)"""
+        stages = {}
+        for record in self.spans:
+            stage = stages.setdefault(
+                record["span"],
+                {"calls": 0, "wall_s": 0.0, "cpu_s": 0.0, "bytes": None, "tokens": None},
+            )
+            stage["calls"] += 1
+            stage["wall_s"] = round(stage["wall_s"] + record["wall_s"], 4)
+            stage["cpu_s"] = round(stage["cpu_s"] + record["cpu_s"], 4)
+            stage["peak_rss_mb"] = record["peak_rss_mb"]
+            for key in ("bytes", "tokens"):
+                if record[key] is not None:
+                    stage[key] = _add(stage[key], record[key])
+        return {
+            "run_id": self.run_id,
+            "total_wall_s": round(time.perf_counter() - self._started, 4),
+            "peak_rss_mb": _peak_rss_mb(),
+            "stages": stages,
+        }
+
+
+def _add(total, value):
+    if isinstance(value, dict):
+        total = dict(total or {})
+        for key, item in value.items():
+            total[key] = total.get(key, 0) + item
+        return total
+    return (total or 0) + value
+
 
+TELEMETRY = Telemetry()
 
+
+def traced(func):
+    """Run ``func`` inside a telemetry span named after it"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with TELEMETRY.span(func.__name__):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+@traced
 def scrape_latest_gaceta_url():
     """
     Scrape La Gaceta homepage to find today's PDF link dynamically.
@@ -59,6 +186,7 @@ def scrape_latest_gaceta_url():
     try:
         response = requests.get(f"{GACETA_BASE_URL}/gaceta/", timeout=30)
         response.raise_for_status()
+        TELEMETRY.annotate(bytes=len(response.text))
 
         soup = BeautifulSoup(response.text, "html.parser")
         anchor = soup.select_one("#ctl00_PdfGacetaDescargarHyperLink")
@@ -72,22 +200,27 @@ def scrape_latest_gaceta_url():
             print("❌ Could not find PDF link on homepage")
             return None
     except Exception as e:
+        TELEMETRY.annotate(ok=False, error=str(e))
         print(f"❌ Failed to scrape homepage: {e}")
         return None
 
 
+@traced
 def download_pdf(url):
     """Download PDF from URL, return bytes"""
     print(f"📥 Downloading: {url}")
     try:
         response = requests.get(url, timeout=30)
         response.raise_for_status()
+        TELEMETRY.annotate(bytes=len(response.content))
         return BytesIO(response.content)
     except requests.exceptions.RequestException as e:
+        TELEMETRY.annotate(ok=False, error=str(e))
         print(f"❌ Failed to download: {e}")
         return None
 
 
+@traced
 def create_header_image(pdf_bytes, date_str):
     """
     Convert first half of first PDF page to darkened header image.
@@ -130,6 +263,7 @@ def create_header_image(pdf_bytes, date_str):
         final_image.save(output_path, "JPEG", quality=85, optimize=True)
 
         # Get file size
+        TELEMETRY.annotate(bytes=output_path.stat().st_size)
         size_kb = output_path.stat().st_size / 1024
         print(f"✅ Header image saved: {output_path.name} ({size_kb:.1f} KB)")
 
@@ -140,10 +274,12 @@ def create_header_image(pdf_bytes, date_str):
         print("⚠️ pdf2image or PIL not installed - skipping header image")
         return None
     except Exception as e:
+        TELEMETRY.annotate(ok=False, error=str(e))
         print(f"⚠️ Failed to create header image: {e}")
         return None
 
 
+@traced
 def extract_text_from_pdf(pdf_bytes, max_pages=None):
     """Extract text from PDF with page tracking (full document)"""
     print("📄 Extracting text from PDF (FULL DOCUMENT)...")
@@ -160,75 +296,215 @@ def extract_text_from_pdf(pdf_bytes, max_pages=None):
             text_with_pages += f"\n[PÁGINA {page_num}]\n"
             text_with_pages += page.extract_text() + "\n"
 
+        TELEMETRY.annotate(bytes=len(text_with_pages.encode("utf-8")), pages=pages_to_read)
         print(f"✅ Extracted {len(text_with_pages)} characters from {pages_to_read}/{total_pages} pages")
         return text_with_pages
     except Exception as e:
+        TELEMETRY.annotate(ok=False, error=str(e))
         print(f"❌ Failed to extract text: {e}")
         return None
 
 
-def call_ai_model(prompt, system_message=None):
+def _usage(prompt_tokens, completion_tokens, cached_tokens=0):
+    """Provider-neutral token usage; cached_tokens are input tokens read from cache"""
+    return SimpleNamespace(
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        total_tokens=prompt_tokens + completion_tokens,
+        cached_tokens=cached_tokens or 0,
+    )
+
+
+def _prompt_cache_key(system_message, cached_prefix):
+    # Same prefix -> same key, so OpenAI routes repeat calls to a warm cache
+    digest = hashlib.sha256(f"{system_message}\n{cached_prefix}".encode("utf-8"))
+    return f"gacetachat-{digest.hexdigest()[:16]}"
+
+
+@traced
+def call_ai_model(prompt, system_message=None, cached_prefix=None, response_schema=None):
     """
     Provider-agnostic AI model caller.
     Supports: OpenAI (GPT-5-mini, GPT-4o), Gemini, Anthropic
+
+    cached_prefix: stable text sent before ``prompt`` (identical on every
+    call) and marked for the provider's prompt cache: OpenAI caches
+    prefixes automatically (prompt_cache_key keeps them on one cache),
+    Anthropic needs cache_control breakpoints, Gemini caches implicitly.
+    Anthropic ignores a breakpoint whose prefix is below its minimum
+    cacheable length, which the instructions alone are, so the prompt
+    block gets a breakpoint too: the whole request is cached and a re-run
+    on the same document within the cache lifetime reads it back.
+
+    response_schema: JSON schema the reply must follow, using each
+    provider's structured-output mode (OpenAI json_schema, an Anthropic
+    forced tool call, Gemini response_schema), minus the validation-only
+    keywords the providers reject; the caller validates the reply against
+    the full schema. The text returned is then bare JSON.
+
+    Returns (text, usage) with usage.cached_tokens filled in.
     """
     provider = AI_CONFIG["provider"]
     model = AI_CONFIG["model"]
+    system_message = system_message or "You are a helpful assistant."
 
     if provider == "openai":
         client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+        extra = {}
+        if cached_prefix:
+            extra["prompt_cache_key"] = _prompt_cache_key(system_message, cached_prefix)
+        if response_schema:
+            extra["response_format"] = {
+                "type": "json_schema",
+                "json_schema": {
+                    "name": "response",
+                    "schema": _provider_schema(response_schema),
+                    "strict": True,
+                },
+            }
         response = client.chat.completions.create(
             model=model,
             messages=[
-                {"role": "system", "content": system_message or "You are a helpful assistant."},
-                {"role": "user", "content": prompt}
+                {"role": "system", "content": system_message},
+                {"role": "user", "content": (cached_prefix or "") + prompt}
             ],
             temperature=AI_CONFIG["temperature"],
-            max_completion_tokens=AI_CONFIG["max_tokens"]
+            max_completion_tokens=AI_CONFIG["max_tokens"],
+            **extra
         )
-        return response.choices[0].message.content.strip(), response.usage
+        details = getattr(response.usage, "prompt_tokens_details", None)
+        usage = _usage(
+            response.usage.prompt_tokens,
+            response.usage.completion_tokens,
+            getattr(details, "cached_tokens", 0),
+        )
+        _annotate_usage(usage)
+        return response.choices[0].message.content.strip(), usage
+
+    elif provider == "anthropic":
+        import anthropic
+        client = anthropic.Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
+        content = [{"type": "text", "text": prompt}]
+        if cached_prefix:
+            # Cache breakpoints: everything up to the end of each block is reused.
+            # The prefix one only counts once it reaches the minimum length;
+            # the document one caches the full request for same-day re-runs.
+            content.insert(0, {"type": "text", "text": cached_prefix})
+            for block in content:
+                block["cache_control"] = {"type": "ephemeral"}
+        extra = {}
+        if response_schema:
+            # Structured output: the model must "call" a tool whose input is the reply
+            extra["tools"] = [{
+                "name": "record_response",
+                "description": "Record the response in the required structure.",
+                "input_schema": _provider_schema(response_schema),
+            }]
+            extra["tool_choice"] = {"type": "tool", "name": "record_response"}
+        response = client.messages.create(
+            model=model,
+            system=system_message,
+            messages=[{"role": "user", "content": content}],
+            temperature=AI_CONFIG["temperature"],
+            max_tokens=AI_CONFIG["max_tokens"],
+            **extra
+        )
+        cached = response.usage.cache_read_input_tokens or 0
+        written = response.usage.cache_creation_input_tokens or 0
+        usage = _usage(
+            response.usage.input_tokens + cached + written,
+            response.usage.output_tokens,
+            cached,
+        )
+        _annotate_usage(usage)
+        if response_schema:
+            tool_input = next(block.input for block in response.content if block.type == "tool_use")
+            return json.dumps(tool_input, ensure_ascii=False), usage
+        text = "".join(block.text for block in response.content if block.type == "text")
+        return text.strip(), usage
 
     elif provider == "gemini":
         import google.generativeai as genai
         genai.configure(api_key=os.environ.get("GOOGLE_API_KEY"))
         gemini_model = genai.GenerativeModel(model)
+        # Implicit caching matches on the leading tokens, so the prefix goes first
         response = gemini_model.generate_content(
-            f"{system_message}\n\n{prompt}" if system_message else prompt,
+            f"{system_message}\n\n{cached_prefix or ''}{prompt}",
             generation_config={
                 "temperature": AI_CONFIG["temperature"],
                 "max_output_tokens": AI_CONFIG["max_tokens"],
+                **({
+                    "response_mime_type": "application/json",
+                    "response_schema": _gemini_schema(response_schema),
+                } if response_schema else {}),
             }
         )
         # Gemini usage tracking
-        usage = type('obj', (object,), {
-            'prompt_tokens': response.usage_metadata.prompt_token_count,
-            'completion_tokens': response.usage_metadata.candidates_token_count,
-            'total_tokens': response.usage_metadata.total_token_count
-        })()
+        metadata = response.usage_metadata
+        usage = _usage(
+            metadata.prompt_token_count,
+            metadata.candidates_token_count,
+            getattr(metadata, "cached_content_token_count", 0),
+        )
+        _annotate_usage(usage)
         return response.text, usage
 
     else:
         raise ValueError(f"Unsupported AI provider: {provider}")
 
 
-def summarize_with_ai(text, date):
-    """Analyze FULL document with bilingual (Spanish + English) 5-bullet summary using configured AI model"""
-    print(f"🤖 Generating bilingual summary (ES + EN) with {AI_CONFIG['model']} (FULL DOCUMENT)...")
+# Validation-only keywords: OpenAI's strict mode rejects them and Gemini's
+# dialect lacks them, so providers get the schema without them and
+# summary_errors checks the reply against the full schema instead
+VALIDATION_KEYWORDS = {
+    "minLength", "maxLength", "pattern", "format",
+    "minItems", "maxItems", "uniqueItems",
+    "minimum", "maximum", "exclusiveMinimum", "exclusiveMaximum", "multipleOf",
+}
 
-    # Prompt version for tracking and reproducibility
-    PROMPT_VERSION = "4.0.0"  # 4.0.0 = Full document analysis (no truncation)
 
-    # Calculate document stats for monitoring
-    estimated_tokens = len(text) // 4
-    print(f"📊 Document size: {len(text):,} chars (~{estimated_tokens:,} tokens)")
+def _provider_schema(schema, drop=VALIDATION_KEYWORDS):
+    """Copy of ``schema`` without the ``drop`` keywords (property names are kept)"""
+    if isinstance(schema, dict):
+        return {
+            key: (
+                {name: _provider_schema(sub, drop) for name, sub in value.items()}
+                if key == "properties" else _provider_schema(value, drop)
+            )
+            for key, value in schema.items()
+            if key not in drop
+        }
+    if isinstance(schema, list):
+        return [_provider_schema(item, drop) for item in schema]
+    return schema
+
+
+def _gemini_schema(schema):
+    # Gemini's schema dialect (OpenAPI subset) also has no additionalProperties
+    return _provider_schema(schema, VALIDATION_KEYWORDS | {"additionalProperties"})
+
 
-    prompt = f"""You are an expert at summarizing Costa Rican legal documents.
+def _annotate_usage(usage):
+    TELEMETRY.annotate(tokens={
+        "input": usage.prompt_tokens,
+        "output": usage.completion_tokens,
+        "cached": getattr(usage, "cached_tokens", 0),
+    })
 
-Below is the FULL text from La Gaceta Oficial de Costa Rica from {date.strftime('%B %d, %Y')}.
+
+# Prompt layout for prompt caching: everything identical from day to day
+# (system message, instructions, JSON schema) comes first and is sent as the
+# cached prefix; only the date and the gazette text follow it.
+PROMPT_VERSION = "4.2.0"  # 4.2.0 = schema-validated structured output; 4.1.0 = stable cacheable prefix
+SYSTEM_MESSAGE = "Eres un experto en resumir documentos legales oficiales de Costa Rica."
+SUMMARY_INSTRUCTIONS = """You are an expert at summarizing Costa Rican legal documents.
+
+After these instructions you will receive the FULL text from La Gaceta Oficial de Costa Rica
+for one day, preceded by its date.
 
 The text includes page markers in the format [PÁGINA N]. You MUST include these page references.
 
-CRITICAL: Read the ENTIRE document (all {estimated_tokens:,} tokens). Do not focus only on the first few pages.
+CRITICAL: Read the ENTIRE document. Do not focus only on the first few pages.
 
 Your task:
 1. Read the FULL document (all pages)
@@ -239,42 +515,42 @@ Your task:
 6. Identify 3-5 main topics (e.g., Legal, Fiscal, Health, Education, Environment)
 
 Response format (JSON):
-{{
-  "es": {{
+{
+  "es": {
     "summary": "Breve resumen general en 1-2 oraciones en español",
     "bullets": [
-      {{
+      {
         "icon": "⚖️",
         "text": "Descripción del cambio legal o decisión en español",
         "pages": [1, 2]
-      }},
-      {{
+      },
+      {
         "icon": "💰",
         "text": "Descripción del cambio fiscal en español",
         "pages": [5]
-      }},
+      },
       ...
     ],
     "topics": ["Legal", "Fiscal", "Salud", ...]
-  }},
-  "en": {{
+  },
+  "en": {
     "summary": "Brief general summary in 1-2 sentences in English",
     "bullets": [
-      {{
+      {
         "icon": "⚖️",
         "text": "Description of the legal change or decision in English",
         "pages": [1, 2]
-      }},
-      {{
+      },
+      {
         "icon": "💰",
         "text": "Description of the fiscal change in English",
         "pages": [5]
-      }},
+      },
       ...
     ],
     "topics": ["Legal", "Fiscal", "Health", ...]
-  }}
-}}
+  }
+}
 
 IMPORTANT:
 - The "pages" field must be an array of page numbers where you found the information
@@ -282,40 +558,182 @@ IMPORTANT:
 - English should be a faithful translation, preserving legal terminology
 - Both versions should have the same structure and content
 
+"""
+
+
+def build_summary_prompt(text, date):
+    """Return (cached_prefix, document_prompt) for summarize_with_ai"""
+    document_prompt = f"""Date of this edition: {date.strftime('%B %d, %Y')}
+
 La Gaceta text (FULL DOCUMENT - ALL PAGES):
 {text}
 
 Respond ONLY with the JSON, no additional text."""
+    return SUMMARY_INSTRUCTIONS, document_prompt
+
+
+# Structured output: the es/en summary must match this schema. Each language
+# section is validated on its own so only a broken section is repaired.
+LANGUAGE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "summary": {"type": "string", "minLength": 1},
+        "bullets": {
+            "type": "array",
+            "minItems": 1,
+            "items": {
+                "type": "object",
+                "properties": {
+                    "icon": {"type": "string"},
+                    "text": {"type": "string", "minLength": 1},
+                    "pages": {"type": "array", "items": {"type": "integer", "minimum": 1}},
+                },
+                "required": ["icon", "text", "pages"],
+                "additionalProperties": False,
+            },
+        },
+        "topics": {"type": "array", "minItems": 1, "items": {"type": "string"}},
+    },
+    "required": ["summary", "bullets", "topics"],
+    "additionalProperties": False,
+}
+SUMMARY_SCHEMA = {
+    "type": "object",
+    "properties": {"es": LANGUAGE_SCHEMA, "en": LANGUAGE_SCHEMA},
+    "required": ["es", "en"],
+    "additionalProperties": False,
+}
+LANGUAGES = {"es": "Spanish", "en": "English"}
+
+
+def summary_errors(data):
+    """Schema errors per language section: {"es": [...], "en": [...]}; empty = valid"""
+    if not isinstance(data, dict):
+        return {lang: ["the response is not a JSON object"] for lang in LANGUAGES}
+    validator = Draft202012Validator(LANGUAGE_SCHEMA)
+    errors = {}
+    for lang in LANGUAGES:
+        if lang not in data:
+            errors[lang] = [f'missing "{lang}" section']
+            continue
+        messages = [
+            f"{'/'.join(str(p) for p in error.absolute_path) or lang}: {error.message}"
+            for error in validator.iter_errors(data[lang])
+        ]
+        if messages:
+            errors[lang] = messages
+    return errors
+
+
+def _add_usage(total, usage):
+    return _usage(
+        total.prompt_tokens + usage.prompt_tokens,
+        total.completion_tokens + usage.completion_tokens,
+        total.cached_tokens + usage.cached_tokens,
+    )
+
+
+def repair_summary(data, errors, raw):
+    """Fix only the invalid sections with a small follow-up call (no gazette text)
 
+    Each broken section is sent back with its validation errors; a valid
+    other-language section is included as the source to translate from.
+    Returns ({lang: section}, usage).
+    """
+    broken = sorted(errors)
+    lines = ["A bilingual La Gaceta summary failed JSON schema validation.", ""]
+    for lang in broken:
+        lines.append(f'Errors in the "{lang}" ({LANGUAGES[lang]}) section:')
+        lines += [f"- {message}" for message in errors[lang]]
+    lines.append("")
+    if isinstance(data, dict):
+        for lang in broken:
+            lines += [f'Current "{lang}" section:', json.dumps(data.get(lang), ensure_ascii=False), ""]
+        for lang in LANGUAGES:
+            if lang not in errors:
+                lines += [
+                    f'The "{lang}" section is valid; use it as the source of the content '
+                    "(Spanish is authoritative, English a faithful translation):",
+                    json.dumps(data[lang], ensure_ascii=False),
+                    "",
+                ]
+    else:
+        lines += ["The response could not be parsed as JSON. Raw response:", raw, ""]
+
+    if len(broken) > 1:
+        schema = SUMMARY_SCHEMA
+        lines.append('Return ONLY the corrected JSON object with both "es" and "en".')
+    else:
+        schema = LANGUAGE_SCHEMA
+        lines.append(f'Return ONLY the corrected "{broken[0]}" section as a JSON object.')
+    lines.append("Keep the existing content and page numbers; fix only what the errors describe.")
+
+    result, usage = call_ai_model("\n".join(lines), SYSTEM_MESSAGE, response_schema=schema)
+    repaired = json.loads(result)
+    if schema is LANGUAGE_SCHEMA:
+        repaired = {broken[0]: repaired}
+    return repaired, usage
+
+
+def parse_summary(result, usage):
+    """Return (validated summary, total usage, repaired sections); repairs once"""
     try:
-        # Call AI model (provider-agnostic)
-        system_message = "Eres un experto en resumir documentos legales oficiales de Costa Rica."
-        result, usage = call_ai_model(prompt, system_message)
+        data = json.loads(result)
+    except json.JSONDecodeError:
+        data = None
+    errors = summary_errors(data)
+    if not errors:
+        return data, usage, []
+
+    print(f"⚠️ Summary failed validation ({', '.join(sorted(errors))}) - repairing")
+    repaired, repair_usage = repair_summary(data, errors, result)
+    usage = _add_usage(usage, repair_usage)
+    data = {**(data if isinstance(data, dict) else {}), **repaired}
+    remaining = summary_errors(data)
+    if remaining:
+        raise ValueError(f"summary still invalid after repair: {remaining}")
+    return data, usage, sorted(errors)
 
-        # Clean markdown code blocks if present
-        if result.startswith("```json"):
-            result = result[7:]
-        if result.startswith("```"):
-            result = result[3:]
-        if result.endswith("```"):
-            result = result[:-3]
 
-        result = result.strip()
+def summarize_with_ai(text, date):
+    """Analyze FULL document with bilingual (Spanish + English) 5-bullet summary using configured AI model"""
+    print(f"🤖 Generating bilingual summary (ES + EN) with {AI_CONFIG['model']} (FULL DOCUMENT)...")
 
-        summary_data = json.loads(result)
+    # Calculate document stats for monitoring
+    estimated_tokens = len(text) // 4
+    print(f"📊 Document size: {len(text):,} chars (~{estimated_tokens:,} tokens)")
+
+    cached_prefix, prompt = build_summary_prompt(text, date)
+
+    try:
+        # Call AI model (provider-agnostic)
+        result, usage = call_ai_model(
+            prompt, SYSTEM_MESSAGE, cached_prefix=cached_prefix, response_schema=SUMMARY_SCHEMA
+        )
+
+        # Structured output is bare JSON; invalid sections get a cheap repair call
+        summary_data, usage, repaired = parse_summary(result, usage)
 
         # Add metadata for transparency and reproducibility
+        if repaired:
+            summary_data["repaired_sections"] = repaired
         summary_data["prompt_version"] = PROMPT_VERSION
         summary_data["model"] = AI_CONFIG["model"]
         summary_data["provider"] = AI_CONFIG["provider"]
 
         # Track API usage for cost monitoring
-        cost_input = (usage.prompt_tokens / 1_000_000) * AI_CONFIG["cost_per_1m_input"]
+        # Cached input tokens are billed at the provider's discounted rate
+        uncached = usage.prompt_tokens - usage.cached_tokens
+        cost_input = (
+            uncached * AI_CONFIG["cost_per_1m_input"]
+            + usage.cached_tokens * AI_CONFIG["cost_per_1m_cached_input"]
+        ) / 1_000_000
         cost_output = (usage.completion_tokens / 1_000_000) * AI_CONFIG["cost_per_1m_output"]
         summary_data["api_cost_usd"] = round(cost_input + cost_output, 4)
         summary_data["tokens"] = {
             "input": usage.prompt_tokens,
             "output": usage.completion_tokens,
+            "cached": usage.cached_tokens,
             "total": usage.total_tokens
         }
 
@@ -323,6 +741,7 @@ Respond ONLY with the JSON, no additional text."""
         print(f"   ES bullets: {len(summary_data['es']['bullets'])}")
         print(f"   EN bullets: {len(summary_data['en']['bullets'])}")
         print(f"💰 Cost: ${summary_data['api_cost_usd']:.4f} | Tokens: {usage.total_tokens:,}")
+        print(f"♻️ Prompt cache: {usage.cached_tokens:,}/{usage.prompt_tokens:,} input tokens cached")
         return summary_data
 
     except Exception as e:
@@ -338,6 +757,7 @@ def load_summaries():
     return {}
 
 
+@traced
 def save_summaries(summaries):
     """Save summaries to JSON"""
     DATA_DIR.mkdir(parents=True, exist_ok=True)
@@ -350,6 +770,7 @@ def save_summaries(summaries):
     with open(SUMMARIES_FILE, 'w', encoding='utf-8') as f:
         json.dump(summaries, f, ensure_ascii=False, indent=2)
 
+    TELEMETRY.annotate(bytes=SUMMARIES_FILE.stat().st_size)
     print(f"💾 Saved summaries to {SUMMARIES_FILE}")
 
 
@@ -363,6 +784,7 @@ def main():
     costa_rica_tz = pytz.timezone("America/Costa_Rica")
     today = datetime.now(costa_rica_tz)
     summaries = load_summaries()
+    TELEMETRY.start(TELEMETRY_FILE)
 
     # First, try scraping homepage for latest PDF (most reliable)
     print("\n🌐 Method 1: Scraping homepage for latest PDF...")
@@ -425,13 +847,16 @@ def main():
                         if header_image_path:
                             summary_data["header_image"] = header_image_path
 
+                        # Stages up to here; save_summaries is only in the JSON lines
+                        summary_data["timings"] = TELEMETRY.timings()
+
                         summaries[date_str] = summary_data
                         save_summaries(summaries)
 
                         print(f"\n✅ SUCCESS! Summary for {date_str} saved")
-                        print(f"   Summary: {summary_data['summary']}")
-                        print(f"   Bullets: {len(summary_data['bullets'])}")
-                        print(f"   Topics: {', '.join(summary_data['topics'])}")
+                        print(f"   Summary: {summary_data['es']['summary']}")
+                        print(f"   Bullets: {len(summary_data['es']['bullets'])}")
+                        print(f"   Topics: {', '.join(summary_data['es']['topics'])}")
                         if header_image_path:
                             print(f"   Header: {header_image_path}")
 
@@ -476,15 +901,16 @@ def main():
         summary_data["date"] = date_str
         summary_data["pdf_url"] = url
         summary_data["generated_at"] = datetime.now().isoformat()
+        summary_data["timings"] = TELEMETRY.timings()
 
         # Save to summaries
         summaries[date_str] = summary_data
         save_summaries(summaries)
 
         print(f"\n✅ SUCCESS! Summary for {date_str} saved")
-        print(f"   Summary: {summary_data['summary']}")
-        print(f"   Bullets: {len(summary_data['bullets'])}")
-        print(f"   Topics: {', '.join(summary_data['topics'])}")
+        print(f"   Summary: {summary_data['es']['summary']}")
+        print(f"   Bullets: {len(summary_data['es']['bullets'])}")
+        print(f"   Topics: {', '.join(summary_data['es']['topics'])}")
 
         # Only process one day per run to save costs
         break
@@ -495,4 +921,22 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="GacetaChat daily scraper")
+    parser.add_argument(
+        "--profile", nargs="?", const="1", metavar="MODE",
+        help="profile the run (sample, cprofile or pyinstrument; same as GACETA_PROFILE)"
+    )
+    args = parser.parse_args()
+    if args.profile:
+        os.environ["GACETA_PROFILE"] = args.profile
+
+    # Shared with the v1 services, which ship it in archive/v1
+    sys.path.append(str(Path(__file__).resolve().parent.parent / "archive" / "v1"))
+    from profiling import profile_run
+
+    with profile_run("scrape", PROFILES_DIR) as artifacts:
+        main()
+    for path in artifacts:
+        print(f"🔬 Profile saved: {path}")
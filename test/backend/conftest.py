@@ -0,0 +1,16 @@
+"""
+Shared fixtures for the backend tests.
+"""
+
+import pytest
+
+from services.response_cache import response_cache
+
+
+@pytest.fixture(autouse=True)
+def private_response_cache_generation(tmp_path, monkeypatch):
+    # Invalidations from one test never reach another run's (or a deployment's)
+    # cache through the shared generation file next to the database
+    monkeypatch.setattr(
+        response_cache, "generation_file", str(tmp_path / "cache.generation")
+    )
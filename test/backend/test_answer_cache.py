@@ -0,0 +1,114 @@
+"""
+Unit tests for the semantic chat answer cache.
+"""
+
+import pytest
+from langchain.docstore.document import Document
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from embeddings import HashingEmbeddings
+from models import Base
+from services.answer_cache import AnswerCache, get_answer_cache_stats
+
+
+class CountingEmbeddings(HashingEmbeddings):
+    def __init__(self):
+        super().__init__(dim=256)
+        self.calls = 0
+
+    def embed_query(self, text):
+        self.calls += 1
+        return super().embed_query(text)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def make_cache(db, embeddings=None, backend="hashing", **key):
+    key = {"model": "gpt-4o", "temperature": 0.5, "prompt_version": "v1", **key}
+    return AnswerCache(
+        db,
+        embeddings or HashingEmbeddings(dim=256),
+        backend=backend,
+        threshold=0.8,
+        **key,
+    )
+
+
+@pytest.fixture
+def result():
+    return {
+        "answer": "El SINAC declaró una nueva área protegida.",
+        "ai_references": " página 3",
+        "sources": [Document(page_content="SINAC ...", metadata={"page": 3})],
+    }
+
+
+def test_exact_and_normalized_queries_hit_without_embedding(db, result):
+    embeddings = CountingEmbeddings()
+    make_cache(db, embeddings, backend="openai").store(
+        "2024-06-01", "¿Qué declaró el SINAC?", result
+    )
+    calls = embeddings.calls
+
+    hit = make_cache(db, embeddings, backend="openai").lookup(
+        "2024-06-01", "  ¿qué DECLARO el sinac? "
+    )
+
+    assert hit["cached"] is True
+    assert hit["answer"] == result["answer"]
+    assert hit["sources"][0].metadata == {"page": 3}
+    assert embeddings.calls == calls
+
+
+def test_similar_query_hits_with_a_semantic_backend(db, result):
+    # Hashing vectors stand in for a semantic backend's here
+    cache = make_cache(db, backend="openai")
+    cache.store("2024-06-01", "¿Qué declaró el SINAC hoy?", result)
+
+    assert cache.lookup("2024-06-01", "¿Qué declaró el SINAC?") is not None
+    assert cache.lookup("2024-06-01", "Presupuesto del Ministerio de Hacienda") is None
+    assert cache.lookup("2024-06-02", "¿Qué declaró el SINAC hoy?") is None
+
+
+def test_hashing_backend_only_serves_exact_repeats(db, result):
+    cache = make_cache(db, backend="hashing")
+    cache.store("2024-06-01", "¿Sube el impuesto?", result)
+
+    assert cache.lookup("2024-06-01", "¿sube el impuesto?") is not None
+    assert cache.lookup("2024-06-01", "¿Baja el impuesto?") is None
+
+
+def test_entries_only_match_the_same_backend_model_and_prompt(db, result):
+    make_cache(db).store("2024-06-01", "SINAC", result)
+
+    assert make_cache(db, backend="openai").lookup("2024-06-01", "SINAC") is None
+    assert make_cache(db, model="gpt-4o-mini").lookup("2024-06-01", "SINAC") is None
+    assert make_cache(db, temperature=0.9).lookup("2024-06-01", "SINAC") is None
+    assert make_cache(db, prompt_version="v2").lookup("2024-06-01", "SINAC") is None
+    assert make_cache(db).lookup("2024-06-01", "SINAC") is not None
+
+
+def test_hit_rate_counts_every_lookup(db, result):
+    cache = make_cache(db)
+    assert get_answer_cache_stats(db)["hit_rate"] == 0.0
+
+    # A cache_only miss is counted even though nothing gets stored
+    cache.lookup("2024-06-01", "Hacienda")
+    cache.store("2024-06-01", "SINAC", result)
+    cache.lookup("2024-06-01", "sinac")
+    cache.lookup("2024-06-01", "Sinac")
+    cache.lookup("2024-06-01", "Hacienda")
+
+    stats = get_answer_cache_stats(db, "2024-06-01")
+    assert stats["hits"] == 2 and stats["misses"] == 2
+    assert stats["entries"] == 1
+    assert stats["hit_rate"] == pytest.approx(2 / 4)
+    assert get_answer_cache_stats(db, "2024-06-02")["entries"] == 0
@@ -0,0 +1,97 @@
+"""
+Unit tests for the batched /bootstrap endpoint used by the Streamlit pages.
+"""
+
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import fastapp
+from db import get_db
+from models import (
+    Base,
+    ContentExecutionLog,
+    ExecutionSession,
+    GacetaPDF,
+    Prompt,
+    PromptQueryResponse,
+)
+from services.response_cache import response_cache
+
+
+@pytest.fixture
+def client():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    SessionLocal = sessionmaker(bind=engine)
+
+    db = SessionLocal()
+    gaceta = GacetaPDF(date=datetime(2024, 6, 3, 6), file_path="2024-06-03.pdf")
+    db.add_all([gaceta, Prompt(id=1, prompt_text="Resumen", name="resumen")])
+    db.flush()
+    db.add(ExecutionSession(id="s1", document_id=gaceta.id))
+    db.add(PromptQueryResponse(id="r1", response="Respuesta"))
+    db.flush()
+    db.add(
+        ContentExecutionLog(
+            prompt_id=1,
+            execution_session_id="s1",
+            query_response_id="r1",
+            state="EXECUTED",
+        )
+    )
+    db.commit()
+    db.close()
+
+    def override_get_db():
+        session = SessionLocal()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    response_cache.invalidate()
+    fastapp.app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(fastapp.app)
+    fastapp.app.dependency_overrides.pop(get_db, None)
+    response_cache.invalidate()
+
+
+def test_bootstrap_matches_the_individual_endpoints(client):
+    page = client.get("/bootstrap", params={"date": "2024-06-03"}).json()
+
+    assert page["available_days"] == client.get("/execution_session/available/").json()
+    assert (
+        page["execution_sessions"]
+        == client.get("/execution_session_by_date/?date=2024-06-03").json()
+    )
+    assert (
+        page["session_logs"]["s1"]
+        == client.get("/execution_session/?session_id=s1").json()
+    )
+    assert page["recent_logs"] == client.get("/content_logs/?limit=3").json()
+    assert page["global_limit"] == client.get("/check_global_limit/").json()
+    assert page["answer_cache_stats"] == client.get("/answer_cache/stats/").json()
+
+
+def test_bootstrap_without_date_or_logs(client):
+    page = client.get("/bootstrap", params={"logs_limit": 0}).json()
+
+    assert page["execution_sessions"] == [] and page["session_logs"] == {}
+    assert page["recent_logs"] == []
+    assert client.get("/bootstrap", params={"date": "03-06-2024"}).status_code == 400
+
+
+def test_day_without_gaceta_is_not_found(client):
+    page = client.get("/bootstrap", params={"date": "2024-06-04"}).json()
+
+    assert page["execution_sessions"] == []
+    assert client.get("/execution_session_by_date/?date=2024-06-04").status_code == 404
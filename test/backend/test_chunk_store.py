@@ -0,0 +1,82 @@
+"""
+Unit tests for the memory-mapped chunk store and FAISSChunkIndex persistence.
+"""
+
+import hashlib
+
+import numpy as np
+import pytest
+from langchain.docstore.document import Document
+
+from chunk_store import ChunkStore
+from faiss_helper import FAISSChunkIndex, FAISSHelper
+
+
+class HashEmbeddings:
+    """Deterministic stand-in for OpenAIEmbeddings."""
+
+    dim = 16
+
+    def _embed(self, text):
+        seed = int(hashlib.md5(text.encode("utf-8")).hexdigest()[:8], 16)
+        return np.random.default_rng(seed).random(self.dim).tolist()
+
+    def embed_documents(self, texts):
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text):
+        return self._embed(text)
+
+
+@pytest.fixture
+def documents():
+    return [
+        Document(page_content=f"Decreto N° {i}-MINAE página {i}", metadata={"page": i})
+        for i in range(20)
+    ] + [Document(page_content="Cédula jurídica 3-101-ñandú", metadata={})]
+
+
+def test_chunk_store_round_trip(tmp_path, documents):
+    ChunkStore.write(tmp_path, documents)
+    store = ChunkStore(tmp_path)
+
+    assert len(store) == len(documents)
+    assert store[5].page_content == documents[5].page_content
+    assert store[5].metadata == {"page": 5}
+    assert store.get_many([20])[0].page_content == "Cédula jurídica 3-101-ñandú"
+    store.close()
+
+
+def test_chunk_store_empty(tmp_path):
+    ChunkStore.write(tmp_path, [])
+    assert len(ChunkStore(tmp_path)) == 0
+
+
+def test_faiss_chunk_index_save_and_load(tmp_path, documents):
+    embeddings = HashEmbeddings()
+    db = FAISSChunkIndex.from_documents(documents, embeddings)
+    db.save_local(tmp_path)
+
+    assert not (tmp_path / "index.pkl").exists()
+
+    loaded = FAISSChunkIndex.load_local(tmp_path, embeddings)
+    hits = loaded.similarity_search(documents[7].page_content, k=3)
+
+    assert loaded.index.ntotal == len(documents)
+    assert hits[0].page_content == documents[7].page_content
+    assert hits[0].metadata == {"page": 7}
+
+
+def test_load_faiss_index_migrates_legacy_pickle(tmp_path, documents):
+    from langchain_community.vectorstores import FAISS
+
+    helper = FAISSHelper()
+    helper.embeddings = HashEmbeddings()
+    FAISS.from_documents(documents, helper.embeddings).save_local(str(tmp_path))
+
+    loaded = helper.load_faiss_index(str(tmp_path))
+
+    assert ChunkStore.exists(str(tmp_path))
+    assert loaded.similarity_search(documents[3].page_content, k=1)[0].metadata == {
+        "page": 3
+    }
@@ -0,0 +1,109 @@
+"""
+Unit tests for cursor pagination and FTS filtering of /content_logs.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from fastapp import LogQueryParams, get_content_logs_page, prompt_text_filter
+from models import (
+    Base,
+    ContentExecutionLog,
+    ExecutionSession,
+    Prompt,
+    create_search_indexes,
+    has_prompt_fts,
+)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    create_search_indexes(engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all(
+        [
+            Prompt(id=1, alias="twitter", prompt_text="Resumen para Twitter"),
+            Prompt(id=2, alias="legal", prompt_text="Cambios en la legislación"),
+        ]
+    )
+    exec_session = ExecutionSession()
+    session.add(exec_session)
+    session.flush()
+    start = datetime(2024, 6, 1)
+    for i in range(12):
+        session.add(
+            ContentExecutionLog(
+                prompt_id=1 + i % 2,
+                execution_session_id=exec_session.id,
+                state="EXECUTED" if i % 3 else "FAILED",
+                # pairs of logs share a timestamp to exercise the id tie-break
+                created_at=start + timedelta(minutes=i // 2),
+            )
+        )
+    session.commit()
+    yield session
+    session.close()
+
+
+def collect(db, **kwargs):
+    ids, cursor = [], None
+    while True:
+        page, cursor = get_content_logs_page(
+            db, LogQueryParams(limit=5, cursor=cursor, **kwargs)
+        )
+        ids.extend((log.created_at, log.id) for log in page)
+        if cursor is None:
+            return ids
+
+
+@pytest.mark.parametrize("order", ["desc", "asc"])
+def test_cursor_pages_are_complete_and_ordered(db, order):
+    keys = collect(db, order=order)
+
+    assert len(keys) == 12 and len(set(keys)) == 12
+    assert keys == sorted(keys, reverse=order == "desc")
+
+
+def test_state_and_prompt_text_filters(db):
+    assert len(collect(db, state="FAILED")) == 4
+    assert len(collect(db, prompt_text="TWITTER")) == 6
+    assert len(collect(db, prompt_text="legislaci")) == 6
+    assert len(collect(db, prompt_text="tw")) == 6  # too short for trigrams: LIKE
+    assert collect(db, prompt_text='"; DROP') == []
+
+
+def test_fts_follows_prompt_updates(db):
+    assert has_prompt_fts(db.get_bind())
+    db.get(Prompt, 2).prompt_text = "Noticias ambientales"
+    db.commit()
+
+    assert len(collect(db, prompt_text="ambiental")) == 6
+    assert collect(db, prompt_text="legislaci") == []
+    assert "prompts_fts" in str(prompt_text_filter(db, "ambiental"))
+
+
+def test_state_filter_uses_composite_index(db):
+    plan = db.execute(
+        text(
+            "EXPLAIN QUERY PLAN SELECT id FROM execution_logs WHERE state = 'FAILED' "
+            "ORDER BY created_at DESC, id DESC LIMIT 10"
+        )
+    ).fetchall()
+
+    assert "ix_execution_logs_state_created_at" in str(plan)
+    assert "TEMP B-TREE" not in str(plan)
+
+
+def test_fts_check_before_the_index_exists_is_not_remembered():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+
+    assert not has_prompt_fts(engine)
+    create_search_indexes(engine)
+
+    assert has_prompt_fts(engine)
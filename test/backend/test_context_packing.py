@@ -0,0 +1,50 @@
+"""
+Unit tests for token-budget context packing in qa.py.
+"""
+
+from unittest.mock import MagicMock
+
+from langchain.docstore.document import Document
+
+from qa import STUFF_PROMPT, count_tokens, pack_docs_upto_limit, pop_docs_upto_limit
+
+
+def _doc(words):
+    return Document(page_content=" ".join(["gaceta"] * words))
+
+
+def test_pack_respects_budget_and_relevance_order():
+    query = "¿Qué decretos se publicaron?"
+    overhead = count_tokens(STUFF_PROMPT.format(context="", question=query))
+    docs = [_doc(100), _doc(500), _doc(50)]
+
+    budget = overhead + sum(
+        count_tokens(d.page_content) + 2 for d in (docs[0], docs[2])
+    )
+
+    packed = pack_docs_upto_limit(query, docs, budget)
+
+    # The 500-word chunk does not fit, the smaller third chunk still does
+    assert packed == [docs[0], docs[2]]
+
+
+def test_pack_tokenizes_each_chunk_once():
+    docs = [Document(page_content=f"Acuerdo único {i}") for i in range(20)]
+    count_tokens.cache_clear()
+
+    pack_docs_upto_limit("consulta", docs, 10_000)
+    misses = count_tokens.cache_info().misses
+    pack_docs_upto_limit("consulta", docs, 10_000)
+
+    assert count_tokens.cache_info().misses == misses
+
+
+def test_pop_docs_measures_prompt_once():
+    docs = [_doc(300) for _ in range(5)]
+    chain = MagicMock()
+    chain.prompt_length.return_value = 5 * count_tokens(docs[0].page_content) + 100
+
+    remaining = pop_docs_upto_limit("q", chain, list(docs), 2 * 300)
+
+    chain.prompt_length.assert_called_once()
+    assert len(remaining) < len(docs)
@@ -0,0 +1,56 @@
+"""
+Unit tests for the offline HashingEmbeddings backend.
+"""
+
+import numpy as np
+import pytest
+
+from embeddings import HashingEmbeddings, get_embeddings
+from faiss_helper import FAISSChunkIndex, FAISSHelper
+
+
+def test_vectors_are_normalized_and_deterministic():
+    embeddings = HashingEmbeddings(dim=256)
+    first = np.array(embeddings.embed_documents(["Decreto N° 12345-MINAE", ""]))
+    second = np.array(embeddings.embed_documents(["Decreto N° 12345-MINAE", ""]))
+
+    assert first.shape == (2, 256)
+    assert np.allclose(first, second)
+    assert np.isclose(np.linalg.norm(first[0]), 1.0)
+    assert not first[1].any()
+
+
+def test_batching_does_not_change_vectors():
+    texts = [f"Municipalidad de Nandayure acuerdo {i}" for i in range(10)]
+    batched = HashingEmbeddings(dim=128, batch_size=3).encode(texts)
+    single = np.vstack([HashingEmbeddings(dim=128).encode([t]) for t in texts])
+
+    assert np.allclose(batched, single, atol=1e-6)
+
+
+def test_accents_are_folded():
+    embeddings = HashingEmbeddings()
+    assert np.allclose(
+        embeddings.embed_query("Página ÚNICA"), embeddings.embed_query("pagina unica")
+    )
+
+
+def test_hashing_backend_ranks_exact_matches_first():
+    helper = FAISSHelper(embedding_backend="hashing")
+    from langchain.docstore.document import Document
+
+    docs = [
+        Document(page_content="Reforma a la ley de tránsito y multas vehiculares"),
+        Document(page_content="SINAC declara nueva área silvestre protegida"),
+        Document(page_content="Presupuesto extraordinario del Ministerio de Hacienda"),
+    ]
+    db = FAISSChunkIndex.from_documents(docs, helper.embeddings)
+
+    assert (
+        "SINAC" in db.similarity_search("área protegida del SINAC", k=1)[0].page_content
+    )
+
+
+def test_unknown_backend_raises():
+    with pytest.raises(NotImplementedError):
+        get_embeddings("word2vec")
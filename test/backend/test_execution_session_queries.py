@@ -0,0 +1,130 @@
+"""
+Query-count tests for the execution session read paths (no N+1 queries).
+"""
+
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from crud import (
+    display_last_execution_session,
+    get_execution_session_prompts_results,
+    get_last_executed_logs,
+)
+from models import (
+    Base,
+    ContentExecutionLog,
+    ContentTemplate,
+    ExecutionSession,
+    ExecutionState,
+    Prompt,
+    PromptQueryResponse,
+)
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    return engine
+
+
+@contextmanager
+def count_queries(engine):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def seed_session(engine, prompt_count, prefix="prompt"):
+    """Session where every prompt but the last has two executed runs and a failure."""
+    db = sessionmaker(bind=engine)()
+    template = ContentTemplate(title="Daily", description="")
+    db.add(template)
+    db.flush()
+    session = ExecutionSession(content_template_id=template.id)
+    db.add(session)
+    db.flush()
+    started = datetime(2024, 6, 1, 6, 0)
+    for i in range(prompt_count):
+        prompt = Prompt(
+            template_id=template.id, alias=f"{prefix}_{i}", prompt_text=f"text {i}"
+        )
+        db.add(prompt)
+        db.flush()
+        if i == prompt_count - 1:
+            continue
+        for run, state in enumerate(["EXECUTED", "EXECUTED", "FAILED"]):
+            output = PromptQueryResponse(response=f"{i}-run{run}", sources="[]")
+            db.add(output)
+            db.flush()
+            db.add(
+                ContentExecutionLog(
+                    prompt_id=prompt.id,
+                    execution_session_id=session.id,
+                    query_response_id=output.id,
+                    state=state,
+                    created_at=started + timedelta(minutes=run),
+                )
+            )
+    db.commit()
+    session_id = session.id
+    db.close()
+    return session_id
+
+
+def test_latest_executed_log_per_prompt(engine):
+    session_id = seed_session(engine, 3)
+    db = sessionmaker(bind=engine)()
+
+    logs = get_last_executed_logs(db, session_id)
+
+    assert sorted(log.output.response for log in logs.values()) == [
+        "0-run1",
+        "1-run1",
+    ]
+    assert get_execution_session_prompts_results(db, session_id) == {
+        "prompt_0": "0-run1",
+        "prompt_1": "1-run1",
+    }
+    assert get_last_executed_logs(db, session_id, prompt_ids=[]) == {}
+
+
+@pytest.mark.parametrize(
+    "read_path", [display_last_execution_session, get_execution_session_prompts_results]
+)
+def test_query_count_is_independent_of_prompt_count(engine, read_path):
+    counts = []
+    for prompt_count in (3, 30):
+        session_id = seed_session(engine, prompt_count, f"p{prompt_count}")
+        db = sessionmaker(bind=engine)()
+        with count_queries(engine) as statements:
+            result = read_path(db, session_id)
+            # Touch every field the API serializes
+            str(result)
+        counts.append(len(statements))
+        assert len(result) in (prompt_count, prompt_count - 1)
+        db.close()
+
+    assert counts[0] == counts[1]
+    assert counts[0] <= 3
+
+
+def test_display_marks_prompts_without_executed_log(engine):
+    session_id = seed_session(engine, 2)
+    db = sessionmaker(bind=engine)()
+
+    logs = display_last_execution_session(db, session_id)
+
+    assert logs[0]["response"] == "0-run1"
+    assert logs[1]["response"].startswith("Ups!")
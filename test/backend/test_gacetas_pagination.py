@@ -0,0 +1,110 @@
+"""
+Unit tests for keyset-paginated, eager-loaded gaceta listing.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from crud import get_twitter_prompts, list_gacetas_with_twitter_prompts
+from models import (
+    Base,
+    ContentExecutionLog,
+    ExecutionSession,
+    GacetaPDF,
+    Prompt,
+    PromptQueryResponse,
+)
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    db.add_all(
+        [
+            Prompt(id=1, alias="twitter_summary", prompt_text="tweet"),
+            Prompt(id=2, alias="newsletter", prompt_text="news"),
+        ]
+    )
+    first_day = datetime(2024, 1, 1, 6, 0)
+    for day in range(25):
+        gaceta = GacetaPDF(date=first_day + timedelta(days=day), file_path=f"{day}.pdf")
+        db.add(gaceta)
+        db.flush()
+        for _ in range(2):
+            session = ExecutionSession(document_id=gaceta.id)
+            db.add(session)
+            db.flush()
+            for prompt_id in (1, 2):
+                output = PromptQueryResponse(response=f"day {day} prompt {prompt_id}")
+                db.add(output)
+                db.flush()
+                db.add(
+                    ContentExecutionLog(
+                        prompt_id=prompt_id,
+                        execution_session_id=session.id,
+                        query_response_id=output.id,
+                        state="EXECUTED",
+                    )
+                )
+    # Same date as the newest gaceta, to exercise the (date, id) tie-break
+    db.add(GacetaPDF(date=first_day + timedelta(days=24), file_path="dup.pdf"))
+    db.commit()
+    db.close()
+    return engine
+
+
+def test_pages_cover_every_gaceta_once_in_order(engine):
+    db = sessionmaker(bind=engine)()
+    seen, cursor = [], None
+    while True:
+        page = list_gacetas_with_twitter_prompts(db, 1, limit=10, cursor=cursor)
+        seen.extend(item["gaceta"] for item in page["gacetas"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len(seen) == 26
+    assert len({gaceta["id"] for gaceta in seen}) == 26
+    keys = [(gaceta["date"], gaceta["id"]) for gaceta in seen]
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_ascending_pages_and_prompt_filter(engine):
+    db = sessionmaker(bind=engine)()
+    first = list_gacetas_with_twitter_prompts(db, 1, limit=3, order="asc")
+    second = list_gacetas_with_twitter_prompts(
+        db, 1, limit=3, order="asc", cursor=first["next_cursor"]
+    )
+
+    assert first["gacetas"][0]["gaceta"]["file_path"] == "0.pdf"
+    assert second["gacetas"][0]["gaceta"]["file_path"] == "3.pdf"
+    sessions = first["gacetas"][0]["twitter_prompts"]
+    assert len(sessions) == 2
+    assert [log["response"] for log in sessions[0]["logs"]] == ["day 0 prompt 1"]
+
+
+def test_query_count_is_bounded_per_page(engine):
+    db = sessionmaker(bind=engine)()
+    statements = []
+    event.listen(
+        engine, "before_cursor_execute", lambda *args: statements.append(args[2])
+    )
+
+    list_gacetas_with_twitter_prompts(db, 1, limit=20)
+
+    assert len(statements) <= 3
+
+
+def test_get_twitter_prompts_and_bad_cursor(engine):
+    db = sessionmaker(bind=engine)()
+
+    sessions = get_twitter_prompts(db, 1, 2)
+    assert [log["response"] for log in sessions[1]["logs"]] == ["day 0 prompt 2"]
+    with pytest.raises(HTTPException):
+        list_gacetas_with_twitter_prompts(db, 1, cursor="not-a-cursor")
@@ -0,0 +1,98 @@
+"""
+Unit tests for the atomic global query counter and its in-process budget.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from db import create_db_engine
+from models import Base, GlobalQueryCount
+from services.counter import (
+    check_global_limit,
+    get_global_query_count,
+    increment_global_query_count,
+    query_budget,
+    release_global_query,
+)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'counter.db'}")
+    Base.metadata.create_all(engine)
+    query_budget.clear()
+    yield engine
+    query_budget.clear()
+    engine.dispose()
+
+
+def test_increment_stops_at_the_limit(engine):
+    db = sessionmaker(bind=engine)()
+
+    results = [increment_global_query_count(db, limit=5) for _ in range(7)]
+
+    assert results == [True] * 5 + [False] * 2
+    assert get_global_query_count(db).count == 5
+    assert db.query(GlobalQueryCount).count() == 1
+
+
+def test_concurrent_increments_never_exceed_the_limit(engine):
+    Session = sessionmaker(bind=engine)
+
+    def take():
+        db = Session()
+        try:
+            return increment_global_query_count(db, limit=50)
+        finally:
+            db.close()
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(lambda _: take(), range(120)))
+
+    assert sum(results) == 50
+    assert get_global_query_count(Session()).count == 50
+
+
+def test_checks_are_served_from_the_budget(engine):
+    db = sessionmaker(bind=engine)()
+    statements = []
+    event.listen(
+        engine, "before_cursor_execute", lambda *args: statements.append(args[2])
+    )
+
+    assert check_global_limit(db, limit=2)
+    assert check_global_limit(db, limit=2)
+    assert len(statements) == 1
+
+    increment_global_query_count(db, limit=2)
+    increment_global_query_count(db, limit=2)
+    statements.clear()
+
+    # An empty bucket stays empty for the rest of the day: no database access
+    assert not check_global_limit(db, limit=2)
+    assert statements == []
+
+
+def test_released_query_can_be_taken_again(engine):
+    db = sessionmaker(bind=engine)()
+    assert increment_global_query_count(db, limit=2)
+    assert increment_global_query_count(db, limit=2)
+    assert not check_global_limit(db, limit=2)
+
+    # A reservation whose LLM call failed gives its query back
+    assert release_global_query(db, limit=2)
+
+    assert check_global_limit(db, limit=2)
+    assert increment_global_query_count(db, limit=2)
+    assert not increment_global_query_count(db, limit=2)
+
+
+def test_release_never_goes_below_zero(engine):
+    db = sessionmaker(bind=engine)()
+    get_global_query_count(db)
+
+    assert not release_global_query(db, limit=2)
+    assert get_global_query_count(db).count == 0
@@ -0,0 +1,86 @@
+"""
+Unit tests for BM25 indexing, reciprocal rank fusion and hybrid search.
+"""
+
+import pytest
+from langchain.docstore.document import Document
+
+from bm25 import BM25Index, reciprocal_rank_fusion, tokenize
+from embeddings import HashingEmbeddings
+from faiss_helper import FAISSChunkIndex, FAISSHelper
+
+
+@pytest.fixture
+def documents():
+    filler = [
+        Document(page_content=f"Acuerdo municipal número {i} sobre caminos vecinales")
+        for i in range(30)
+    ]
+    return filler + [
+        Document(
+            page_content="Decreto N° 44512-MINAE declara refugio de vida silvestre"
+        ),
+        Document(page_content="El SINAC aprueba el plan de manejo del parque"),
+        Document(
+            page_content="Sociedad anónima cédula jurídica 3-101-765432 se disuelve"
+        ),
+    ]
+
+
+def test_tokenize_keeps_identifiers_and_parts():
+    tokens = tokenize("Decreto N° 44512-MINAE, cédula 3-101-765432")
+
+    assert "44512-minae" in tokens
+    assert "44512" in tokens and "minae" in tokens
+    assert "3-101-765432" in tokens
+    assert "cedula" in tokens
+
+
+def test_bm25_finds_exact_tokens(documents):
+    bm25 = BM25Index.from_texts(doc.page_content for doc in documents)
+
+    ids, scores = bm25.search("¿Qué dice el decreto 44512-MINAE?", k=3)
+    assert ids[0] == 30
+    assert list(scores) == sorted(scores, reverse=True)
+
+    ids, _ = bm25.search("3-101-765432", k=1)
+    assert ids[0] == 32
+
+
+def test_bm25_save_and_load(tmp_path, documents):
+    bm25 = BM25Index.from_texts(doc.page_content for doc in documents)
+    bm25.save(tmp_path)
+    loaded = BM25Index.load(tmp_path)
+
+    assert len(loaded) == len(documents)
+    assert list(loaded.search("SINAC", k=1)[0]) == [31]
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    fused = reciprocal_rank_fusion([[1, 2, 3], [3, 1, 4]], k=60)
+
+    assert [doc_id for doc_id, _ in fused][:2] == [1, 3]
+    assert {doc_id for doc_id, _ in fused} == {1, 2, 3, 4}
+
+
+def test_hybrid_search_surfaces_identifier_match(tmp_path, documents):
+    db = FAISSChunkIndex.from_documents(documents, HashingEmbeddings())
+    db.save_local(tmp_path)
+    loaded = FAISSChunkIndex.load_local(tmp_path, HashingEmbeddings())
+
+    hits = loaded.hybrid_search("¿Qué se aprobó para el SINAC?", k=2)
+
+    assert len(hits) == 2
+    assert "SINAC" in hits[0].page_content
+
+
+def test_load_faiss_index_builds_missing_bm25(tmp_path, documents):
+    helper = FAISSHelper(embedding_backend="hashing")
+    db = FAISSChunkIndex.from_documents(documents, helper.embeddings)
+    db.bm25 = None
+    db.save_local(tmp_path)
+
+    loaded = helper.load_faiss_index(str(tmp_path))
+
+    assert loaded.bm25 is not None
+    assert BM25Index.exists(str(tmp_path))
@@ -0,0 +1,207 @@
+"""
+Unit tests for the gaceta ingestion state machine in download_gaceta.py.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import download_gaceta
+from download_gaceta import COSTA_RICA_TZ, IngestionDaemon, IngestionStage
+from jobs import JobWorker
+from models import Base
+
+
+def cr_time(day, hour, minute=0):
+    return COSTA_RICA_TZ.localize(datetime(2024, 12, day, hour, minute))
+
+
+class FakeSite:
+    """Homepage that links yesterday's PDF until ``published_at``."""
+
+    def __init__(self, published_at):
+        self.published_at = published_at
+        self.now = None
+        self.calls = []
+        self.stored = set()
+        self.execute_status = "EXECUTED"
+
+    def install(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(download_gaceta, "find_pdf_url", self.find_pdf_url)
+        monkeypatch.setattr(download_gaceta, "download_pdf", self.download_pdf)
+        monkeypatch.setattr(download_gaceta, "store_gaceta_pdf", self.store)
+        monkeypatch.setattr(download_gaceta, "gaceta_exists", self.stored.__contains__)
+        monkeypatch.setattr(download_gaceta, "build_gaceta_index", self.index)
+        monkeypatch.setattr(download_gaceta, "execute_gaceta_prompts", self.execute)
+        monkeypatch.setattr(
+            download_gaceta, "gaceta_pdf_path", lambda day: str(tmp_path / day / "pdf")
+        )
+
+    def find_pdf_url(self):
+        self.calls.append("find")
+        if self.now >= self.published_at:
+            return "/pdf/today.pdf"
+        return "/pdf/yesterday.pdf"
+
+    def download_pdf(self, url):
+        self.calls.append("download")
+        return b"%PDF today"
+
+    def store(self, day, data=None):
+        self.calls.append("store")
+        self.stored.add(day)
+
+    def index(self, day):
+        self.calls.append("index")
+
+    def execute(self, day, template_id=1):
+        self.calls.append("execute")
+        return self.execute_status
+
+
+@pytest.fixture
+def site(monkeypatch, tmp_path):
+    site = FakeSite(published_at=cr_time(19, 7, 10))
+    site.install(monkeypatch, tmp_path)
+    return site
+
+
+@pytest.fixture
+def worker(monkeypatch):
+    """Job worker on an in-memory queue shared with the daemon."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    SessionLocal = sessionmaker(bind=engine)
+    monkeypatch.setattr(download_gaceta, "Session", SessionLocal)
+    monkeypatch.setattr(download_gaceta.config, "JOB_RETRY_BASE_SECONDS", 0)
+    return JobWorker(SessionLocal, worker_id="test-worker")
+
+
+@pytest.fixture
+def daemon(tmp_path, worker):
+    daemon = IngestionDaemon(state_file=str(tmp_path / "state.json"))
+    daemon.state = {"last_pdf_url": "/pdf/yesterday.pdf"}
+    return daemon
+
+
+def run_until(daemon, site, now, end, worker=None):
+    """Step the daemon with a fake clock; returns the times it woke up.
+
+    With a ``worker``, the jobs queued by each step are run before the next.
+    """
+    wakeups = []
+    while now < end:
+        site.now = now
+        wakeups.append(now)
+        now = max(now, daemon.step(now))
+        while worker and worker.run_once():
+            pass
+    return wakeups
+
+
+def test_sleeps_until_the_publication_window(daemon, site):
+    site.now = cr_time(19, 1)
+
+    assert daemon.step(cr_time(19, 1)) == cr_time(19, 5)
+    assert site.calls == []
+
+
+def test_polls_with_exponential_backoff_until_published(daemon, site, worker):
+    wakeups = run_until(daemon, site, cr_time(19, 5), cr_time(19, 12), worker)
+    gaps = [(b - a).total_seconds() for a, b in zip(wakeups, wakeups[1:])]
+
+    assert daemon.stage == IngestionStage.COMPLETE
+    assert site.calls.count("download") == 1
+    assert site.calls[-4:] == ["download", "store", "index", "execute"]
+    assert gaps[1:6] == [60, 120, 240, 480, 900]
+    # 05:00 → 07:10 took 13 homepage requests; the old loop made 130
+    assert site.calls.count("find") == 13
+    assert daemon.state["next_run"] == cr_time(20, 5).isoformat()
+
+
+def test_finished_day_does_no_work_even_after_restart(daemon, site, worker, tmp_path):
+    run_until(daemon, site, cr_time(19, 5), cr_time(19, 12), worker)
+    calls = len(site.calls)
+
+    restarted = IngestionDaemon(state_file=str(tmp_path / "state.json"))
+    site.now = cr_time(19, 13)
+    assert restarted.stage == IngestionStage.COMPLETE
+    assert restarted.step(cr_time(19, 13)) == cr_time(20, 5)
+    assert len(site.calls) == calls
+
+
+def test_next_day_starts_over_and_keeps_usage_history(daemon, site, worker):
+    run_until(daemon, site, cr_time(19, 5), cr_time(19, 12), worker)
+
+    site.now = cr_time(20, 5)
+    daemon.step(cr_time(20, 5))
+
+    assert daemon.state["day"] == "2024-12-20"
+    assert daemon.state["last_pdf_url"] == "/pdf/today.pdf"
+    assert daemon.state["history"][-1]["day"] == "2024-12-19"
+    assert daemon.state["history"][-1]["http_requests"] >= 2
+
+
+def test_window_closing_marks_the_day_missed(daemon, site):
+    site.published_at = cr_time(25, 0)
+    run_until(daemon, site, cr_time(19, 5), cr_time(19, 23))
+
+    assert daemon.stage == IngestionStage.MISSED
+    assert daemon.state["next_run"] == cr_time(20, 5).isoformat()
+
+
+def test_failed_prompts_are_retried_then_given_up(daemon, site, worker, monkeypatch):
+    monkeypatch.setattr(download_gaceta.config, "INGESTION_MAX_ATTEMPTS", 3)
+    site.execute_status = "FAILED"
+    run_until(daemon, site, cr_time(19, 5), cr_time(19, 23), worker)
+
+    assert daemon.stage == IngestionStage.FAILED
+    assert site.calls.count("execute") == 3
+    assert site.calls.count("index") == 1
+
+
+def test_existing_gaceta_skips_polling(daemon, site, worker):
+    site.stored.add("2024-12-19")
+    run_until(daemon, site, cr_time(19, 4), cr_time(19, 12), worker)
+
+    assert "find" not in site.calls
+    assert site.calls == ["index", "execute"]
+    assert daemon.stage == IngestionStage.COMPLETE
+
+
+def test_state_file_is_valid_after_every_step(daemon, site, tmp_path):
+    site.now = cr_time(19, 5)
+    daemon.step(cr_time(19, 5))
+
+    reloaded = IngestionDaemon(state_file=str(tmp_path / "state.json"))
+    assert reloaded.state["day"] == "2024-12-19"
+    assert reloaded.state["usage"]["wakeups"] == 1
+    assert not (tmp_path / "state.json.tmp").exists()
+
+
+def test_daemon_waits_for_its_job_without_running_it(daemon, site):
+    site.stored.add("2024-12-19")
+    site.now = cr_time(19, 6)
+
+    assert daemon.step(cr_time(19, 6)) == cr_time(19, 6, 0) + timedelta(seconds=30)
+    assert daemon.step(cr_time(19, 6, 1)) == cr_time(19, 6, 1) + timedelta(seconds=30)
+    assert daemon.stage == IngestionStage.DOWNLOADED
+    assert site.calls == []
+
+
+def test_profiling_setup_failure_is_a_failed_step(daemon, site, monkeypatch):
+    def broken_profile_run(name, directory):
+        raise PermissionError(f"cannot create {directory}")
+
+    monkeypatch.setattr(download_gaceta, "profile_run", broken_profile_run)
+    site.now = cr_time(19, 5)
+
+    assert daemon.step(cr_time(19, 5)) > cr_time(19, 5)
+    assert daemon.state["usage"]["wakeups"] == 1
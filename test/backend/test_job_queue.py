@@ -0,0 +1,194 @@
+"""
+Unit tests for the SQLite-backed job queue in jobs.py.
+"""
+
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import jobs
+from jobs import JobWorker, claim, complete, enqueue, fail, heartbeat, job_handler
+from models import Base, Job, JobState
+
+
+@pytest.fixture
+def SessionLocal():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)
+
+
+@pytest.fixture
+def db(SessionLocal):
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+def test_claims_by_priority_then_age(db):
+    old = enqueue(db, "index_gaceta", {"day": "2024-12-18"})
+    new = enqueue(db, "index_gaceta", {"day": "2024-12-19"})
+    urgent = enqueue(db, "re_execute_prompt", priority=10)
+    enqueue(db, "index_gaceta", delay=3600)
+
+    claimed = [claim(db, "w1").id for _ in range(3)]
+
+    assert claimed == [urgent.id, old.id, new.id]
+    assert claim(db, "w1") is None
+
+
+def test_claimed_job_is_leased_to_one_worker(db):
+    job = enqueue(db, "index_gaceta")
+
+    assert claim(db, "w1").lease_owner == "w1"
+    assert claim(db, "w2") is None
+    assert not heartbeat(db, job.id, "w2")
+    assert heartbeat(db, job.id, "w1")
+
+
+def test_expired_lease_is_claimed_again(db):
+    job = enqueue(db, "index_gaceta")
+    claim(db, "crashed", lease_seconds=1)
+    db.query(Job).filter_by(id=job.id).update(
+        {"lease_expires_at": datetime.utcnow() - timedelta(seconds=1)}
+    )
+    db.commit()
+
+    reclaimed = claim(db, "w2")
+
+    assert reclaimed.id == job.id
+    assert reclaimed.lease_owner == "w2" and reclaimed.attempts == 2
+    # The crashed worker can no longer settle the job
+    assert not complete(db, job.id, "crashed")
+
+
+def test_expired_lease_on_last_attempt_fails_the_job(db):
+    job = enqueue(db, "index_gaceta", max_attempts=1)
+    claim(db, "crashed")
+    db.query(Job).filter_by(id=job.id).update(
+        {"lease_expires_at": datetime.utcnow() - timedelta(seconds=1)}
+    )
+    db.commit()
+
+    assert claim(db, "w2") is None
+    db.refresh(job)
+    assert job.state == JobState.FAILED.value
+
+
+def test_failures_back_off_then_give_up(db, monkeypatch):
+    monkeypatch.setattr(jobs.config, "JOB_RETRY_BASE_SECONDS", 60)
+    job = enqueue(db, "index_gaceta", max_attempts=2)
+
+    claim(db, "w1")
+    fail(db, job.id, "w1", "boom")
+    db.refresh(job)
+    assert job.state == JobState.QUEUED.value
+    assert job.run_at > datetime.utcnow() + timedelta(seconds=50)
+    assert claim(db, "w1") is None
+
+    monkeypatch.setattr(jobs.config, "JOB_RETRY_BASE_SECONDS", 0)
+    job.run_at = datetime.utcnow()
+    db.commit()
+    claim(db, "w1")
+    fail(db, job.id, "w1", "boom again")
+    db.refresh(job)
+    assert job.state == JobState.FAILED.value
+    assert job.last_error == "boom again" and job.finished_at is not None
+
+
+def test_dedupe_key_enqueues_once(db):
+    first = enqueue(db, "index_gaceta", {"day": "2024-12-19"}, dedupe_key="d")
+    second = enqueue(db, "index_gaceta", {"day": "2024-12-19"}, dedupe_key="d")
+
+    assert first.id == second.id
+    assert db.query(Job).count() == 1
+
+
+def test_worker_runs_registered_handler(SessionLocal, db, monkeypatch):
+    monkeypatch.setattr(jobs, "HANDLERS", dict(jobs.HANDLERS))
+    seen = []
+    job_handler("echo")(lambda db, text: seen.append(text))
+    done = enqueue(db, "echo", {"text": "hola"})
+    unknown = enqueue(db, "missing", max_attempts=1)
+    worker = JobWorker(SessionLocal, worker_id="w1")
+
+    while worker.run_once():
+        pass
+
+    db.expire_all()
+    assert seen == ["hola"]
+    assert db.get(Job, done.id).state == JobState.DONE.value
+    assert db.get(Job, unknown.id).state == JobState.FAILED.value
+    assert "No handler" in db.get(Job, unknown.id).last_error
+
+
+def test_profiled_job_writes_folded_stacks(SessionLocal, db, monkeypatch, tmp_path):
+    monkeypatch.setattr(jobs, "HANDLERS", dict(jobs.HANDLERS))
+    monkeypatch.setattr(jobs.config, "PROFILE_DIR", str(tmp_path))
+    monkeypatch.setenv("GACETA_PROFILE", "1")
+
+    def busy_handler(db):
+        deadline = time.monotonic() + 0.1
+        while time.monotonic() < deadline:
+            pass
+
+    job_handler("busy")(busy_handler)
+    enqueue(db, "busy")
+
+    assert JobWorker(SessionLocal, worker_id="w1").run_once()
+
+    [folded] = tmp_path.glob("*-job-busy.folded")
+    assert "test_job_queue.py:busy_handler" in folded.read_text()
+
+
+def test_prompt_job_retry_only_reruns_failed_prompts(SessionLocal, db, monkeypatch):
+    import download_gaceta
+    from crud import PromptExecutionEngine
+    from models import ContentTemplate, ExecutionSession, GacetaPDF, Prompt
+
+    template = ContentTemplate(title="Daily", description="")
+    db.add(template)
+    db.flush()
+    for alias in ("headline", "legal"):
+        db.add(
+            Prompt(
+                template_id=template.id,
+                alias=alias,
+                prompt_text=alias,
+                doc_aware=False,
+                scheduled_execution=True,
+            )
+        )
+    db.add(GacetaPDF(date=datetime(2024, 6, 3), file_path="2024-06-03.pdf"))
+    db.commit()
+
+    calls = []
+    failing = {"legal"}
+
+    def fake_llm(self, query, **kwargs):
+        calls.append(query)
+        if query in failing:
+            raise RuntimeError("LLM unavailable")
+        return {"answer": query, "partial": None, "sources": [], "ai_references": None}
+
+    monkeypatch.setattr(download_gaceta, "Session", SessionLocal)
+    monkeypatch.setattr(PromptExecutionEngine, "run_prompt_by_date", fake_llm)
+    handler = jobs.HANDLERS["execute_gaceta_prompts"]
+
+    with pytest.raises(RuntimeError, match="FAILED"):
+        handler(db, "2024-06-03", template_id=template.id)
+    failing.clear()
+    handler(db, "2024-06-03", template_id=template.id)
+
+    # The retry ran only the failed prompt, in the same session
+    assert sorted(calls) == ["headline", "legal", "legal"]
+    [session] = db.query(ExecutionSession).all()
+    assert session.status == "EXECUTED"
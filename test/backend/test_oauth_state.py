@@ -0,0 +1,42 @@
+"""
+Unit tests for the database-backed Twitter OAuth state store that lets any
+API worker finish a login another worker started.
+"""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from models import Base, OAuthState
+from services.oauth_state import pop_oauth_state, save_oauth_state
+
+
+@pytest.fixture
+def SessionLocal():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)
+
+
+def test_state_is_redeemed_once_by_any_worker(SessionLocal):
+    login_worker, callback_worker = SessionLocal(), SessionLocal()
+    save_oauth_state(login_worker, "state-1", "verifier-1")
+
+    assert pop_oauth_state(callback_worker, "state-1") == "verifier-1"
+    assert pop_oauth_state(callback_worker, "state-1") is None
+    assert pop_oauth_state(callback_worker, "unknown") is None
+
+
+def test_expired_states_are_rejected_and_pruned(SessionLocal):
+    db = SessionLocal()
+    save_oauth_state(db, "old", "verifier-old", ttl=-1)
+
+    assert pop_oauth_state(db, "old") is None
+
+    save_oauth_state(db, "new", "verifier-new")
+    assert [s.state for s in db.query(OAuthState)] == ["new"]
@@ -175,22 +175,21 @@ def test_re_execute_prompt(prompt_execution_engine, db_session):
 
 
 def test_get_execution_session_prompts_results(prompt_execution_engine, db_session):
-    mock_session = MagicMock(spec=ExecutionSession)
     mock_log = MagicMock(spec=ContentExecutionLog)
     mock_log.state = ExecutionState.EXECUTED.value
     mock_log.query_response_id = "query_response_id"
     mock_log.prompt.alias = "alias1"
     mock_log.output.response = "response1"
-    mock_session.logs = [mock_log]
-    mock_query = db_session.query.return_value
-    mock_query.filter_by.return_value.first.return_value = mock_session
 
-    results = prompt_execution_engine.get_execution_session_prompts_results(
-        "session_id"
-    )
+    with patch(
+        "crud.get_last_executed_logs", return_value={1: mock_log}
+    ) as mock_last_logs:
+        results = prompt_execution_engine.get_execution_session_prompts_results(
+            "session_id"
+        )
 
     assert results == {"alias1": "response1"}
-    mock_query.filter_by.assert_called_once_with(id="session_id")
+    mock_last_logs.assert_called_once_with(db_session, "session_id")
 
 
 def test_create_execution_session(prompt_execution_engine, db_session):
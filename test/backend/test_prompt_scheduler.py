@@ -0,0 +1,251 @@
+"""
+Unit tests for the {{alias}} dependency-graph scheduler in PromptExecutionEngine.
+"""
+
+import threading
+import time
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from crud import PromptExecutionEngine, prompt_dependencies
+from models import (
+    Base,
+    ContentExecutionLog,
+    ContentTemplate,
+    ExecutionSession,
+    ExecutionState,
+    Prompt,
+    PromptQueryResponse,
+)
+
+ALIASES = ["twitter_summary", "headline_summary", "economic_updates", "legal_changes"]
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def make_prompts(db, texts):
+    template = ContentTemplate(title="Daily", description="")
+    db.add(template)
+    db.flush()
+    prompts = [
+        Prompt(template_id=template.id, alias=alias, prompt_text=text, doc_aware=False)
+        for alias, text in texts.items()
+    ]
+    db.add_all(prompts)
+    db.commit()
+    return template, prompts
+
+
+class FakeLLM:
+    """Stands in for run_prompt_by_date and records start/finish times."""
+
+    def __init__(self, delay=0.2, fail=()):
+        self.delay = delay
+        self.fail = fail
+        self.events = {}
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, query, **kwargs):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        start = time.perf_counter()
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+            self.events[query] = (start, time.perf_counter())
+        if query in self.fail:
+            raise RuntimeError("LLM unavailable")
+        return {
+            "answer": f"answer to {query}",
+            "partial": None,
+            "sources": [],
+            "ai_references": None,
+        }
+
+
+def states(db, session_id):
+    logs = db.query(ContentExecutionLog).filter_by(execution_session_id=session_id)
+    return {log.prompt.alias: log.state for log in logs}
+
+
+def test_prompt_dependencies_follow_aliases(db):
+    _, prompts = make_prompts(
+        db,
+        {
+            "twitter_summary": "tweet",
+            "headline_summary": "headline",
+            "newsletter": "{{twitter_summary}} and {{ headline_summary }} {{unknown}}",
+        },
+    )
+    deps = prompt_dependencies(prompts)
+
+    assert deps[prompts[0].id] == set()
+    assert deps[prompts[2].id] == {prompts[0].id, prompts[1].id}
+
+
+def test_independent_prompts_run_concurrently(db):
+    texts = {alias: alias for alias in ALIASES}
+    texts["newsletter"] = " | ".join(f"{{{{{alias}}}}}" for alias in ALIASES)
+    template, prompts = make_prompts(db, texts)
+    engine = PromptExecutionEngine(db)
+    engine.run_prompt_by_date = fake = FakeLLM(delay=0.2)
+    session_id = engine.create_execution_session(None, template.id, None)
+    engine.render_prompt("warm up", {})  # first call imports LangChain
+
+    started = time.perf_counter()
+    engine.process_prompts(prompts, session_id, max_workers=4)
+    elapsed = time.perf_counter() - started
+
+    newsletter_query = " | ".join(f"answer to {alias}" for alias in ALIASES)
+    assert fake.max_active == 4
+    assert fake.events[newsletter_query][0] >= max(
+        fake.events[alias][1] for alias in ALIASES
+    )
+    # Two levels of 0.2s each instead of five sequential calls
+    assert elapsed < 0.7
+    assert set(states(db, session_id).values()) == {ExecutionState.EXECUTED.value}
+
+
+def test_failed_input_does_not_block_dependents(db):
+    template, prompts = make_prompts(
+        db,
+        {"twitter_summary": "tweet", "newsletter": "news: {{twitter_summary}}"},
+    )
+    engine = PromptExecutionEngine(db)
+    engine.run_prompt_by_date = FakeLLM(delay=0, fail=("tweet",))
+    session_id = engine.create_execution_session(None, template.id, None)
+
+    engine.process_prompts(prompts, session_id)
+
+    assert states(db, session_id) == {
+        "twitter_summary": ExecutionState.FAILED.value,
+        "newsletter": ExecutionState.EXECUTED.value,
+    }
+
+
+def test_alias_cycle_is_logged_as_failure(db):
+    template, prompts = make_prompts(
+        db,
+        {"a_prompt": "{{b_prompt}}", "b_prompt": "{{a_prompt}}", "c_prompt": "c"},
+    )
+    engine = PromptExecutionEngine(db)
+    engine.run_prompt_by_date = FakeLLM(delay=0)
+    session_id = engine.create_execution_session(None, template.id, None)
+
+    engine.process_prompts(prompts, session_id)
+
+    assert states(db, session_id) == {
+        "a_prompt": ExecutionState.FAILED.value,
+        "b_prompt": ExecutionState.FAILED.value,
+        "c_prompt": ExecutionState.EXECUTED.value,
+    }
+
+
+def test_template_execution_commits_each_response(db):
+    template, prompts = make_prompts(
+        db,
+        {"twitter_summary": "tweet", "newsletter": "news: {{twitter_summary}}"},
+    )
+    engine = PromptExecutionEngine(db)
+    engine.run_prompt_by_date = FakeLLM(delay=0)
+    commits = []
+    event.listen(db, "after_commit", lambda session: commits.append(session))
+
+    session_id = engine.execute_content_template_prompts(None, template.id)
+
+    # INIT session, one per prompt (response and its log), final status
+    assert len(commits) == 4
+    exec_session = db.get(ExecutionSession, session_id)
+    assert exec_session.status == ExecutionState.EXECUTED.value
+    assert exec_session.completed_at is not None
+    assert set(states(db, session_id).values()) == {ExecutionState.EXECUTED.value}
+
+
+def test_responses_survive_a_failed_status_update(db, monkeypatch):
+    template, prompts = make_prompts(db, {"twitter_summary": "tweet", "legal": "l"})
+    engine = PromptExecutionEngine(db)
+    engine.run_prompt_by_date = FakeLLM(delay=0)
+
+    def crash(*args, **kwargs):
+        raise RuntimeError("worker killed")
+
+    monkeypatch.setattr(engine, "update_session_status", crash)
+    with pytest.raises(RuntimeError):
+        engine.execute_content_template_prompts(None, template.id)
+    db.rollback()
+
+    # Both paid-for responses were committed before the crash
+    session_id = db.query(ExecutionSession).one().id
+    assert states(db, session_id) == {
+        "twitter_summary": ExecutionState.EXECUTED.value,
+        "legal": ExecutionState.EXECUTED.value,
+    }
+    assert db.query(PromptQueryResponse).count() == 2
+
+
+def test_failed_prompt_marks_session_failed(db):
+    template, prompts = make_prompts(db, {"twitter_summary": "tweet", "legal": "l"})
+    engine = PromptExecutionEngine(db)
+    engine.run_prompt_by_date = FakeLLM(delay=0, fail=("l",))
+
+    session_id = engine.execute_content_template_prompts(None, template.id)
+
+    assert db.get(ExecutionSession, session_id).status == ExecutionState.FAILED.value
+
+
+def test_doc_aware_prompts_share_one_index_load(db, tmp_path, monkeypatch):
+    import datetime as dt
+
+    import faiss_helper
+    import qa
+    from config import config
+    from models import GacetaPDF
+
+    (tmp_path / "2024-06-01").mkdir()
+    (tmp_path / "2024-06-01" / "index.faiss").write_bytes(b"")
+    monkeypatch.setattr(config, "GACETA_PDFS_DIR", str(tmp_path))
+
+    loads = []
+
+    class CountingHelper:
+        def load_faiss_index(self, directory):
+            loads.append(threading.get_ident())
+            time.sleep(0.05)
+            return "index"
+
+    seen = []
+    monkeypatch.setattr(faiss_helper, "FAISSHelper", CountingHelper)
+    monkeypatch.setattr(qa, "get_llm", lambda **kwargs: None)
+
+    def query_folder(folder_index, query, llm):
+        seen.append(folder_index)
+        return {"answer": query, "partial": None, "sources": [], "ai_references": None}
+
+    monkeypatch.setattr(qa, "query_folder", query_folder)
+
+    template, prompts = make_prompts(db, {alias: alias for alias in ALIASES})
+    for prompt in prompts:
+        prompt.doc_aware = True
+    gaceta = GacetaPDF(date=dt.datetime(2024, 6, 1), file_path="x.pdf")
+    db.add(gaceta)
+    db.commit()
+    engine = PromptExecutionEngine(db)
+    session_id = engine.create_execution_session(None, template.id, gaceta.id)
+
+    engine.process_prompts(prompts, session_id, max_workers=4)
+
+    assert len(loads) == 1
+    assert seen == ["index"] * len(ALIASES)
+    assert set(states(db, session_id).values()) == {ExecutionState.EXECUTED.value}
@@ -0,0 +1,190 @@
+"""
+Unit tests for ETag / 304 handling and the in-process response cache of the
+execution session endpoints.
+"""
+
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import fastapp
+from crud import PromptExecutionEngine
+from db import get_db
+from models import Base, ExecutionSession, GacetaPDF, Prompt
+from services.response_cache import ResponseCache, response_cache
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    return engine
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    gaceta = GacetaPDF(date=datetime(2024, 6, 3, 6), file_path="2024-06-03.pdf")
+    session.add(gaceta)
+    session.flush()
+    session.add(ExecutionSession(id="s1", document_id=gaceta.id))
+    session.add(
+        Prompt(id=1, prompt_text="Resumen " * 200, name="resumen", short_description="")
+    )
+    session.commit()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def client(engine, db):
+    SessionLocal = sessionmaker(bind=engine)
+
+    def override_get_db():
+        session = SessionLocal()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    response_cache.invalidate()
+    fastapp.app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(fastapp.app)
+    fastapp.app.dependency_overrides.pop(get_db, None)
+    response_cache.invalidate()
+
+
+def count_queries(engine):
+    statements = []
+    event.listen(
+        engine, "before_cursor_execute", lambda *args: statements.append(args[2])
+    )
+    return statements
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "/execution_session_by_date/?date=2024-06-03",
+        "/execution_session/available/",
+        "/execution_session/?session_id=s1",
+    ],
+)
+def test_if_none_match_returns_304(client, path):
+    first = client.get(path)
+    etag = first.headers["ETag"]
+
+    assert first.status_code == 200
+    assert etag.startswith('"') and first.headers["Cache-Control"]
+
+    second = client.get(path, headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["ETag"] == etag
+
+
+def test_cached_response_skips_the_database(client, engine):
+    path = "/execution_session_by_date/?date=2024-06-03"
+    body = client.get(path).json()
+    statements = count_queries(engine)
+
+    assert client.get(path).json() == body
+    assert statements == []
+
+
+def test_stale_entry_is_revalidated_with_the_state_query_only(client, engine):
+    path = "/execution_session/?session_id=s1"
+    etag = client.get(path).headers["ETag"]
+    response_cache.ttl = 0
+    try:
+        statements = count_queries(engine)
+        assert client.get(path).headers["ETag"] == etag
+    finally:
+        response_cache.ttl = fastapp.config.RESPONSE_CACHE_TTL
+
+    assert len(statements) == 1
+
+
+def test_engine_writes_invalidate_and_change_the_etag(client, db):
+    path = "/execution_session_by_date/?date=2024-06-03"
+    before = client.get(path)
+
+    engine = PromptExecutionEngine(db)
+    engine.log_prompt_execution("s1", 1, "EXECUTED")
+    session = db.get(ExecutionSession, "s1")
+    session.status = "EXECUTED"
+    engine._commit()
+
+    after = client.get(path, headers={"If-None-Match": before.headers["ETag"]})
+    assert after.status_code == 200
+    assert after.headers["ETag"] != before.headers["ETag"]
+    assert after.json()[0]["status"] == "EXECUTED"
+
+
+def test_large_payloads_are_compressed(client, db):
+    engine = PromptExecutionEngine(db)
+    engine.log_prompt_response(
+        db.get(Prompt, 1),
+        "s1",
+        {"partial": None, "answer": "respuesta " * 500, "sources": []},
+    )
+
+    response = client.get(
+        "/execution_session/?session_id=s1", headers={"Accept-Encoding": "gzip"}
+    )
+    assert response.headers["Content-Encoding"] in {"gzip", "br"}
+    assert response.json()[0]["response"].startswith("respuesta")
+
+    raw = client.get(
+        "/execution_session/?session_id=s1",
+        headers={"Accept-Encoding": "identity"},
+    )
+    assert "Content-Encoding" not in raw.headers
+    assert raw.json() == response.json()
+
+
+def test_invalidation_reaches_other_processes(tmp_path):
+    # Two API workers: separate caches sharing one generation file
+    generation_file = str(tmp_path / "cache.generation")
+    worker_a = ResponseCache(ttl=60, generation_file=generation_file)
+    worker_b = ResponseCache(ttl=60, generation_file=generation_file)
+    worker_a.put("/execution_session/", "etag-a", b"a")
+    worker_b.put("/execution_session/", "etag-b", b"b")
+
+    worker_a.invalidate()
+
+    assert worker_a.get("/execution_session/") is None
+    assert worker_b.get("/execution_session/") is None
+    worker_b.put("/execution_session/", "etag-b2", b"b2")
+    assert worker_b.get("/execution_session/").etag == "etag-b2"
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("sqlite:///{tmp}/gaceta.db", "{tmp}/gaceta.db.cache-generation"),
+        ("sqlite://", None),
+    ],
+)
+def test_default_generation_file_follows_the_database(
+    tmp_path, monkeypatch, url, expected
+):
+    from services import response_cache as module
+
+    monkeypatch.setattr(module.config, "DATABASE_URL", url.format(tmp=tmp_path))
+    monkeypatch.setattr(module.config, "RESPONSE_CACHE_GENERATION_FILE", None)
+
+    cache = ResponseCache(ttl=60)
+    cache.put("/a", '"1"', b"{}")
+    cache.invalidate()
+
+    assert cache.generation_file == (expected and expected.format(tmp=tmp_path))
+    assert cache.get("/a") is None
@@ -0,0 +1,120 @@
+"""
+Unit tests for the process supervisor in startup.py.
+"""
+
+import socket
+import sys
+import time
+
+import pytest
+
+import startup
+from startup import ManagedService, Supervisor
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def python(code):
+    return [sys.executable, "-c", code]
+
+
+@pytest.fixture
+def fast_restarts(monkeypatch):
+    monkeypatch.setattr(startup, "RESTART_BACKOFF_SECONDS", 0.05)
+    monkeypatch.setattr(startup, "SUPERVISOR_GRACE_SECONDS", 1)
+
+
+def test_next_service_starts_once_the_previous_is_ready(tmp_path):
+    port = free_port()
+    web = ManagedService(
+        "web",
+        [sys.executable, "-m", "http.server", str(port), "-d", str(tmp_path)],
+        ready_url=f"http://127.0.0.1:{port}/",
+    )
+    after = ManagedService("after", python("import time; time.sleep(30)"))
+    supervisor = Supervisor([web, after])
+    try:
+        supervisor.start_all()
+
+        assert web.ready and after.process.poll() is None
+        assert after.started_at >= web.ready_at > web.started_at
+        assert startup.probe(web.ready_url)
+    finally:
+        supervisor.shutdown()
+
+
+def test_crashed_service_restarts_with_backoff(fast_restarts):
+    crashing = ManagedService("crashing", python("import sys; sys.exit(3)"))
+    supervisor = Supervisor([crashing])
+    supervisor.start_all()
+
+    delays = []
+    pids = {crashing.process.pid}
+    while len(delays) < 3:
+        crashing.process.wait()
+        supervisor.poll_once()
+        delays.append(round(crashing.restart_at - time.monotonic(), 2))
+        time.sleep(crashing.restart_at - time.monotonic() + 0.01)
+        supervisor.poll_once()
+        pids.add(crashing.process.pid)
+
+    assert crashing.failures == 3
+    assert len(pids) == 4
+    assert delays[0] < delays[1] < delays[2] <= 0.2
+
+
+def test_shutdown_terminates_then_kills(fast_restarts):
+    polite = ManagedService("polite", python("import time; time.sleep(60)"))
+    stubborn = ManagedService(
+        "stubborn",
+        python(
+            "import signal, time; signal.signal(signal.SIGTERM, signal.SIG_IGN); "
+            "print('up', flush=True); time.sleep(60)"
+        ),
+    )
+    supervisor = Supervisor([polite, stubborn])
+    supervisor.start_all()
+    time.sleep(0.5)  # let the handler be installed
+
+    started = time.monotonic()
+    supervisor.shutdown()
+
+    assert polite.process.returncode is not None
+    assert stubborn.process.returncode == -9
+    assert time.monotonic() - started < 5
+
+
+def test_multi_worker_backend_command(monkeypatch):
+    monkeypatch.setattr(startup, "API_WORKERS", 4)
+
+    command = startup.backend_service().command
+
+    assert command[command.index("--workers") + 1] == "4"
+    assert [s.name for s in startup.build_services("backend")] == ["🔧 backend"]
+
+
+def test_workers_option_reaches_the_backend_command():
+    args = startup.parse_args(["--mode", "backend", "--workers", "3"])
+
+    [backend] = startup.build_services(args.mode, args.workers)
+
+    assert backend.command[backend.command.index("--workers") + 1] == "3"
+    assert "--workers" not in startup.backend_service(1).command
+
+
+def test_without_process_groups_children_are_terminated(fast_restarts, monkeypatch):
+    # Windows: no os.killpg, start_new_session or rlimits
+    monkeypatch.setattr(startup, "POSIX", False)
+    monkeypatch.setattr(startup, "SERVICE_MEMORY_LIMIT_MB", 256)
+    monkeypatch.delattr(startup.os, "killpg")
+    service = ManagedService("plain", python("import time; time.sleep(60)"))
+    supervisor = Supervisor([service])
+    supervisor.start_all()
+
+    supervisor.shutdown()
+
+    assert service.process.returncode is not None
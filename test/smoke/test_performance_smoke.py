@@ -4,6 +4,7 @@ Tests basic performance characteristics of core functions.
 """
 
 import os
+import subprocess
 import sys
 import time
 from pathlib import Path
@@ -84,5 +85,314 @@ class TestPerformanceBasics:
             pytest.skip(f"Database not available for performance test: {e}")
 
 
+class TestEmbeddingPerformance:
+    """Offline embedding throughput budget."""
+
+    def test_local_embeddings_for_full_gazette(self):
+        """A ~300 page gazette (2,000 chunks of 1,000 chars) embeds in seconds."""
+        try:
+            from embeddings import HashingEmbeddings
+        except ImportError:
+            pytest.skip("Embedding backends not available")
+
+        chunk = ("Artículo 1°—Decreto N° 12345-MINAE sobre áreas protegidas. " * 20)[
+            :1000
+        ]
+        chunks = [f"{i} {chunk}" for i in range(2000)]
+
+        start_time = time.time()
+        vectors = HashingEmbeddings().encode(chunks)
+        encode_time = time.time() - start_time
+
+        assert vectors.shape[0] == len(chunks)
+        assert encode_time < 10.0, f"Local embeddings too slow: {encode_time:.2f}s"
+
+
+class TestPromptEnginePerformance:
+    """Transaction cost of a full template execution on a file-backed SQLite DB."""
+
+    @staticmethod
+    def _seed_template(db, prompt_count):
+        from models import ContentTemplate, Prompt
+
+        template = ContentTemplate(title="Benchmark", description="")
+        db.add(template)
+        db.flush()
+        for i in range(prompt_count):
+            db.add(
+                Prompt(
+                    template_id=template.id,
+                    alias=f"bench_{i}",
+                    prompt_text=f"Prompt {i}",
+                    doc_aware=False,
+                )
+            )
+        db.commit()
+        return template.id
+
+    def test_twenty_prompt_template_commits_each_response_once(self, tmp_path):
+        """Each prompt's response and log share one commit (~22, not ~41)."""
+        try:
+            from sqlalchemy import create_engine, event
+            from sqlalchemy.orm import sessionmaker
+
+            from crud import PromptExecutionEngine
+            from models import Base, ExecutionSession, ExecutionState, Prompt
+        except ImportError:
+            pytest.skip("Prompt engine not available")
+
+        def fake_llm(query, **kwargs):
+            return {
+                "answer": query,
+                "partial": None,
+                "sources": [],
+                "ai_references": None,
+            }
+
+        engine = create_engine(f"sqlite:///{tmp_path / 'template'}.db")
+        Base.metadata.create_all(engine)
+        db = sessionmaker(bind=engine)()
+        template_id = self._seed_template(db, 20)
+        prompt_engine = PromptExecutionEngine(db)
+        prompt_engine.run_prompt_by_date = fake_llm
+        commits = []
+        event.listen(db, "after_commit", lambda session: commits.append(1))
+
+        start_time = time.time()
+        session_id = prompt_engine.execute_content_template_prompts(None, template_id)
+        elapsed = time.time() - start_time
+
+        status = db.get(ExecutionSession, session_id).status
+        db.close()
+        engine.dispose()
+
+        print(f"20-prompt template: {elapsed:.2f}s, {len(commits)} commits")
+        assert status == ExecutionState.EXECUTED.value
+        # INIT session + one per prompt (response and log) + final status
+        assert len(commits) == 22
+
+
+class TestLoadTestHarness:
+    """The multi-process load test must report, not hang, when requests fail."""
+
+    def test_refused_connections_are_counted_as_errors(self):
+        import importlib.util
+
+        script = project_root / "archive" / "v1" / "scripts" / "load_test_api.py"
+        try:
+            spec = importlib.util.spec_from_file_location("load_test_api", script)
+            load_test_api = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(load_test_api)
+        except ImportError as e:
+            pytest.skip(f"API dependencies not available: {e}")
+
+        # Nothing listens on a fresh free port
+        port = load_test_api._free_port()
+        result = load_test_api._measure(port, "key", clients=2, seconds=0.3)
+
+        assert result["requests"] == 0
+        assert result["errors"] >= 2
+
+
+@pytest.mark.performance
+class TestApiConcurrency:
+    """Blocking routes must not serialize concurrent clients on the event loop.
+
+    Throughput ratios depend on the machine, so these only run on request:
+    ``pytest -m performance``.
+    """
+
+    def test_fifty_concurrent_clients(self):
+        import importlib.util
+
+        script = project_root / "archive" / "v1" / "scripts" / "load_test_api.py"
+        try:
+            spec = importlib.util.spec_from_file_location("load_test_api", script)
+            load_test_api = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(load_test_api)
+        except ImportError as e:
+            pytest.skip(f"API dependencies not available: {e}")
+
+        before = load_test_api.run_load_test("event-loop", 50, 2, 10)
+        after = load_test_api.run_load_test("threadpool", 50, 2, 10)
+
+        print(f"event loop: {before['throughput']:.0f} req/s")
+        print(f"thread pool: {after['throughput']:.0f} req/s")
+        assert not before["errors"] and not after["errors"]
+        assert after["throughput"] > 1.5 * before["throughput"]
+
+    @pytest.mark.skipif(
+        (os.cpu_count() or 1) < 2, reason="worker scaling needs at least 2 cores"
+    )
+    def test_read_throughput_scales_with_workers(self):
+        import importlib.util
+
+        script = project_root / "archive" / "v1" / "scripts" / "load_test_api.py"
+        try:
+            spec = importlib.util.spec_from_file_location("load_test_api", script)
+            load_test_api = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(load_test_api)
+        except ImportError as e:
+            pytest.skip(f"API dependencies not available: {e}")
+
+        results = load_test_api.run_worker_scaling_test((1, 2), clients=4, seconds=3)
+
+        for workers, result in results.items():
+            print(f"{workers} workers: {result['throughput']:.0f} req/s")
+        assert not any(result["errors"] for result in results.values())
+        assert results[2]["throughput"] > 1.6 * results[1]["throughput"]
+
+
+class TestSqliteConcurrency:
+    """Writers and readers sharing one SQLite file, as daemon, API and UI do."""
+
+    @staticmethod
+    def _run_mixed_load(engine, writers=4, readers=4, commits=50):
+        import threading
+
+        from sqlalchemy import text
+        from sqlalchemy.exc import OperationalError
+
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE bench (id INTEGER PRIMARY KEY, v TEXT)"))
+
+        errors, reads = [], []
+        done = threading.Event()
+
+        def write():
+            for i in range(commits):
+                try:
+                    with engine.begin() as conn:
+                        conn.execute(
+                            text("INSERT INTO bench (v) VALUES (:v)"), {"v": i}
+                        )
+                except OperationalError as e:
+                    errors.append(e)
+
+        def read():
+            while not done.is_set():
+                try:
+                    with engine.connect() as conn:
+                        conn.execute(text("SELECT count(*) FROM bench")).scalar()
+                    reads.append(1)
+                except OperationalError as e:
+                    errors.append(e)
+
+        reader_threads = [threading.Thread(target=read) for _ in range(readers)]
+        writer_threads = [threading.Thread(target=write) for _ in range(writers)]
+        start_time = time.time()
+        for thread in reader_threads + writer_threads:
+            thread.start()
+        for thread in writer_threads:
+            thread.join()
+        elapsed = time.time() - start_time
+        done.set()
+        for thread in reader_threads:
+            thread.join()
+        return {
+            "writes_per_s": writers * commits / elapsed,
+            "reads_per_s": len(reads) / elapsed,
+            "errors": len(errors),
+        }
+
+    def test_concurrent_writers_and_readers(self, tmp_path):
+        """The WAL profile serves mixed load with no "database is locked" errors."""
+        try:
+            from sqlalchemy import create_engine, text
+
+            from db import create_db_engine
+        except ImportError:
+            pytest.skip("Database layer not available")
+
+        legacy = create_engine(
+            f"sqlite:///{tmp_path / 'legacy.db'}",
+            pool_size=10,
+            max_overflow=20,
+            pool_timeout=30,
+            pool_recycle=1800,
+            connect_args={"check_same_thread": False},
+        )
+        profiled = create_db_engine(f"sqlite:///{tmp_path / 'profiled.db'}")
+
+        before = self._run_mixed_load(legacy)
+        after = self._run_mixed_load(profiled)
+        print(f"legacy: {before}")
+        print(f"profile: {after}")
+
+        with profiled.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() > 0
+        assert after["errors"] == 0
+        assert after["writes_per_s"] > 50, f"Writes too slow: {after}"
+        legacy.dispose()
+        profiled.dispose()
+
+
+class TestImportTime:
+    """Cold-start budgets measured with ``python -X importtime``.
+
+    Each module is imported in a fresh interpreter from an empty directory,
+    so the cumulative time of its top-level entry is its full cold start and
+    any database file created on import would show up in that directory.
+    """
+
+    V1_DIR = project_root / "archive" / "v1"
+    # Seconds; fastapp took ~3.5s while it imported LangChain, Tweepy and Redis
+    BUDGETS = {
+        "models": 1.0,
+        "jobs": 1.0,
+        "crud": 2.0,
+        "fastapp": 2.0,
+        "download_gaceta": 2.0,
+    }
+    HEAVY_MODULES = [
+        "langchain",
+        "langchain_openai",
+        "openai",
+        "faiss",
+        "tweepy",
+        "redis",
+    ]
+
+    def _import(self, module, cwd, statement=None):
+        env = dict(os.environ, PYTHONPATH=str(self.V1_DIR))
+        return subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", statement or f"import {module}"],
+            cwd=cwd,
+            env=env,
+            capture_output=True,
+            text=True,
+            timeout=120,
+        )
+
+    @pytest.mark.parametrize("module", sorted(BUDGETS))
+    def test_cold_import_within_budget(self, module, tmp_path):
+        result = self._import(module, tmp_path)
+        if result.returncode:
+            pytest.skip(f"{module} not importable here: {result.stderr[-300:]}")
+
+        cumulative_us = next(
+            int(line.split("|")[1])
+            for line in result.stderr.splitlines()
+            if line.startswith("import time:") and line.split("|")[2].strip() == module
+        )
+        print(f"{module}: {cumulative_us / 1e6:.3f}s")
+        assert cumulative_us / 1e6 < self.BUDGETS[module]
+        # Schema creation and seeding are an explicit init step now
+        assert not list(tmp_path.glob("*.db")), "import created a database file"
+
+    def test_api_import_skips_heavy_dependencies(self, tmp_path):
+        result = self._import(
+            "fastapp",
+            tmp_path,
+            "import sys, fastapp; "
+            f"print([m for m in {self.HEAVY_MODULES!r} if m in sys.modules])",
+        )
+        if result.returncode:
+            pytest.skip(f"fastapp not importable here: {result.stderr[-300:]}")
+        assert result.stdout.strip() == "[]"
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "--tb=short"])
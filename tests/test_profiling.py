@@ -0,0 +1,68 @@
+"""
+Unit tests for the opt-in profiling hook (archive/v1/profiling.py)
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "archive" / "v1"))
+
+
+def busy_loop(seconds):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        pass
+
+
+@pytest.mark.unit
+def test_profiling_is_off_by_default(monkeypatch, tmp_path):
+    """Unit: without GACETA_PROFILE nothing is profiled or written"""
+    from profiling import profile_run
+
+    monkeypatch.delenv("GACETA_PROFILE", raising=False)
+    with profile_run("scrape", tmp_path) as artifacts:
+        busy_loop(0.01)
+
+    assert artifacts == []
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.unit
+def test_profile_writes_folded_stacks_and_cprofile_stats(monkeypatch, tmp_path):
+    """Unit: cprofile mode writes flamegraph-compatible stacks plus .prof"""
+    import pstats
+    from profiling import profile_run
+
+    monkeypatch.setenv("GACETA_PROFILE", "cprofile")
+    with profile_run("scrape", tmp_path) as artifacts:
+        busy_loop(0.2)
+
+    folded, prof = artifacts
+    assert folded.suffix == ".folded" and prof.suffix == ".prof"
+    lines = folded.read_text(encoding="utf-8").splitlines()
+    stack, count = lines[0].rsplit(" ", 1)
+    assert int(count) > 0
+    assert any("test_profiling.py:busy_loop" in line for line in lines)
+    assert any("busy_loop" in name for _, _, name in pstats.Stats(str(prof)).stats)
+
+
+@pytest.mark.unit
+def test_only_the_last_runs_are_kept(monkeypatch, tmp_path):
+    """Unit: retention keeps the newest N runs per name"""
+    from profiling import profile_run
+
+    monkeypatch.setenv("GACETA_PROFILE", "1")
+    monkeypatch.setenv("GACETA_PROFILE_KEEP", "2")
+    kept = []
+    for _ in range(4):
+        with profile_run("scrape", tmp_path) as artifacts:
+            pass
+        kept = kept[-1:] + artifacts
+    with profile_run("other", tmp_path):
+        pass
+
+    assert sorted(tmp_path.glob("*-scrape.folded")) == sorted(kept)
+    assert len(list(tmp_path.glob("*-other.folded"))) == 1
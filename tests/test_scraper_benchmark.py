@@ -0,0 +1,97 @@
+"""
+Smoke tests for the offline scraper benchmark (scripts/benchmark_scraper.py)
+No network or API calls: local fixture server and fake AI provider
+"""
+
+import copy
+
+import pytest
+
+
+@pytest.mark.smoke
+def test_benchmark_runs_full_flow_offline():
+    """Smoke: a 10-page synthetic gazette goes through every scraper stage"""
+    from scripts.benchmark_scraper import run_benchmark
+
+    result = run_benchmark(10)
+
+    assert result["summary_saved"]
+    stages = result["stages"]
+    assert set(stages) >= {
+        "scrape_latest_gaceta_url",
+        "download_pdf",
+        "extract_text_from_pdf",
+        "call_ai_model",
+        "save_summaries",
+    }
+    assert stages["download_pdf"]["bytes"] == result["pdf_bytes"]
+    assert stages["extract_text_from_pdf"]["ok"]
+    assert stages["extract_text_from_pdf"]["pages_per_s"] > 0
+    assert stages["call_ai_model"]["tokens"]["input"] > 0
+
+
+@pytest.mark.unit
+def test_synthetic_gazette_has_page_markers_and_text():
+    """Unit: generated PDFs have the requested pages and extractable Spanish text"""
+    from io import BytesIO
+    from scripts.benchmark_scraper import make_gazette_pdf
+    from scripts.scrape_and_summarize import extract_text_from_pdf
+
+    text = extract_text_from_pdf(BytesIO(make_gazette_pdf(3)))
+
+    assert "[PÁGINA 3]" in text and "[PÁGINA 4]" not in text
+    assert "Artículo" in text
+
+
+@pytest.mark.unit
+def test_compare_flags_slow_stages_and_memory_growth():
+    """Unit: only slowdowns over the threshold and noise floor are regressions"""
+    from scripts.benchmark_scraper import compare
+
+    base = {
+        "peak_rss_mb": 80,
+        "stages": {
+            "extract_text_from_pdf": {"ok": True, "wall_s": 1.0},
+            "download_pdf": {"ok": True, "wall_s": 0.002},
+        },
+    }
+    baseline = {"results": {"100": base}}
+    same = copy.deepcopy(base)
+    slower = copy.deepcopy(base)
+    slower["stages"]["extract_text_from_pdf"]["wall_s"] = 1.5
+    slower["stages"]["download_pdf"]["wall_s"] = 0.004  # 2x, but within noise
+    slower["peak_rss_mb"] = 200
+
+    assert compare({100: same}, baseline) == []
+    regressions = compare({100: slower}, baseline, threshold=0.25)
+    assert len(regressions) == 2
+    assert "extract_text_from_pdf" in regressions[0]
+    assert "peak RSS" in regressions[1]
+
+
+@pytest.mark.unit
+def test_compare_reports_newly_failing_stages_and_skips_failed_baselines():
+    """Unit: a stage that used to work and now fails is a regression"""
+    from scripts.benchmark_scraper import compare, unbaselined_stages
+
+    baseline = {
+        "results": {
+            "100": {
+                "peak_rss_mb": 80,
+                "stages": {
+                    "create_header_image": {"ok": True, "wall_s": 0.5},
+                    "extract_text_from_pdf": {"ok": False, "wall_s": 0.1},
+                },
+            }
+        }
+    }
+    run = {
+        "peak_rss_mb": 80,
+        "stages": {
+            "create_header_image": {"ok": False, "wall_s": 0.0},
+            "extract_text_from_pdf": {"ok": True, "wall_s": 5.0},
+        },
+    }
+
+    assert compare({100: run}, baseline) == ["100 pages / create_header_image: failed"]
+    assert unbaselined_stages({100: run}, baseline) == ["extract_text_from_pdf"]
@@ -221,3 +221,294 @@ def test_no_timezone_drift_on_midnight():
     # Date string should reflect Costa Rica date
     date_str = cr_time.strftime("%Y-%m-%d")
     assert date_str == "2025-11-12"
+
+
+# ===== Telemetry Tests =====
+@pytest.mark.unit
+def test_stage_spans_are_written_as_json_lines(tmp_path):
+    """Unit: each stage emits a JSON line with wall/CPU time, RSS and bytes"""
+    import json
+    from scripts.scrape_and_summarize import TELEMETRY, download_pdf
+
+    sink = tmp_path / "telemetry.jsonl"
+    TELEMETRY.start(sink)
+    with patch('requests.get') as mock_get:
+        mock_get.return_value = Mock(content=b"%PDF" * 256, raise_for_status=Mock())
+        download_pdf("https://example.com/ok.pdf")
+
+    [line] = sink.read_text(encoding="utf-8").splitlines()
+    record = json.loads(line)
+    assert record["span"] == "download_pdf" and record["ok"]
+    assert record["run_id"] == TELEMETRY.run_id
+    assert record["bytes"] == 1024
+    assert record["wall_s"] >= 0 and record["cpu_s"] >= 0
+    assert "peak_rss_mb" in record
+
+
+@pytest.mark.unit
+def test_timings_block_sums_retries_and_tokens():
+    """Unit: timings aggregate repeated stages, failures and token usage"""
+    import requests
+    from scripts.scrape_and_summarize import TELEMETRY, call_ai_model, download_pdf
+
+    TELEMETRY.start()
+    with patch('requests.get') as mock_get:
+        mock_get.side_effect = requests.exceptions.RequestException("404 Not Found")
+        download_pdf("https://example.com/a.pdf")
+        download_pdf("https://example.com/b.pdf")
+
+    mock_client = MagicMock()
+    response = mock_client.chat.completions.create.return_value
+    response.choices = [MagicMock()]
+    response.choices[0].message.content = "{}"
+    response.usage = Mock(
+        prompt_tokens=1200, completion_tokens=300, total_tokens=1500,
+        prompt_tokens_details=Mock(cached_tokens=1024),
+    )
+    with patch('scripts.scrape_and_summarize.OpenAI', return_value=mock_client):
+        call_ai_model("prompt")
+
+    timings = TELEMETRY.timings()
+    assert timings["stages"]["download_pdf"]["calls"] == 2
+    assert not any(span["ok"] for span in TELEMETRY.spans if span["span"] == "download_pdf")
+    assert timings["stages"]["call_ai_model"]["tokens"] == {"input": 1200, "output": 300, "cached": 1024}
+    assert timings["total_wall_s"] >= timings["stages"]["download_pdf"]["wall_s"]
+
+
+# ===== Prompt Caching Tests =====
+@pytest.mark.unit
+def test_summary_prompt_prefix_is_stable_across_days():
+    """Unit: instructions/schema prefix never changes; date and text come after it"""
+    from datetime import datetime
+    from scripts.scrape_and_summarize import build_summary_prompt
+
+    prefix_a, prompt_a = build_summary_prompt("[PÁGINA 1]\nDecreto A", datetime(2025, 11, 12))
+    prefix_b, prompt_b = build_summary_prompt("[PÁGINA 1]\nLey B " * 500, datetime(2025, 11, 13))
+
+    assert prefix_a == prefix_b
+    assert "2025" not in prefix_a and '"es"' in prefix_a
+    assert "November 12, 2025" in prompt_a and prompt_a.index("Decreto A") > prompt_a.index("November")
+
+
+@pytest.mark.unit
+def test_openai_call_sends_prefix_first_and_reports_cached_tokens(monkeypatch):
+    """Unit: OpenAI gets the prefix at the start plus a stable prompt_cache_key"""
+    from scripts import scrape_and_summarize as scraper
+
+    mock_client = MagicMock()
+    response = mock_client.chat.completions.create.return_value
+    response.choices = [MagicMock()]
+    response.choices[0].message.content = "{}"
+    response.usage = Mock(
+        prompt_tokens=5000, completion_tokens=400,
+        prompt_tokens_details=Mock(cached_tokens=4096),
+    )
+    monkeypatch.setattr(scraper, "OpenAI", lambda *args, **kwargs: mock_client)
+
+    _, usage = scraper.call_ai_model("document", "system", cached_prefix="PREFIX ")
+    _, _ = scraper.call_ai_model("other document", "system", cached_prefix="PREFIX ")
+
+    first, second = mock_client.chat.completions.create.call_args_list
+    assert first.kwargs["messages"][1]["content"] == "PREFIX document"
+    assert first.kwargs["prompt_cache_key"] == second.kwargs["prompt_cache_key"]
+    assert usage.cached_tokens == 4096 and usage.total_tokens == 5400
+
+
+@pytest.mark.unit
+def test_anthropic_call_marks_the_prefix_cache_breakpoint(monkeypatch):
+    """Unit: Anthropic gets cache_control on the prefix and document blocks; cache reads are counted"""
+    import sys
+    from scripts import scrape_and_summarize as scraper
+
+    client = MagicMock()
+    client.messages.create.return_value = Mock(
+        content=[Mock(type="text", text=" {} ")],
+        usage=Mock(
+            input_tokens=900, output_tokens=300,
+            cache_read_input_tokens=3000, cache_creation_input_tokens=0,
+        ),
+    )
+    monkeypatch.setitem(sys.modules, "anthropic", Mock(Anthropic=lambda **kwargs: client))
+    monkeypatch.setitem(scraper.AI_CONFIG, "provider", "anthropic")
+
+    text, usage = scraper.call_ai_model("document", "system", cached_prefix="PREFIX")
+
+    [prefix_block, document_block] = client.messages.create.call_args.kwargs["messages"][0]["content"]
+    assert prefix_block == {"type": "text", "text": "PREFIX", "cache_control": {"type": "ephemeral"}}
+    assert document_block == {"type": "text", "text": "document", "cache_control": {"type": "ephemeral"}}
+    assert text == "{}"
+    assert usage.prompt_tokens == 3900 and usage.cached_tokens == 3000
+
+
+
+# ===== Structured Output Tests =====
+def _section(summary="Resumen", pages=(1,)):
+    return {
+        "summary": summary,
+        "bullets": [{"icon": "⚖️", "text": "Decreto", "pages": list(pages)}],
+        "topics": ["Legal"],
+    }
+
+
+@pytest.mark.unit
+def test_valid_structured_summary_needs_no_repair(monkeypatch):
+    """Unit: a schema-valid reply is parsed as-is, with no follow-up call"""
+    import json
+    from scripts import scrape_and_summarize as scraper
+
+    call = Mock()
+    monkeypatch.setattr(scraper, "call_ai_model", call)
+    raw = json.dumps({"es": _section(), "en": _section("Summary")})
+
+    data, usage, repaired = scraper.parse_summary(raw, scraper._usage(100, 50))
+
+    assert data["en"]["summary"] == "Summary" and repaired == []
+    assert usage.total_tokens == 150
+    call.assert_not_called()
+
+
+@pytest.mark.unit
+def test_invalid_section_is_repaired_without_resending_the_gazette(monkeypatch):
+    """Unit: only the broken "en" section goes back, with the valid "es" as source"""
+    import json
+    from scripts import scrape_and_summarize as scraper
+
+    fixed = _section("Summary")
+    call = Mock(return_value=(json.dumps(fixed), scraper._usage(300, 120)))
+    monkeypatch.setattr(scraper, "call_ai_model", call)
+    broken = {"summary": "Summary", "bullets": [{"icon": "⚖️", "text": "Decree", "pages": ["2"]}]}
+    raw = json.dumps({"es": _section(), "en": broken})
+
+    data, usage, repaired = scraper.parse_summary(raw, scraper._usage(9000, 800, 4000))
+
+    prompt = call.call_args.args[0]
+    assert call.call_count == 1
+    assert call.call_args.kwargs["response_schema"] is scraper.LANGUAGE_SCHEMA
+    assert "[PÁGINA" not in prompt and "topics" in prompt and "Resumen" in prompt
+    assert data == {"es": _section(), "en": fixed} and repaired == ["en"]
+    assert not scraper.summary_errors(data)
+    assert (usage.prompt_tokens, usage.completion_tokens, usage.cached_tokens) == (9300, 920, 4000)
+
+
+@pytest.mark.unit
+def test_unparseable_reply_is_repaired_as_a_whole(monkeypatch):
+    """Unit: a non-JSON reply asks for both sections against the full schema"""
+    import json
+    from scripts import scrape_and_summarize as scraper
+
+    fixed = {"es": _section(), "en": _section("Summary")}
+    call = Mock(return_value=(json.dumps(fixed), scraper._usage(200, 100)))
+    monkeypatch.setattr(scraper, "call_ai_model", call)
+
+    data, _, repaired = scraper.parse_summary('{"es": {"summary": "Res', scraper._usage(100, 50))
+
+    assert call.call_args.kwargs["response_schema"] is scraper.SUMMARY_SCHEMA
+    assert data == fixed and repaired == ["en", "es"]
+
+
+@pytest.mark.unit
+def test_summary_still_invalid_after_repair_raises(monkeypatch):
+    """Unit: one repair attempt only; a second invalid reply is an error"""
+    from scripts import scrape_and_summarize as scraper
+
+    monkeypatch.setattr(scraper, "call_ai_model", Mock(return_value=("{}", scraper._usage(10, 10))))
+
+    with pytest.raises(ValueError, match="still invalid"):
+        scraper.parse_summary("[]", scraper._usage(100, 50))
+
+
+@pytest.mark.unit
+def test_openai_call_requests_strict_json_schema(monkeypatch):
+    """Unit: OpenAI structured output uses response_format json_schema"""
+    from scripts import scrape_and_summarize as scraper
+
+    mock_client = MagicMock()
+    response = mock_client.chat.completions.create.return_value
+    response.choices = [MagicMock()]
+    response.choices[0].message.content = "{}"
+    response.usage = Mock(prompt_tokens=10, completion_tokens=5, prompt_tokens_details=None)
+    monkeypatch.setattr(scraper, "OpenAI", lambda *args, **kwargs: mock_client)
+
+    scraper.call_ai_model("document", "system", response_schema=scraper.SUMMARY_SCHEMA)
+
+    response_format = mock_client.chat.completions.create.call_args.kwargs["response_format"]
+    assert response_format["type"] == "json_schema"
+    assert response_format["json_schema"]["strict"] is True
+    schema = response_format["json_schema"]["schema"]
+    assert schema["required"] == ["es", "en"]
+    assert schema["properties"]["es"]["additionalProperties"] is False
+
+
+def _schema_keywords(schema):
+    """Every keyword used in a JSON schema (property names excluded)"""
+    if isinstance(schema, list):
+        return set().union(*map(_schema_keywords, schema))
+    if not isinstance(schema, dict):
+        return set()
+    keywords = set(schema)
+    for key, value in schema.items():
+        subschemas = value.values() if key == "properties" else [value]
+        keywords |= set().union(*map(_schema_keywords, subschemas))
+    return keywords
+
+
+@pytest.mark.unit
+def test_provider_schemas_have_no_unsupported_keywords(monkeypatch):
+    """Unit: providers get the schema without validation-only keywords"""
+    import sys
+    from scripts import scrape_and_summarize as scraper
+
+    assert {"minLength", "minItems", "minimum"} <= _schema_keywords(scraper.SUMMARY_SCHEMA)
+
+    mock_client = MagicMock()
+    response = mock_client.chat.completions.create.return_value
+    response.choices = [MagicMock()]
+    response.choices[0].message.content = "{}"
+    response.usage = Mock(prompt_tokens=10, completion_tokens=5, prompt_tokens_details=None)
+    monkeypatch.setattr(scraper, "OpenAI", lambda *args, **kwargs: mock_client)
+    scraper.call_ai_model("document", "system", response_schema=scraper.SUMMARY_SCHEMA)
+    openai_schema = mock_client.chat.completions.create.call_args.kwargs[
+        "response_format"]["json_schema"]["schema"]
+
+    genai = Mock()
+    genai.GenerativeModel.return_value.generate_content.return_value = Mock(
+        text="{}", usage_metadata=Mock(
+            prompt_token_count=10, candidates_token_count=5, cached_content_token_count=0,
+        ),
+    )
+    monkeypatch.setitem(sys.modules, "google", Mock(generativeai=genai))
+    monkeypatch.setitem(sys.modules, "google.generativeai", genai)
+    monkeypatch.setitem(scraper.AI_CONFIG, "provider", "gemini")
+    scraper.call_ai_model("document", "system", response_schema=scraper.SUMMARY_SCHEMA)
+    gemini_schema = genai.GenerativeModel.return_value.generate_content.call_args.kwargs[
+        "generation_config"]["response_schema"]
+
+    assert not _schema_keywords(openai_schema) & scraper.VALIDATION_KEYWORDS
+    assert not _schema_keywords(gemini_schema) & (
+        scraper.VALIDATION_KEYWORDS | {"additionalProperties"}
+    )
+    # The local validator still enforces the full schema
+    assert scraper.summary_errors({"es": {"summary": "", "bullets": [], "topics": []}})["es"]
+
+
+@pytest.mark.unit
+def test_anthropic_structured_output_is_a_forced_tool_call(monkeypatch):
+    """Unit: Anthropic returns the forced tool call's input as JSON text"""
+    import json
+    import sys
+    from scripts import scrape_and_summarize as scraper
+
+    client = MagicMock()
+    client.messages.create.return_value = Mock(
+        content=[Mock(type="tool_use", input={"summary": "Resumen"})],
+        usage=Mock(input_tokens=10, output_tokens=5, cache_read_input_tokens=0, cache_creation_input_tokens=0),
+    )
+    monkeypatch.setitem(sys.modules, "anthropic", Mock(Anthropic=lambda **kwargs: client))
+    monkeypatch.setitem(scraper.AI_CONFIG, "provider", "anthropic")
+
+    text, _ = scraper.call_ai_model("document", "system", response_schema=scraper.LANGUAGE_SCHEMA)
+
+    kwargs = client.messages.create.call_args.kwargs
+    assert kwargs["tool_choice"] == {"type": "tool", "name": "record_response"}
+    assert kwargs["tools"][0]["input_schema"] == scraper._provider_schema(scraper.LANGUAGE_SCHEMA)
+    assert json.loads(text) == {"summary": "Resumen"}